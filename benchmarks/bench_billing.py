@@ -0,0 +1,140 @@
+"""Benchmark the vectorized FactBillingDetail builder against the original per-row loop.
+
+Usage:
+    python benchmarks/bench_billing.py
+    python benchmarks/bench_billing.py --sizes 18000 1000000 --legacy-max-rows 1000000
+
+The legacy loop takes minutes beyond a few hundred thousand rows, so by default
+it only runs up to ``--legacy-max-rows`` and larger sizes report a time
+extrapolated from its measured rows/sec.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from clinic_data.config import GeneratorConfig  # noqa: E402
+from clinic_data.dataset import Dataset  # noqa: E402
+from clinic_data.facts import generate_fact_billing  # noqa: E402
+from clinic_data.generator import FACT_TABLES  # noqa: E402
+
+
+def legacy_fact_billing(num_billing_records, num_visits, num_patients,
+                        dim_service, dim_insurance, dim_payment_method):
+    """The original row-at-a-time generator from 2.py, kept only as a baseline."""
+    billing_data = []
+    for i in range(1, num_billing_records + 1):
+        visit_id = random.randint(1, num_visits) if random.random() < 0.65 else None
+        date_key = int((datetime(2023, 1, 1) + timedelta(days=random.randint(0, 1000))).strftime('%Y%m%d'))
+        patient_id = np.random.randint(1, num_patients + 1)
+        branch_id = np.random.choice(range(1, 9), p=[0.20, 0.18, 0.15, 0.12, 0.11, 0.09, 0.08, 0.07])
+        doctor_id = np.random.randint(1, 11)
+        service_id = np.random.choice(range(1, 19))
+        insurance_id = np.random.choice(range(1, 7), p=[0.45, 0.15, 0.15, 0.10, 0.08, 0.07])
+        payment_method_id = np.random.choice(range(1, 9), p=[0.15, 0.25, 0.20, 0.10, 0.08, 0.12, 0.05, 0.05])
+
+        service = dim_service[dim_service['ServiceID'] == service_id].iloc[0]
+        base_price = service['BasePrice']
+        cost = service['Cost']
+
+        quantity = random.randint(1, 3) if service['Category'] not in ['Health Package'] else 1
+        unit_price = base_price * random.uniform(0.9, 1.1)
+        discount_percent = random.choice([0, 0, 0, 5, 10, 15, 20]) if random.random() < 0.3 else 0
+
+        gross_amount = unit_price * quantity
+        discount_amount = gross_amount * (discount_percent / 100)
+        net_amount = gross_amount - discount_amount
+
+        insurance = dim_insurance[dim_insurance['InsuranceID'] == insurance_id].iloc[0]
+        insurance_coverage_amount = net_amount * (insurance['CoveragePercent'] / 100)
+        patient_paid_amount = net_amount - insurance_coverage_amount
+
+        payment = dim_payment_method[dim_payment_method['PaymentMethodID'] == payment_method_id].iloc[0]
+        payment_fee = patient_paid_amount * (payment['ProcessingFee'] / 100)
+
+        total_cost = cost * quantity
+        gross_profit = net_amount - total_cost - payment_fee
+        gross_profit_margin = (gross_profit / net_amount * 100) if net_amount > 0 else 0
+
+        billing_data.append({
+            'BillingID': i,
+            'BillingNumber': f'INV{date_key}-{i:06d}',
+            'BillingDateKey': date_key,
+            'VisitID': visit_id,
+            'PatientID': patient_id,
+            'BranchID': branch_id,
+            'DoctorID': doctor_id,
+            'ServiceID': service_id,
+            'InsuranceID': insurance_id,
+            'PaymentMethodID': payment_method_id,
+            'Quantity': quantity,
+            'UnitPrice': round(unit_price, 2),
+            'GrossAmount': round(gross_amount, 2),
+            'DiscountPercent': discount_percent,
+            'DiscountAmount': round(discount_amount, 2),
+            'NetAmount': round(net_amount, 2),
+            'InsuranceCoverageAmount': round(insurance_coverage_amount, 2),
+            'PatientPaidAmount': round(patient_paid_amount, 2),
+            'PaymentFee': round(payment_fee, 2),
+            'TotalCost': round(total_cost, 2),
+            'GrossProfit': round(gross_profit, 2),
+            'GrossProfitMargin': round(gross_profit_margin, 2),
+            'PaymentStatus': np.random.choice(['Paid', 'Pending', 'Cancelled'], p=[0.92, 0.05, 0.03]),
+            'PaymentDate': (datetime.strptime(str(date_key), '%Y%m%d') +
+                            timedelta(days=random.randint(0, 7))).strftime('%Y-%m-%d'),
+        })
+    return pd.DataFrame(billing_data)
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[18_000, 1_000_000, 10_000_000])
+    parser.add_argument('--legacy-max-rows', type=int, default=18_000,
+                        help='run the per-row loop only up to this many rows, extrapolate above it')
+    args = parser.parse_args()
+
+    config = GeneratorConfig()
+    dataset = Dataset(config)
+    dims = {name: dataset[name] for name in FACT_TABLES['FactBillingDetail'].dims}
+    legacy_dims = [dataset['DimService'], dataset['DimInsurance'], dataset['DimPaymentMethod']]
+    np.random.seed(42)
+    random.seed(42)
+
+    legacy_rate = None
+    print(f"{'rows':>12} {'legacy (s)':>12} {'vectorized (s)':>15} {'speedup':>9}")
+    for rows in sorted(args.sizes):
+        if rows <= args.legacy_max_rows:
+            legacy = time_call(legacy_fact_billing, rows, config.num_visits, config.num_patients, *legacy_dims)
+            legacy_rate = rows / legacy
+            legacy_label = f'{legacy:12.2f}'
+        elif legacy_rate is not None:
+            legacy = rows / legacy_rate
+            legacy_label = f'{legacy:11.0f}~'
+        else:
+            legacy = None
+            legacy_label = f"{'-':>12}"
+
+        vectorized = time_call(generate_fact_billing,
+                               GeneratorConfig(num_billing_records=rows), dims)
+        speedup = f'{legacy / vectorized:8.0f}x' if legacy else f"{'-':>9}"
+        print(f'{rows:>12,} {legacy_label} {vectorized:15.3f} {speedup}')
+
+    print('\n~ extrapolated from the legacy rows/sec measured at the largest size it ran')
+
+
+if __name__ == '__main__':
+    main()
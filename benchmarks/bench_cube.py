@@ -0,0 +1,102 @@
+"""Query latency of the in-memory BillingCube against pandas merge + groupby on the fact rows.
+
+Usage:
+    python benchmarks/bench_cube.py
+    python benchmarks/bench_cube.py --scale 2800 --pandas-max-rows 0    # ~50M billing rows
+
+The billing rows are generated chunk by chunk and streamed into the cube,
+so only the cells stay in memory. The pandas comparison needs the whole
+fact table and only runs up to ``--pandas-max-rows``. "first" is the
+first query of each shape, which also builds the roll-up later queries of
+that shape reuse.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from clinic_data.config import GeneratorConfig  # noqa: E402
+from clinic_data.cube import BillingCube  # noqa: E402
+from clinic_data.generator import generate_dimensions, iter_fact_chunks  # noqa: E402
+
+QUERIES = {
+    'Region x Category x Month': (['DimBranch[Region]', 'DimService[Category]', 'DimDate[YearMonth]'], {}),
+    'same, Gold/Platinum only': (['DimBranch[Region]', 'DimService[Category]', 'DimDate[YearMonth]'],
+                                 {'DimPatient[MembershipLevel]': ['Gold', 'Platinum']}),
+    'Specialty, 2024': (['DimDoctor[Specialty]'], {'DimDate[Year]': [2024]}),
+    'total': ([], {}),
+}
+
+
+def best_of(repeat, func, *args):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def pandas_query(billing, dims, group_by, filters):
+    frame = billing.assign(YearMonth=billing['BillingDateKey'] // 100, Year=billing['BillingDateKey'] // 10000)
+    for table, key in (('DimBranch', 'BranchID'), ('DimService', 'ServiceID'), ('DimDoctor', 'DoctorID'),
+                       ('DimPatient', 'PatientID')):
+        columns = [column for column in ('Region', 'Category', 'Specialty', 'MembershipLevel')
+                   if column in dims[table]]
+        frame = frame.merge(dims[table][[key, *columns]], on=key)
+    for reference, values in filters.items():
+        frame = frame[frame[reference.split('[')[1][:-1]].isin(values)]
+    columns = [reference.split('[')[1][:-1] for reference in group_by]
+    return frame.groupby(columns)['NetAmount'].sum() if columns else frame['NetAmount'].sum()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=float, default=100)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--pandas-max-rows', type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    config = GeneratorConfig.from_scale(args.scale)
+    with contextlib.redirect_stdout(io.StringIO()):
+        dims = generate_dimensions(config)
+    keep_rows = config.num_billing_records <= args.pandas_max_rows
+    chunks = []
+
+    def stream():
+        for chunk in iter_fact_chunks('FactBillingDetail', config, dims):
+            if keep_rows:
+                chunks.append(chunk)
+            yield chunk
+
+    start = time.perf_counter()
+    cube = BillingCube.build(dims, stream())
+    build = time.perf_counter() - start
+    print(f'{config.num_billing_records:,} billing rows -> {cube.cells:,} cells '
+          f'(generated and rolled up in {build:.1f} s)\n')
+
+    billing = pd.concat(chunks, ignore_index=True) if keep_rows else None
+    print(f"{'query':<28} {'first (ms)':>11} {'cube (ms)':>10} {'pandas (ms)':>12} {'speedup':>9}")
+    for label, (group_by, filters) in QUERIES.items():
+        # The first query of a shape also builds the roll-up that later ones reuse
+        first_ms = best_of(1, cube.query, ['NetAmount'], group_by, filters) * 1000
+        cube_ms = best_of(args.repeat, cube.query, ['NetAmount'], group_by, filters) * 1000
+        if billing is not None:
+            pandas_ms = best_of(max(1, args.repeat // 10), pandas_query, billing, dims, group_by, filters) * 1000
+            expected = pandas_query(billing, dims, group_by, filters)
+            assert np.isclose(cube.query(['NetAmount'], group_by, filters)['NetAmount'].sum(), np.sum(expected))
+            print(f'{label:<28} {first_ms:11.1f} {cube_ms:10.2f} {pandas_ms:12.1f} {pandas_ms / cube_ms:8.0f}x')
+        else:
+            print(f"{label:<28} {first_ms:11.1f} {cube_ms:10.2f} {'-':>12} {'-':>9}")
+
+
+if __name__ == '__main__':
+    main()
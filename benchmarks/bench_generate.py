@@ -0,0 +1,184 @@
+"""Per-stage timing and memory profile of the generator at several scale factors.
+
+Usage:
+    python benchmarks/bench_generate.py
+    python benchmarks/bench_generate.py --scales 1 10 --output results.json
+    python benchmarks/bench_generate.py --save-baseline      # record benchmarks/baseline.json
+    python benchmarks/bench_generate.py --baseline benchmarks/baseline.json --tolerance 0.3
+
+Every scale runs in a fresh subprocess, so peak RSS is not inflated by the
+previous scale. A stage's ``peak_rss_mb`` is the process high-water mark
+after the stage and ``rss_growth_mb`` is how much the stage raised it.
+With ``--baseline`` each stage's rows/sec (or time, for stages without
+rows) is compared to the stored run. The exit status is 1 when a stage is
+more than ``--tolerance`` slower, so a regression in a hot loop fails the
+run. Baselines are machine specific; record one per machine.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from clinic_data.cli import write_data_dictionary  # noqa: E402
+from clinic_data.config import GeneratorConfig  # noqa: E402
+from clinic_data.generator import DIMENSION_TABLES, FACT_TABLES, build_dimension, generate_fact_table  # noqa: E402
+from clinic_data.writers import csv_path, write_csv  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+DEFAULT_SCALES = [0.1, 1, 10]
+
+# Stages faster than this are dominated by noise and never flagged
+MIN_COMPARE_SECONDS = 0.05
+
+
+def peak_rss_mb():
+    """Process high-water RSS in MB, or None where neither ``resource`` nor psutil is available."""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 2 ** 20
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+class StageTimer:
+    def __init__(self):
+        self.stages = {}
+
+    def run(self, name, func, *args):
+        rss_before = peak_rss_mb()
+        start = time.perf_counter()
+        value = func(*args)
+        seconds = time.perf_counter() - start
+        rss_after = peak_rss_mb()
+
+        rows = len(value) if isinstance(value, pd.DataFrame) else value if isinstance(value, int) else None
+        self.stages[name] = {
+            'seconds': round(seconds, 4),
+            'rows': rows,
+            'rows_per_sec': round(rows / seconds) if rows and seconds > 0 else None,
+            'peak_rss_mb': None if rss_after is None else round(rss_after, 1),
+            'rss_growth_mb': None if rss_after is None else round(rss_after - rss_before, 1),
+        }
+        print(f"   {name:<28} {seconds:9.3f} s {rows or '':>12} rows", file=sys.stderr)
+        return value
+
+
+def profile_scale(scale, seed):
+    """Run every generator stage once at ``scale``; returns ``{stage: metrics}``."""
+    config = GeneratorConfig.from_scale(scale, seed=seed)
+    timer = StageTimer()
+    tables = {}
+    for name in DIMENSION_TABLES:
+        tables[name] = timer.run(name, build_dimension, name, config, tables)
+    for name in FACT_TABLES:
+        tables[name] = timer.run(name, generate_fact_table, name, config, tables)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        for name, table in tables.items():
+            timer.run(f'to_csv:{name}', write_csv, table, csv_path(output_dir, name))
+        timer.run('DataDictionary', write_data_dictionary, output_dir)
+    return timer.stages
+
+
+def run_scales(scales, seed):
+    """Profile each scale in its own interpreter so peak RSS starts from a clean process."""
+    results = {}
+    for scale in scales:
+        print(f"⏱️  scale {scale:g}", file=sys.stderr)
+        completed = subprocess.run([sys.executable, os.path.abspath(__file__), '--child-scale', repr(scale),
+                                    '--seed', str(seed)], stdout=subprocess.PIPE, check=True, text=True)
+        results[f'{scale:g}'] = json.loads(completed.stdout)
+    return results
+
+
+def environment():
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Stages slower than the baseline by more than ``tolerance``, as printable lines."""
+    regressions = []
+    print(f"\n{'scale':>6} {'stage':<28} {'baseline':>12} {'current':>12} {'speed':>8}")
+    for scale, stages in results.items():
+        for stage, current in stages.items():
+            previous = baseline.get('results', {}).get(scale, {}).get(stage)
+            if previous is None:
+                continue
+            if current['rows_per_sec'] and previous.get('rows_per_sec'):
+                unit, old, new = 'rows/s', previous['rows_per_sec'], current['rows_per_sec']
+                slowdown = old / new - 1
+            else:
+                unit, old, new = 's', previous['seconds'], current['seconds']
+                slowdown = new / old - 1 if old else 0.0
+            flag = ''
+            if slowdown > tolerance and max(current['seconds'], previous['seconds']) >= MIN_COMPARE_SECONDS:
+                flag = '  ⚠️ regression'
+                regressions.append(f'scale {scale} {stage}: {slowdown:+.0%} ({old:,} → {new:,} {unit})')
+            print(f'{scale:>6} {stage:<28} {old:>12,} {new:>12,} {1 / (1 + slowdown) - 1:+8.0%}{flag}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=float, nargs='+', default=DEFAULT_SCALES)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='write the results JSON here (default: stdout)')
+    parser.add_argument('--baseline', help='compare against this results JSON')
+    parser.add_argument('--save-baseline', action='store_true', help=f'store the results as {DEFAULT_BASELINE}')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slowdown before a stage counts as a regression (default: 0.25)')
+    parser.add_argument('--child-scale', type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child_scale is not None:
+        json.dump(profile_scale(args.child_scale, args.seed), sys.stdout)
+        return
+
+    report = {'environment': environment(), 'seed': args.seed, 'results': run_scales(args.scales, args.seed)}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    elif not args.save_baseline and not args.baseline:
+        print(text)
+    if args.save_baseline:
+        with open(DEFAULT_BASELINE, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+        print(f'\nBaseline saved to {DEFAULT_BASELINE}', file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(report['results'], json.load(f), args.tolerance)
+        if regressions:
+            print('\nRegressions:\n  ' + '\n  '.join(regressions))
+            sys.exit(1)
+        print('\nNo regressions.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""Load test of the OData feed in ``clinic_data.odata``: requests/s and latency per query shape.
+
+Usage:
+    python benchmarks/bench_serve.py
+    python benchmarks/bench_serve.py --scale 20 --clients 32 --requests 2000
+
+The tables are generated in memory and served on a free localhost port.
+Each query shape is first run with the cache disabled ("cold": every
+request filters and encodes again; indexes and the measure engine's own cache stay), then with
+the cache on ("cached"). Clients are keep-alive connections sending
+requests back to back, with ``Accept-Encoding: gzip``; every response is
+followed along ``@odata.nextLink`` once per shape to check paging.
+"""
+import argparse
+import asyncio
+import contextlib
+import gzip
+import io
+import json
+import os
+import sys
+import threading
+import time
+from urllib.parse import quote
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from clinic_data.config import GeneratorConfig  # noqa: E402
+from clinic_data.generator import generate_tables  # noqa: E402
+from clinic_data.odata import FeedServer, ODataFeed, TableStore  # noqa: E402
+
+QUERIES = {
+    'point lookup': "FactBillingDetail?$filter=BillingID eq 1234",
+    'branch x month': "FactBillingDetail?$filter=BranchID eq 3 and BillingDateKey ge 20240101 and "
+                      "BillingDateKey lt 20240201&$select=BillingID,BillingDateKey,NetAmount",
+    'text scan': "FactBillingDetail?$filter=PaymentStatus ne 'Paid' and contains(BillingNumber,'-00')&$top=100",
+    'page of all': "FactAppointment?$top=5000",
+    'measures by month': "Measures?$select=Total_Revenue,Profit_Margin_Pct&$apply=groupby((DimDate/YearMonth))"
+                         "&$filter=DimBranch/Size eq 'Large'",
+}
+
+
+def start_server(feed):
+    """Run a FeedServer on its own event loop thread; returns its port."""
+    loop = asyncio.new_event_loop()
+    server = FeedServer(feed, port=0)
+    loop.run_until_complete(server.start())
+    threading.Thread(target=loop.run_until_complete, args=(server.serve_forever(),), daemon=True).start()
+    return server.port
+
+
+async def _get(reader, writer, target):
+    writer.write(f'GET /{target} HTTP/1.1\r\nHost: localhost\r\nAccept-Encoding: gzip\r\n\r\n'.encode('latin-1'))
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()).strip():
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers['content-length']))
+    if headers.get('content-encoding') == 'gzip':
+        body = gzip.decompress(body)
+    return status, body
+
+
+async def _client(port, target, count, latencies):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for _ in range(count):
+        start = time.perf_counter()
+        status, _ = await _get(reader, writer, target)
+        assert status == 200, status
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def load(port, target, clients, requests):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(port, target, max(requests // clients, 1), latencies) for _ in range(clients)))
+    return len(latencies) / (time.perf_counter() - start), np.percentile(latencies, [50, 99]) * 1000
+
+
+async def follow(port, target):
+    """Rows over every page of ``target``."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    rows, pages = 0, 0
+    while target:
+        status, body = await _get(reader, writer, target)
+        assert status == 200, body
+        document = json.loads(body)
+        rows, pages = rows + len(document['value']), pages + 1
+        link = document.get('@odata.nextLink')
+        target = link and link.split('/', 3)[3]
+    writer.close()
+    return rows, pages
+
+
+def encoded(target):
+    path, _, query = target.partition('?')
+    return f"{path}?{quote(query, safe='=&$,()/')}" if query else path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=float, default=5)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--page-size', type=int, default=1_000)
+    args = parser.parse_args()
+
+    config = GeneratorConfig.from_scale(args.scale)
+    with contextlib.redirect_stdout(io.StringIO()):
+        tables = generate_tables(config)
+    store = TableStore(tables)
+    cold = ODataFeed(store, args.page_size, cache_bytes=0)
+    cached = ODataFeed(store, args.page_size)
+    ports = {'cold': start_server(cold), 'cached': start_server(cached)}
+    print(f"scale {args.scale:g}: {len(tables['FactBillingDetail']):,} billing rows, {args.clients} clients")
+
+    print(f"{'query':>18} {'rows':>8} {'pages':>6} {'mode':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for label, target in QUERIES.items():
+        target = encoded(target)
+        rows, pages = asyncio.run(follow(ports['cold'], target))
+        for mode, port in ports.items():
+            rate, (p50, p99) = asyncio.run(load(port, target, args.clients, args.requests))
+            print(f'{label:>18} {rows:8,} {pages:6} {mode:>7} {rate:9,.0f} {p50:8.2f} {p99:8.2f}')
+    print(f"cache: {cached.cache.hits:,} hits, {cached.cache.misses:,} misses, {cached.cache.size / 1e6:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
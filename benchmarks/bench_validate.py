@@ -0,0 +1,76 @@
+"""Throughput of the referential-integrity and invariant checks in ``clinic_data.validate``.
+
+Usage:
+    python benchmarks/bench_validate.py
+    python benchmarks/bench_validate.py --scales 100 1000 --chunk-size 2000000
+
+The fact tables are generated chunk by chunk and streamed into
+``validate_tables``, so nothing but a chunk and the key sets is held in
+memory. The time spent generating is measured separately and left out of
+the reported check time.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from clinic_data.config import GeneratorConfig  # noqa: E402
+from clinic_data.generator import FACT_TABLES, generate_dimensions, iter_fact_chunks  # noqa: E402
+from clinic_data.validate import checked_columns, validate_tables  # noqa: E402
+
+TARGET_ROWS = 100_000_000
+
+
+class Timed:
+    """Wraps a chunk iterator and adds up the time spent producing the chunks."""
+
+    def __init__(self, chunks, columns):
+        self.chunks = chunks
+        self.columns = columns
+        self.seconds = 0.0
+
+    def __iter__(self):
+        while True:
+            start = time.perf_counter()
+            chunk = next(self.chunks, None)
+            if chunk is not None:
+                chunk = chunk[self.columns]
+            self.seconds += time.perf_counter() - start
+            if chunk is None:
+                return
+            yield chunk
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=float, nargs='+', default=[10, 100])
+    parser.add_argument('--chunk-size', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"{'scale':>7} {'fact rows':>12} {'checks':>7} {'check (s)':>10} {'rows/s':>12} {'100M billing (s)':>17}")
+    for scale in args.scales:
+        config = GeneratorConfig.from_scale(scale, chunk_size=args.chunk_size)
+        with contextlib.redirect_stdout(io.StringIO()):
+            dims = generate_dimensions(config)
+        sources = {name: [table] for name, table in dims.items()}
+        streams = {name: Timed(iter_fact_chunks(name, config, dims), checked_columns(name)) for name in FACT_TABLES}
+        sources.update(streams)
+
+        start = time.perf_counter()
+        results = validate_tables(sources, dims)
+        elapsed = time.perf_counter() - start - sum(stream.seconds for stream in streams.values())
+        assert not any(result.violations for result in results), [r for r in results if r.violations]
+
+        rows = sum(getattr(config, fact.count_attr) for fact in FACT_TABLES.values())
+        billing_share = config.num_billing_records / rows
+        print(f'{scale:7g} {rows:12,} {len(results):7} {elapsed:10.2f} {rows / elapsed:12,.0f} '
+              f'{TARGET_ROWS / billing_share / (rows / elapsed):17.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,10 @@
+"""Medical Clinic Power BI mock data generator.
+
+``Dataset`` builds the tables lazily from Python; ``python -m clinic_data``
+(or ``2.py``) runs the command line. Importing the package does not import
+pandas or generate anything.
+"""
+from clinic_data.config import GeneratorConfig
+from clinic_data.dataset import Dataset
+
+__all__ = ['Dataset', 'GeneratorConfig']
@@ -0,0 +1,3 @@
+from clinic_data.cli import main
+
+main()
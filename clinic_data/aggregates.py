@@ -0,0 +1,189 @@
+"""Pre-aggregated summary tables built while the fact tables stream past.
+
+Each aggregate sums the additive measures of one fact table at a coarser
+grain and keeps a HyperLogLog sketch of the patients in every group (see
+``clinic_data.sketch``). Power BI can map the sums onto the detail table
+with user-defined aggregations, so visuals at or above the aggregate grain
+never scan the fact rows.
+
+Chunks are summarized independently (in the worker processes when running
+in parallel) and the partial results are merged with sums and
+per-register maxima, so the output does not depend on chunking.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from clinic_data.schema import apply_schema
+from clinic_data.sketch import decode_groups, encode_groups, estimate_groups, register_ranks
+from clinic_data.writers import TableWriter, read_table, table_exists, table_writers, write_chunks
+
+BILLING_MEASURES = (
+    'Quantity', 'GrossAmount', 'DiscountAmount', 'NetAmount', 'InsuranceCoverageAmount',
+    'PatientPaidAmount', 'PaymentFee', 'TotalCost', 'GrossProfit',
+)
+
+# Merge partial results once they outgrow the merged table by this many rows
+_COMPACT_ROWS = 1_000_000
+
+
+@dataclass(frozen=True)
+class Aggregate:
+    name: str
+    date_key: str  # YYYYMMDD column of the source fact
+    monthly: bool  # group by YearMonth instead of DateKey
+    keys: tuple  # further key columns, named as in the source
+    count_column: str
+    sums: tuple = ()
+    flags: tuple = ()  # (output column, source column, value) counted as 0/1
+
+    @property
+    def key_columns(self):
+        return ['YearMonth' if self.monthly else 'DateKey', *self.keys]
+
+
+AGGREGATES = {
+    'FactBillingDetail': (
+        Aggregate('AggBillingDaily', 'BillingDateKey', False,
+                  ('BranchID', 'ServiceID', 'InsuranceID', 'PaymentMethodID'), 'BillingCount', BILLING_MEASURES),
+        Aggregate('AggBillingMonthBranch', 'BillingDateKey', True, ('BranchID',), 'BillingCount', BILLING_MEASURES),
+    ),
+    'FactAppointment': (
+        Aggregate('AggAppointmentMonthBranch', 'AppointmentDateKey', True, ('BranchID',), 'AppointmentCount',
+                  flags=(('CompletedCount', 'Status', 'Completed'), ('ScheduledCount', 'Status', 'Scheduled'),
+                         ('CancelledCount', 'Status', 'Cancelled'), ('NoShowCount', 'Status', 'No-Show'))),
+    ),
+}
+
+
+def summarize_chunk(chunk, aggregates):
+    """``[(totals, registers), ...]`` per aggregate for one fact chunk.
+
+    ``totals`` holds the counts and sums per group, ``registers`` the
+    highest HyperLogLog rank per group and register.
+    """
+    register, rank = register_ranks(chunk['PatientID'].to_numpy())
+    partials = []
+    for aggregate in aggregates:
+        date_key = chunk[aggregate.date_key].to_numpy()
+        keys = aggregate.key_columns
+        frame = pd.DataFrame({keys[0]: date_key // 100 if aggregate.monthly else date_key})
+        for key in aggregate.keys:
+            frame[key] = chunk[key].to_numpy()
+        frame[aggregate.count_column] = 1
+        for column in aggregate.sums:
+            frame[column] = chunk[column].to_numpy()
+        for output, column, value in aggregate.flags:
+            frame[output] = (chunk[column].to_numpy() == value).astype(np.int64)
+
+        totals = frame.groupby(keys, sort=False).sum().reset_index()
+        registers = (frame[keys].assign(Register=register, Rank=rank)
+                     .groupby([*keys, 'Register'], sort=False)['Rank'].max().reset_index())
+        partials.append((totals, registers))
+    return partials
+
+
+class _Accumulator:
+    """Merged totals and registers of one aggregate, compacted as partials arrive."""
+
+    def __init__(self, aggregate):
+        self.aggregate = aggregate
+        self.totals = []
+        self.registers = []
+        self._merged_rows = 0
+
+    def add(self, totals, registers):
+        self.totals.append(totals)
+        self.registers.append(registers)
+        if sum(len(part) for part in self.registers) > self._merged_rows + _COMPACT_ROWS:
+            self._compact()
+
+    def add_table(self, table):
+        """Fold in a previously written aggregate table, e.g. before appending new days."""
+        keys = self.aggregate.key_columns
+        group, register, rank = decode_groups(table['PatientSketch'].tolist())
+        registers = table[keys].iloc[group].reset_index(drop=True).assign(Register=register, Rank=rank)
+        self.add(table.drop(columns=['DistinctPatients', 'PatientSketch']), registers)
+
+    def _compact(self):
+        keys = self.aggregate.key_columns
+        self.totals = [pd.concat(self.totals).groupby(keys, sort=False).sum().reset_index()]
+        self.registers = [pd.concat(self.registers).groupby([*keys, 'Register'], sort=False)['Rank']
+                          .max().reset_index()]
+        self._merged_rows = len(self.registers[0])
+
+    def result(self):
+        if not self.totals:
+            return None
+        self._compact()
+        keys = self.aggregate.key_columns
+        totals = self.totals[0].sort_values(keys, ignore_index=True)
+        for column in self.aggregate.sums:
+            if totals[column].dtype.kind == 'f':
+                totals[column] = totals[column].round(2)
+
+        registers = self.registers[0].sort_values([*keys, 'Register'], ignore_index=True)
+        group = registers.groupby(keys, sort=False).ngroup().to_numpy()
+        rank = registers['Rank'].to_numpy()
+        # Both frames are sorted by the keys and cover the same groups, so they line up
+        totals['DistinctPatients'] = estimate_groups(group, rank, len(totals))
+        totals['PatientSketch'] = encode_groups(group, registers['Register'].to_numpy(), rank)
+        return apply_schema(self.aggregate.name, totals)
+
+
+class AggregateWriter(TableWriter):
+    """Collects the aggregates of one fact table and writes them as their own tables on ``close()``.
+
+    With ``append=True`` the aggregate tables already in ``output_dir`` are
+    merged with the new rows and rewritten. ``extra_writers(name)`` can add
+    writers for other destinations, such as a database.
+    """
+
+    def __init__(self, aggregates, output_dir=None, output_format='csv', money_type='decimal', append=False,
+                 extra_writers=None, compression='none'):
+        self.aggregates = aggregates
+        self.extra_writers = extra_writers
+        self.output_dir = output_dir
+        self.output_format = output_format
+        self.money_type = money_type
+        self.compression = compression
+        self.row_counts = {}
+        self._accumulators = [_Accumulator(aggregate) for aggregate in aggregates]
+        if append:
+            for accumulator in self._accumulators:
+                if table_exists(output_dir, accumulator.aggregate.name):
+                    accumulator.add_table(read_table(output_dir, accumulator.aggregate.name,
+                                                     dtype={'PatientSketch': str}))
+
+    def encoder(self):
+        return summarize_chunk, (self.aggregates,)
+
+    def write_encoded(self, payload, rows):
+        for accumulator, (totals, registers) in zip(self._accumulators, payload):
+            accumulator.add(totals, registers)
+
+    def tables(self):
+        return {accumulator.aggregate.name: accumulator.result() for accumulator in self._accumulators}
+
+    def close(self):
+        if self.output_dir is None:
+            return
+        for name, table in self.tables().items():
+            if table is not None:
+                writers = table_writers(self.output_dir, name, self.output_format, money_type=self.money_type,
+                                        compression=self.compression)
+                if self.extra_writers is not None:
+                    writers.extend(self.extra_writers(name))
+                self.row_counts[name] = write_chunks([table], writers)
+
+
+def aggregate_tables(facts):
+    """Build every aggregate from in-memory fact tables keyed by name."""
+    tables = {}
+    for name, aggregates in AGGREGATES.items():
+        if name in facts:
+            writer = AggregateWriter(aggregates)
+            writer.write(facts[name])
+            tables.update(writer.tables())
+    return tables
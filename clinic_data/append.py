@@ -0,0 +1,219 @@
+"""Append mode: extend an existing output directory by a number of new days.
+
+The current extent of every fact table (last id, first and last date key)
+is read from the files already on disk. New rows continue the ids and are
+dated on the days after the latest fact date, at each table's existing
+rows-per-day rate. They are added as new Parquet part files and/or to the
+end of the CSVs, so a Power BI incremental refresh only has to pick up
+the new partitions. DimDate is rewritten so it covers the new days and its
+offsets count from the new last day, the Type-2 version tables on disk
+are rewritten with the versions that start in the new days added
+(existing versions keep their surrogate keys), and existing aggregate
+tables are merged with the new rows.
+"""
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from clinic_data.aggregates import AGGREGATES, AggregateWriter
+from clinic_data.config import GeneratorConfig
+from clinic_data.dimensions import (
+    generate_dim_branch, generate_dim_date, generate_dim_doctor, generate_dim_insurance, generate_dim_payment_method,
+    generate_dim_service,
+)
+from clinic_data.generator import FACT_TABLES
+from clinic_data.history import HISTORIES, extend_dim_versions, generate_dim_versions
+from clinic_data.parallel import write_fact_tables
+from clinic_data.schema import apply_schema
+from clinic_data.writers import (
+    COMPRESSIONS, CsvTableWriter, PartitionedParquetWriter, _pyarrow, csv_compression, find_csv, open_csv,
+    parquet_path, part_files, read_table, table_exists, table_writers, write_chunks,
+)
+
+
+def _date(date_key):
+    return datetime.strptime(str(int(date_key)), '%Y%m%d')
+
+
+def _parquet_extent(paths, columns):
+    """``{column: (min, max)}`` over Parquet files, from row-group statistics where present."""
+    _, pq = _pyarrow()
+    lows, highs = {}, {}
+    for path in paths:
+        metadata = pq.read_metadata(path)
+        for i in range(metadata.num_row_groups):
+            row_group = metadata.row_group(i)
+            for j in range(row_group.num_columns):
+                column = row_group.column(j)
+                stats = column.statistics
+                if column.path_in_schema not in columns or row_group.num_rows == 0:
+                    continue
+                if stats is None or not stats.has_min_max:
+                    values = pq.read_table(path, columns=[column.path_in_schema]).column(0).to_numpy()
+                    low, high = values.min(), values.max()
+                else:
+                    low, high = stats.min, stats.max
+                lows[column.path_in_schema] = min(low, lows.get(column.path_in_schema, low))
+                highs[column.path_in_schema] = max(high, highs.get(column.path_in_schema, high))
+    return {column: (lows[column], highs[column]) for column in columns}
+
+
+def _csv_extent(path, columns):
+    lows, highs = [], []
+    for chunk in pd.read_csv(open_csv(path), usecols=columns, chunksize=1_000_000, encoding='utf-8-sig'):
+        lows.append(chunk.min())
+        highs.append(chunk.max())
+    low, high = pd.concat(lows, axis=1).min(axis=1), pd.concat(highs, axis=1).max(axis=1)
+    return {column: (low[column], high[column]) for column in columns}
+
+
+def fact_extent(output_dir, name):
+    """``(last_id, first_date, last_date)`` of fact table ``name`` as written in ``output_dir``.
+
+    Partitioned Parquet is answered from the file footers without reading
+    any rows; a CSV has to be scanned.
+    """
+    fact = FACT_TABLES[name]
+    columns = [fact.id_column, fact.date_key]
+    parts = part_files(os.path.join(output_dir, name))
+    if parts:
+        extent = _parquet_extent(parts, columns)
+    elif find_csv(output_dir, name):
+        extent = _csv_extent(find_csv(output_dir, name), columns)
+    elif os.path.exists(parquet_path(output_dir, name)):
+        extent = _parquet_extent([parquet_path(output_dir, name)], columns)
+    else:
+        raise ValueError(f'{name} not found in {output_dir}; generate the dataset first')
+    return int(extent[fact.id_column][1]), _date(extent[fact.date_key][0]), _date(extent[fact.date_key][1])
+
+
+def _money_type(path):
+    pa, pq = _pyarrow()
+    schema = pq.read_schema(path)
+    return 'decimal' if any(pa.types.is_decimal(field.type) for field in schema) else 'float32'
+
+
+def _parquet_compression(path):
+    _, pq = _pyarrow()
+    metadata = pq.read_metadata(path)
+    codec = metadata.row_group(0).column(0).compression.lower() if metadata.num_row_groups else 'snappy'
+    return codec if codec in COMPRESSIONS else 'none'
+
+
+def _output_format(output_dir, name):
+    has_csv = find_csv(output_dir, name) is not None
+    has_parquet = os.path.exists(parquet_path(output_dir, name))
+    return 'both' if has_csv and has_parquet else 'parquet' if has_parquet else 'csv'
+
+
+def _compression(output_dir, name):
+    """Compression of the existing files of ``name``, so rewritten tables keep it."""
+    path = find_csv(output_dir, name)
+    if path is not None:
+        return csv_compression(path)
+    return _parquet_compression(parquet_path(output_dir, name))
+
+
+def _rewrite_writers(output_dir, name):
+    """Writers that replace a table in its existing format, money type and compression."""
+    output_format = _output_format(output_dir, name)
+    money_type = 'decimal' if output_format == 'csv' else _money_type(parquet_path(output_dir, name))
+    return table_writers(output_dir, name, output_format, money_type=money_type,
+                         compression=_compression(output_dir, name))
+
+
+def _append_writers(output_dir, name):
+    if os.path.exists(parquet_path(output_dir, name)):
+        raise ValueError(f'{parquet_path(output_dir, name)} is a single Parquet file and cannot be appended to; '
+                         'generate the dataset with --partition-facts')
+    writers = []
+    if find_csv(output_dir, name):
+        writers.append(CsvTableWriter(find_csv(output_dir, name), append=True))
+    parts = part_files(os.path.join(output_dir, name))
+    if parts:
+        writers.append(PartitionedParquetWriter(os.path.join(output_dir, name), FACT_TABLES[name].date_key,
+                                                _money_type(parts[0]), overwrite=False,
+                                                compression=_parquet_compression(parts[0])))
+    return writers
+
+
+def _dimension_size(output_dir, name, key):
+    return int(read_table(output_dir, name)[key].max())
+
+
+def append_config(output_dir, days, seed=42, chunk_size=None, distribution='uniform'):
+    """GeneratorConfig that continues every fact table in ``output_dir`` by ``days`` days."""
+    if days <= 0:
+        raise ValueError(f'days must be positive, got {days}')
+    extents = {name: fact_extent(output_dir, name) for name in FACT_TABLES}
+    first_day = min(first for _, first, _ in extents.values())
+    last_day = max(last for _, _, last in extents.values())
+    history_days = (last_day - first_day).days + 1
+
+    counts = {FACT_TABLES[name].count_attr: rows + round(rows * days / history_days)
+              for name, (rows, _, _) in extents.items()}
+    extra = {} if chunk_size is None else {'chunk_size': chunk_size}
+    return GeneratorConfig(
+        seed=seed,
+        distribution=distribution,
+        output_dir=output_dir,
+        num_patients=_dimension_size(output_dir, 'DimPatient', 'PatientID'),
+        num_branches=_dimension_size(output_dir, 'DimBranch', 'BranchID'),
+        num_doctors=_dimension_size(output_dir, 'DimDoctor', 'DoctorID'),
+        fact_day_span=days - 1,
+        fact_end_date=last_day + timedelta(days=days),
+        existing_rows={name: rows for name, (rows, _, _) in extents.items()},
+        **counts,
+        **extra,
+    ), first_day
+
+
+def append_days(output_dir, days, seed=42, chunk_size=None, workers=1, distribution='uniform', writer_threads=2):
+    """Append ``days`` days of facts to ``output_dir``; returns the rows written per table."""
+    config, first_day = append_config(output_dir, days, seed, chunk_size, distribution)
+    writers_by_table = {name: _append_writers(output_dir, name) for name in FACT_TABLES}
+    print(f"   Appending {config.fact_start_date:%Y-%m-%d} → {config.fact_end_date:%Y-%m-%d}")
+    aggregate_writers = []
+    for name, aggregates in AGGREGATES.items():
+        existing = [aggregate.name for aggregate in aggregates if table_exists(output_dir, aggregate.name)]
+        if existing:
+            output_format = _output_format(output_dir, existing[0])
+            money_type = 'decimal'
+            if output_format != 'csv':
+                money_type = _money_type(parquet_path(output_dir, existing[0]))
+            aggregate_writers.append(AggregateWriter(aggregates, output_dir, output_format, money_type, append=True,
+                                                     compression=_compression(output_dir, existing[0])))
+            writers_by_table[name].append(aggregate_writers[-1])
+
+    history_start = datetime(first_day.year, 1, 1)
+    dim_date = apply_schema('DimDate', generate_dim_date(history_start, config.date_end, config.as_of_date))
+    dims = {
+        'DimDate': dim_date,
+        'DimBranch': apply_schema('DimBranch', generate_dim_branch(config.num_branches)),
+        'DimService': apply_schema('DimService', generate_dim_service()),
+        'DimDoctor': apply_schema('DimDoctor', generate_dim_doctor(config.num_doctors)),
+        'DimInsurance': apply_schema('DimInsurance', generate_dim_insurance()),
+        'DimPaymentMethod': apply_schema('DimPaymentMethod', generate_dim_payment_method()),
+    }
+    # Existing versions are kept and continued, so the billing rows already written keep their keys
+    last_day = config.fact_start_date - timedelta(days=1)
+    for name, history in HISTORIES.items():
+        if table_exists(output_dir, name):
+            versions = extend_dim_versions(name, read_table(output_dir, name), last_day, config.fact_end_date,
+                                           config.seed)
+        else:
+            versions = generate_dim_versions(name, dims[history.dimension], history_start, config.fact_end_date,
+                                             config.seed)
+        dims[name] = apply_schema(name, versions)
+    row_counts = write_fact_tables(config, dims, writers_by_table, workers, writer_threads)
+    for writer in aggregate_writers:
+        row_counts.update(writer.row_counts)
+
+    print("📅 Rewriting DimDate...")
+    row_counts['DimDate'] = write_chunks([dim_date], _rewrite_writers(output_dir, 'DimDate'))
+    for name in HISTORIES:
+        if table_exists(output_dir, name):
+            print(f"📜 Rewriting {name}...")
+            row_counts[name] = write_chunks([dims[name]], _rewrite_writers(output_dir, name))
+    return row_counts
@@ -0,0 +1,318 @@
+import argparse
+import asyncio
+import os
+import sys
+
+from clinic_data.aggregates import AGGREGATES, AggregateWriter
+from clinic_data.append import append_days
+from clinic_data.config import DEFAULT_CHUNK_SIZE, GeneratorConfig
+from clinic_data.data_dictionary import DATA_DICTIONARY
+from clinic_data.distributions import DISTRIBUTIONS
+from clinic_data.generator import FACT_TABLES, generate_dimensions
+from clinic_data.odata import CACHE_BYTES, PAGE_SIZE, FeedServer, ODataFeed, TableStore
+from clinic_data.parallel import write_fact_tables
+from clinic_data.snapshot import SnapshotWriter, read_snapshot, snapshot_directory
+from clinic_data.validate import SAMPLE_ROWS, validate_directory
+from clinic_data.warehouse import SqliteWarehouse, load_directory
+from clinic_data.writers import COMPRESSIONS, FORMATS, MONEY_TYPES, table_writers, write_chunks
+
+
+def write_data_dictionary(output_dir):
+    path = os.path.join(output_dir, 'DataDictionary.md')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(DATA_DICTIONARY)
+    return path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Medical Clinic Power BI mock data generator')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='scale factor; 1 reproduces the original 18,000-row billing dataset '
+                             '(rows, branches, doctors and the date span grow linearly)')
+    parser.add_argument('--output-dir', default='.', help='directory for the output files (default: current directory)')
+    parser.add_argument('--seed', type=int, default=42, help='random seed (default: 42)')
+    parser.add_argument('--distribution', choices=DISTRIBUTIONS, default='uniform',
+                        help='uniform draws, or skewed: Zipf patients, weekday/seasonal dates, branches by '
+                             'NumRooms and doctors matched to the service specialty (default: uniform)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='fact rows generated and appended to the output per step; peak memory '
+                             f'depends on this, not on the table size (default: {DEFAULT_CHUNK_SIZE:,})')
+    parser.add_argument('--format', choices=FORMATS, default='csv',
+                        help='csv (utf-8-sig, the original files), parquet (typed, columnar) or both')
+    parser.add_argument('--partition-facts', action='store_true',
+                        help='write fact tables as Parquet folders partitioned by Year=/Month= of their date key')
+    parser.add_argument('--money-type', choices=MONEY_TYPES, default='decimal',
+                        help='Parquet type for money columns: decimal(14,2) or float32 (default: decimal)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='processes generating fact chunks in parallel; 0 = one per CPU. '
+                             'Output is identical for any worker count (default: 1)')
+    parser.add_argument('--compression', choices=COMPRESSIONS, default='none',
+                        help='write the CSVs as .csv.gz or .csv.zst and compress Parquet with the same codec '
+                             'instead of snappy (default: none)')
+    parser.add_argument('--writer-threads', type=int, default=2,
+                        help='threads encoding, compressing and writing fact chunks while the next ones are '
+                             'generated; 0 = write each chunk before generating the next (default: 2)')
+    parser.add_argument('--no-aggregates', action='store_true',
+                        help='skip the pre-aggregated Agg* summary tables built from the fact tables')
+    parser.add_argument('--sqlite', metavar='PATH',
+                        help='also load every table into a SQLite database at PATH, with keys and indexes')
+    parser.add_argument('--snapshot', metavar='DIR',
+                        help='also write a memory-mappable binary snapshot (one array file per column) to DIR')
+    return parser.parse_args(argv)
+
+
+def parse_append_args(argv):
+    parser = argparse.ArgumentParser(prog='2.py append',
+                                     description='Extend an existing output directory with new days of fact data')
+    parser.add_argument('--days', type=int, required=True, help='number of days to add after the latest fact date')
+    parser.add_argument('--output-dir', default='.', help='directory holding the generated files (default: current directory)')
+    parser.add_argument('--seed', type=int, default=42,
+                        help='random seed for the new fact rows and the new price, rate and coverage revisions; '
+                             'existing rows and versions are kept (default: 42)')
+    parser.add_argument('--distribution', choices=DISTRIBUTIONS, default='uniform',
+                        help='distribution of the new rows; use the one the directory was generated with')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'fact rows generated and appended per step (default: {DEFAULT_CHUNK_SIZE:,})')
+    parser.add_argument('--workers', type=int, default=1, help='processes generating fact chunks; 0 = one per CPU')
+    parser.add_argument('--writer-threads', type=int, default=2,
+                        help='threads writing fact chunks while the next ones are generated (default: 2)')
+    return parser.parse_args(argv)
+
+
+def append_main(argv):
+    args = parse_append_args(argv)
+    if args.days <= 0:
+        raise SystemExit('--days must be positive')
+    if args.chunk_size <= 0:
+        raise SystemExit('--chunk-size must be positive')
+    if args.workers < 0:
+        raise SystemExit('--workers must be 0 (one per CPU) or positive')
+    if args.writer_threads < 0:
+        raise SystemExit('--writer-threads must be 0 or positive')
+
+    print("🏥 Medical Clinic Power BI Mock Data Generator - append")
+    print("=" * 60)
+    try:
+        row_counts = append_days(args.output_dir, args.days, args.seed, args.chunk_size, args.workers,
+                                 args.distribution, args.writer_threads)
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+    print(f"\n✅ Appended {args.days} day(s) to {args.output_dir}")
+    print(f"\n📊 Summary:")
+    for name, rows in row_counts.items():
+        print(f"   - {name}: {rows:,} records {'written' if name.startswith('Dim') or name.startswith('Agg') else 'added'}")
+    print("\n💡 New fact rows are in new Year=/Month= part files (and at the end of the CSVs);")
+    print("   DimDate, the *Version tables and the Agg* tables were rewritten.")
+
+
+def parse_sqlite_args(argv):
+    parser = argparse.ArgumentParser(prog='2.py sqlite',
+                                     description='Load already generated CSV/Parquet output into a SQLite database')
+    parser.add_argument('--output-dir', default='.', help='directory holding the generated files (default: current directory)')
+    parser.add_argument('--database', help='SQLite file to create (default: <output-dir>/clinic.db)')
+    return parser.parse_args(argv)
+
+
+def report_foreign_keys(violations):
+    if violations:
+        print(f"   ⚠️ {len(violations):,} foreign key violations, first: {violations[0]}")
+    else:
+        print("   ✓ All foreign keys resolve")
+
+
+def sqlite_main(argv):
+    args = parse_sqlite_args(argv)
+    path = args.database or os.path.join(args.output_dir, 'clinic.db')
+    print(f"🗄️ Loading {args.output_dir} into {path}...")
+    row_counts, violations = load_directory(args.output_dir, path)
+    for name, rows in row_counts.items():
+        print(f"   - {name}: {rows:,} records")
+    report_foreign_keys(violations)
+
+
+def parse_snapshot_args(argv):
+    parser = argparse.ArgumentParser(prog='2.py snapshot',
+                                     description='Write a memory-mappable binary snapshot of already generated output')
+    parser.add_argument('--output-dir', default='.', help='directory holding the generated files (default: current directory)')
+    parser.add_argument('--snapshot-dir', help='snapshot directory to create (default: <output-dir>/snapshot)')
+    return parser.parse_args(argv)
+
+
+def snapshot_main(argv):
+    args = parse_snapshot_args(argv)
+    directory = args.snapshot_dir or os.path.join(args.output_dir, 'snapshot')
+    print(f"🧊 Writing snapshot of {args.output_dir} to {directory}...")
+    for name, rows in snapshot_directory(args.output_dir, directory).items():
+        print(f"   - {name}: {rows:,} records")
+
+
+def parse_validate_args(argv):
+    parser = argparse.ArgumentParser(prog='2.py validate',
+                                     description='Check the foreign keys and row invariants of already generated output')
+    parser.add_argument('--output-dir', default='.', help='directory holding the generated files (default: current directory)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'rows read per step (default: {DEFAULT_CHUNK_SIZE:,})')
+    parser.add_argument('--samples', type=int, default=SAMPLE_ROWS,
+                        help=f'violating rows shown per check (default: {SAMPLE_ROWS})')
+    return parser.parse_args(argv)
+
+
+def validate_main(argv):
+    args = parse_validate_args(argv)
+    if args.chunk_size <= 0:
+        raise SystemExit('--chunk-size must be positive')
+    print(f"🔍 Validating {args.output_dir}...")
+    results = validate_directory(args.output_dir, args.chunk_size, args.samples)
+    failed = [result for result in results if result.violations]
+    for result in results:
+        mark = '⚠️' if result.violations else '✓'
+        print(f"   {mark} {result.table}: {result.check} ({result.violations:,} of {result.rows:,} rows)")
+        for sample in result.samples:
+            print(f"        {sample}")
+    if failed:
+        raise SystemExit(f"{len(failed)} of {len(results)} checks failed")
+    print(f"\n✅ All {len(results)} checks passed")
+
+
+def parse_serve_args(argv):
+    parser = argparse.ArgumentParser(prog='2.py serve',
+                                     description='Serve already generated output as a local OData feed')
+    parser.add_argument('--output-dir', default='.', help='directory holding the generated files (default: current directory)')
+    parser.add_argument('--snapshot-dir', help='serve a snapshot written by --snapshot instead, mapped without parsing')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000, help='port to listen on; 0 picks a free one (default: 8000)')
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE,
+                        help=f'rows per response page before an @odata.nextLink (default: {PAGE_SIZE:,})')
+    parser.add_argument('--cache-mb', type=int, default=CACHE_BYTES >> 20,
+                        help=f'memory for cached results in MB; 0 disables the cache (default: {CACHE_BYTES >> 20})')
+    return parser.parse_args(argv)
+
+
+def serve_main(argv):
+    args = parse_serve_args(argv)
+    if args.page_size <= 0:
+        raise SystemExit('--page-size must be positive')
+    if args.cache_mb < 0:
+        raise SystemExit('--cache-mb must be 0 or positive')
+    source = args.snapshot_dir or args.output_dir
+    print(f"📡 Loading {source}...")
+    try:
+        store = TableStore(read_snapshot(args.snapshot_dir)) if args.snapshot_dir else \
+            TableStore.from_directory(args.output_dir)
+    except (ValueError, FileNotFoundError) as e:
+        raise SystemExit(str(e))
+    for name, table in store.tables.items():
+        print(f"   - {name}: {len(table):,} records")
+    feed = ODataFeed(store, args.page_size, args.cache_mb << 20)
+    server = FeedServer(feed, args.host, args.port)
+
+    async def run():
+        await server.start()
+        print(f"\n🌐 OData feed at http://{args.host}:{server.port}/ (Power BI: Get Data → OData feed)")
+        print("   Ctrl+C stops the server")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print(f"\n🛑 Stopped after {feed.requests:,} requests ({feed.cache.hits:,} answered from the cache)")
+
+
+SUBCOMMANDS = {'append': append_main, 'sqlite': sqlite_main, 'snapshot': snapshot_main, 'validate': validate_main,
+               'serve': serve_main}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
+    args = parse_args(argv)
+    if args.chunk_size <= 0:
+        raise SystemExit('--chunk-size must be positive')
+    if args.workers < 0:
+        raise SystemExit('--workers must be 0 (one per CPU) or positive')
+    if args.writer_threads < 0:
+        raise SystemExit('--writer-threads must be 0 or positive')
+    if args.partition_facts and args.format == 'csv':
+        raise SystemExit('--partition-facts applies to Parquet output; add --format parquet or --format both')
+    config = GeneratorConfig.from_scale(args.scale, seed=args.seed, output_dir=args.output_dir,
+                                        chunk_size=args.chunk_size, distribution=args.distribution)
+
+    print("🏥 Medical Clinic Power BI Mock Data Generator")
+    print("=" * 60)
+    print(f"   Scale factor: {config.scale:g}  |  Seed: {config.seed}  |  Distribution: {config.distribution}  |  "
+          f"Output: {config.output_dir}")
+
+    os.makedirs(config.output_dir, exist_ok=True)
+    dims = generate_dimensions(config)
+    row_counts = {}
+    warehouse = SqliteWarehouse(args.sqlite) if args.sqlite else None
+    snapshot = SnapshotWriter(args.snapshot) if args.snapshot else None
+
+    def extra_writers(name):
+        return [store.writer(name) for store in (warehouse, snapshot) if store]
+
+    print(f"\n💾 Saving dimension tables ({args.format})...")
+    for name, table in dims.items():
+        writers = table_writers(config.output_dir, name, args.format, money_type=args.money_type,
+                                compression=args.compression)
+        row_counts[name] = write_chunks([table], writers + extra_writers(name))
+
+    # Fact tables are streamed: each chunk is written as soon as it is generated
+    writers_by_table = {}
+    for name, fact in FACT_TABLES.items():
+        date_key = fact.date_key if args.partition_facts else None
+        writers_by_table[name] = (table_writers(config.output_dir, name, args.format, date_key, args.money_type,
+                                                args.compression) + extra_writers(name))
+    aggregate_writers = []
+    if not args.no_aggregates:
+        for name, aggregates in AGGREGATES.items():
+            aggregate_writers.append(AggregateWriter(aggregates, config.output_dir, args.format, args.money_type,
+                                                     extra_writers=extra_writers, compression=args.compression))
+            writers_by_table[name].append(aggregate_writers[-1])
+    row_counts.update(write_fact_tables(config, dims, writers_by_table, args.workers, args.writer_threads))
+    for writer in aggregate_writers:
+        row_counts.update(writer.row_counts)
+
+    if warehouse:
+        print(f"\n🗄️ Indexing SQLite database {args.sqlite}...")
+        report_foreign_keys(warehouse.finish())
+    if snapshot:
+        print(f"\n🧊 Snapshot manifest: {snapshot.finish()}")
+
+    print("\n✅ All tables generated successfully!")
+    print(f"\n📊 Summary:")
+    for name, rows in row_counts.items():
+        print(f"   - {name}: {rows:,} records")
+
+    print("\n📖 Generating Data Dictionary...")
+    path = write_data_dictionary(config.output_dir)
+    print(f"\n📖 Data Dictionary saved as: {path}")
+
+    years = config.date_end.year - config.date_start.year + 1
+    print("\n" + "="*60)
+    print("🎉 ALL FILES GENERATED SUCCESSFULLY!")
+    print("="*60)
+    print("\n📦 Generated Files:")
+    print(f"   ✓ {len(dims) + len(FACT_TABLES)} tables as {args.format} ({len(dims)} Dimensions + "
+          f"{len(FACT_TABLES)} Facts)")
+    if aggregate_writers:
+        print(f"   ✓ {len(row_counts) - len(dims) - len(FACT_TABLES)} pre-aggregated summary tables (Agg*)")
+    print("   ✓ 1 Data Dictionary (Markdown)")
+    print("\n🏥 Key Features:")
+    print("   ✓ ICD-10 codes used for service classification")
+    print(f"   ✓ {years} years of realistic medical clinic data ({config.date_start.year}-{config.date_end.year})")
+    print(f"   ✓ {config.num_branches:,} branches across 4 regions in Thailand")
+    print(f"   ✓ {config.num_billing_records:,} billing transactions with full financial details")
+    print("\n📂 Next Steps:")
+    print("   1. Open Power BI Desktop")
+    print("   2. Get Data → Text/CSV → Import all CSV files")
+    print("   3. Go to Model View → Create relationships as per Data Dictionary")
+    print("   4. Mark DimDate as Date Table")
+    print("   5. Start building your dashboards!")
+    print("\n💡 Tip: Refer to DataDictionary.md for:")
+    print("   - Table structures and relationships")
+    print("   - Recommended measures and KPIs")
+    print("   - Dashboard ideas")
+    print("\n🚀 Happy analyzing!")
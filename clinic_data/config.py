@@ -0,0 +1,85 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+# Row counts and date span of the original dataset (scale factor 1)
+BASE_PATIENTS = 3000
+BASE_APPOINTMENTS = 15000
+BASE_VISITS = 12000
+BASE_BILLING_RECORDS = 18000
+BASE_BRANCHES = 8
+BASE_DOCTORS = 10
+BASE_FACT_DAY_SPAN = 1000
+
+# Facts always end on the same day; larger scales extend the history backwards
+FACT_END_DATE = datetime(2023, 1, 1) + timedelta(days=BASE_FACT_DAY_SPAN)
+DATE_END = datetime(2025, 12, 31)
+
+# Fact rows generated and written per step, which bounds peak memory
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+# Appointments per day do not shrink below scale 1 (the date span does), so neither do the doctors seeing them
+MIN_DOCTORS = BASE_DOCTORS
+
+# datetime64 and DimDate stay sensible only for a bounded history
+MAX_FACT_DAY_SPAN = 100 * 365
+
+
+def _scaled(base, scale):
+    return max(1, int(round(base * scale)))
+
+
+@dataclass
+class GeneratorConfig:
+    scale: float = 1.0
+    seed: int = 42
+    output_dir: str = '.'
+    num_patients: int = BASE_PATIENTS
+    num_appointments: int = BASE_APPOINTMENTS
+    num_visits: int = BASE_VISITS
+    num_billing_records: int = BASE_BILLING_RECORDS
+    num_branches: int = BASE_BRANCHES
+    num_doctors: int = BASE_DOCTORS
+    fact_day_span: int = BASE_FACT_DAY_SPAN
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    fact_end_date: datetime = FACT_END_DATE
+    # Preset name from clinic_data.distributions.DISTRIBUTIONS, or a Distribution
+    distribution: object = 'uniform'
+    # Fact rows already on disk per table; generation continues with the next id (append mode)
+    existing_rows: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_scale(cls, scale, **overrides):
+        """TPC-style sizing: every row count and the fact date span grow linearly with ``scale``."""
+        if scale <= 0:
+            raise ValueError(f'scale must be positive, got {scale}')
+        values = dict(
+            scale=scale,
+            num_patients=_scaled(BASE_PATIENTS, scale),
+            num_appointments=_scaled(BASE_APPOINTMENTS, scale),
+            num_visits=_scaled(BASE_VISITS, scale),
+            num_billing_records=_scaled(BASE_BILLING_RECORDS, scale),
+            num_branches=_scaled(BASE_BRANCHES, scale),
+            num_doctors=max(_scaled(BASE_DOCTORS, scale), MIN_DOCTORS),
+            fact_day_span=min(_scaled(BASE_FACT_DAY_SPAN, scale), MAX_FACT_DAY_SPAN),
+        )
+        values.update(overrides)
+        return cls(**values)
+
+    @property
+    def fact_start_date(self):
+        return self.fact_end_date - timedelta(days=self.fact_day_span)
+
+    @property
+    def date_start(self):
+        """DimDate starts on January 1st of the first fact year."""
+        return datetime(self.fact_start_date.year, 1, 1)
+
+    @property
+    def date_end(self):
+        """DimDate runs to DATE_END, or to the end of the last fact year once appends pass it."""
+        return max(DATE_END, datetime(self.fact_end_date.year, 12, 31))
+
+    @property
+    def as_of_date(self):
+        """The dataset's 'today' (last fact day), which DimDate's relative offsets count from."""
+        return self.fact_end_date
@@ -0,0 +1,230 @@
+"""In-memory billing cube for fast slicing of FactBillingDetail by dimension attributes.
+
+The billing rows are rolled up once to cells, one per combination of the
+cube's attributes (Region, Category, Specialty, MembershipLevel, ...,
+YearMonth), and only the cells are kept in memory:
+
+- every attribute is dictionary encoded: a sorted array of its members and
+  a small integer code per cell;
+- the additive measures (``BillingCount`` and ``BILLING_MEASURES``) are one
+  contiguous float64 array per measure;
+- every member has a packed bitmap of the cells it appears in, so a filter
+  is a few ORs and ANDs over bytes.
+
+The number of cells is bounded by the product of the attribute
+cardinalities rather than the row count, so a query over 50M billing rows
+costs the same ``np.bincount`` over the cells as one over 50K. Attributes
+that grow with the scale factor (BranchName, PatientID) make poor cube
+attributes for the same reason. Distinct counts are not additive and are
+not part of the cube.
+"""
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from clinic_data.aggregates import BILLING_MEASURES
+from clinic_data.measures import column_ref, ref_name
+from clinic_data.warehouse import documented_keys
+from clinic_data.writers import iter_table_chunks, read_table
+
+FACT = 'FactBillingDetail'
+
+DEFAULT_ATTRIBUTES = (
+    'DimBranch[Region]', 'DimService[Category]', 'DimDoctor[Specialty]', 'DimPatient[MembershipLevel]',
+    'DimInsurance[InsuranceName]', 'DimPaymentMethod[PaymentMethodName]',
+    'DimDate[Year]', 'DimDate[Quarter]', 'DimDate[YearMonth]',
+)
+
+CUBE_MEASURES = ('BillingCount', *BILLING_MEASURES)
+
+# Group-bys with fewer combinations than this are counted into a dense array instead of np.unique
+_DENSE_GROUPS = 1 << 22
+
+# Merge the per-chunk cells once this many are pending
+_COMPACT_CELLS = 2_000_000
+
+# Roll-ups to fewer attributes kept per cube
+ROLLUP_CACHE_SIZE = 64
+
+
+def _fact_keys():
+    """``{dimension: (fact column, dimension key)}`` for FactBillingDetail's dimensions."""
+    _, foreign_keys = documented_keys()
+    return {parent: (column, parent_column) for child, column, parent, parent_column in foreign_keys
+            if child == FACT and parent.startswith('Dim')}
+
+
+class _CellEncoder:
+    """Maps billing rows to mixed-radix cell numbers over the attribute codes."""
+
+    def __init__(self, dims, attributes):
+        fact_keys = _fact_keys()
+        self.attributes = [column_ref(attribute) for attribute in attributes]
+        self.labels = {}
+        self._lookups = []
+        for ref in self.attributes:
+            table, column = ref
+            if table not in fact_keys:
+                raise ValueError(f'{ref_name(ref)} is not related to {FACT}')
+            fact_column, key_column = fact_keys[table]
+            dim = dims[table].sort_values(key_column)
+            codes, labels = pd.factorize(dim[column], sort=True)
+            self.labels[ref] = np.asarray(labels)
+            self._lookups.append((fact_column, dim[key_column].to_numpy(), codes.astype(np.int64)))
+        self.radices = [len(self.labels[ref]) for ref in self.attributes]
+
+    def cells(self, chunk):
+        codes = []
+        for fact_column, keys, dim_codes in self._lookups:
+            values = chunk[fact_column].to_numpy()
+            positions = np.minimum(np.searchsorted(keys, values), len(keys) - 1)
+            if not np.array_equal(keys[positions], values):
+                raise ValueError(f'{FACT}.{fact_column} has keys missing from its dimension')
+            codes.append(dim_codes[positions])
+        return _combine(codes, self.radices, len(chunk))
+
+
+def _combine(codes, radices, size):
+    """Mixed-radix numbers from one code array per attribute."""
+    cells = np.zeros(size, dtype=np.int64)
+    for code, radix in zip(codes, radices):
+        cells = cells * radix + code
+    return cells
+
+
+def _split(cells, refs, radices):
+    """``{ref: codes}`` back from mixed-radix numbers."""
+    codes = {}
+    for ref, radix in zip(reversed(refs), reversed(radices)):
+        codes[ref] = (cells % radix).astype(np.uint16 if radix <= 1 << 16 else np.int64)
+        cells = cells // radix
+    return {ref: codes[ref] for ref in refs}
+
+
+def _sum_cells(cells, values):
+    """Distinct cells and the per-cell sums of each array in ``values``."""
+    unique, inverse = np.unique(cells, return_inverse=True)
+    return unique, {name: np.bincount(inverse, weights=array, minlength=len(unique))
+                    for name, array in values.items()}
+
+
+class BillingCube:
+    """FactBillingDetail summed per cell of dictionary-encoded attributes; see the module docstring.
+
+    A query only touching some attributes runs on a roll-up of the cells to
+    those attributes, built on first use and cached, so repeated query
+    shapes (dashboard tiles, API calls) scan far fewer cells.
+    """
+
+    def __init__(self, attributes, labels, codes, measures):
+        self.attributes = attributes
+        self.labels = labels
+        self.codes = codes
+        self.measures = measures
+        self.cells = len(measures['BillingCount'])
+        self.bitmaps = {ref: np.packbits(codes[ref][None, :] == np.arange(len(labels[ref]))[:, None], axis=1)
+                        for ref in attributes}
+        self._rollups = OrderedDict()
+
+    @classmethod
+    def build(cls, dims, chunks, attributes=DEFAULT_ATTRIBUTES):
+        """Roll up an iterable of billing chunks; only the cells are held in memory."""
+        encoder = _CellEncoder(dims, attributes)
+        pending_cells, pending_sums = [], []
+        for chunk in chunks:
+            values = {'BillingCount': np.ones(len(chunk))}
+            values.update((name, chunk[name].to_numpy(dtype=np.float64)) for name in BILLING_MEASURES)
+            cells, sums = _sum_cells(encoder.cells(chunk), values)
+            pending_cells.append(cells)
+            pending_sums.append(sums)
+            if sum(len(part) for part in pending_cells) > _COMPACT_CELLS:
+                pending_cells, pending_sums = cls._compact(pending_cells, pending_sums)
+        if not pending_cells:
+            pending_cells, pending_sums = [np.zeros(0, dtype=np.int64)], [
+                {name: np.zeros(0) for name in CUBE_MEASURES}]
+        (cells,), (sums,) = cls._compact(pending_cells, pending_sums)
+        return cls(encoder.attributes, encoder.labels, _split(cells, encoder.attributes, encoder.radices), sums)
+
+    @staticmethod
+    def _compact(cells, sums):
+        merged = _sum_cells(np.concatenate(cells), {name: np.concatenate([part[name] for part in sums])
+                                                    for name in CUBE_MEASURES})
+        return [merged[0]], [merged[1]]
+
+    @classmethod
+    def from_tables(cls, tables, attributes=DEFAULT_ATTRIBUTES):
+        return cls.build(tables, [tables[FACT]], attributes)
+
+    @classmethod
+    def from_directory(cls, output_dir, attributes=DEFAULT_ATTRIBUTES, chunk_size=1_000_000):
+        """Build the cube from written output, reading FactBillingDetail chunk by chunk."""
+        dims = {table: read_table(output_dir, table) for table in {column_ref(a)[0] for a in attributes}}
+        return cls.build(dims, iter_table_chunks(output_dir, FACT, chunk_size), attributes)
+
+    def covers(self, refs):
+        return all(ref in self.labels for ref in refs)
+
+    def rollup(self, refs):
+        """The cube summed over every attribute not in ``refs``."""
+        wanted = set(refs)
+        refs = [ref for ref in self.attributes if ref in wanted]
+        if len(refs) == len(self.attributes):
+            return self
+        key = tuple(refs)
+        if key in self._rollups:
+            self._rollups.move_to_end(key)
+            return self._rollups[key]
+        radices = [len(self.labels[ref]) for ref in refs]
+        cells, sums = _sum_cells(_combine([self.codes[ref] for ref in refs], radices, self.cells), self.measures)
+        cube = BillingCube(refs, {ref: self.labels[ref] for ref in refs}, _split(cells, refs, radices), sums)
+        self._rollups[key] = cube
+        if len(self._rollups) > ROLLUP_CACHE_SIZE:
+            self._rollups.popitem(last=False)
+        return cube
+
+    def mask(self, filters):
+        """Boolean mask over the cells for ``{reference: value or values}``, or None without filters."""
+        bits = None
+        for reference, values in (filters or {}).items():
+            ref = column_ref(reference)
+            if isinstance(values, (str, bytes)) or not hasattr(values, '__iter__'):
+                values = [values]
+            members = np.flatnonzero(np.isin(self.labels[ref], list(values)))
+            selected = np.bitwise_or.reduce(self.bitmaps[ref][members], axis=0) if len(members) else \
+                np.zeros(self.bitmaps[ref].shape[1], dtype=np.uint8)
+            bits = selected if bits is None else bits & selected
+        return None if bits is None else np.unpackbits(bits, count=self.cells).view(bool)
+
+    def query(self, measures=('NetAmount',), group_by=(), filters=None):
+        """Sums of ``measures`` per combination of the ``group_by`` attributes; empty groups are omitted."""
+        refs = [column_ref(reference) for reference in group_by]
+        filters = {column_ref(reference): values for reference, values in (filters or {}).items()}
+        unknown = [ref_name(ref) for ref in [*refs, *filters] if ref not in self.labels]
+        if unknown:
+            raise ValueError(f"not cube attributes: {', '.join(unknown)}")
+        cube = self.rollup([*refs, *filters])
+        if cube is not self:
+            return cube.query(measures, refs, filters)
+        mask = self.mask(filters)
+        cells = slice(None) if mask is None else np.flatnonzero(mask)
+
+        radices = [len(self.labels[ref]) for ref in refs]
+        group = _combine([self.codes[ref][cells] for ref in refs], radices,
+                         self.cells if mask is None else len(cells))
+        size = int(np.prod(radices, dtype=np.float64))
+        if size <= _DENSE_GROUPS:
+            count = np.bincount(group, weights=self.measures['BillingCount'][cells], minlength=size)
+            groups = np.flatnonzero(count)
+            sums = {name: np.bincount(group, weights=self.measures[name][cells], minlength=size)[groups]
+                    for name in measures}
+        else:
+            groups, inverse = np.unique(group, return_inverse=True)
+            sums = {name: np.bincount(inverse, weights=self.measures[name][cells], minlength=len(groups))
+                    for name in measures}
+
+        frame = pd.DataFrame({ref_name(ref): self.labels[ref][codes]
+                              for ref, codes in _split(groups, refs, radices).items()})
+        for name in measures:
+            frame[name] = sums[name].astype(np.int64) if name == 'BillingCount' else sums[name]
+        return frame
@@ -0,0 +1,105 @@
+"""Lazy, dependency-aware access to the generated tables from Python.
+
+``Dataset(config)`` builds nothing up front. Each table is a node of the
+graph in ``generator.TABLES``: ``TABLES[name].dims`` are the tables it is
+built from. Every fact table reads DimDate, DimBranch, DimService and
+DimDoctor (day weights, rooms, durations and specialties); FactBillingDetail
+also needs DimPaymentMethod and the three ``*Version`` tables, which in turn
+need DimService, DimDoctor and DimInsurance. The first ``dataset[name]``
+builds that table and whatever it depends on, and keeps them; nothing else
+is generated::
+
+    from clinic_data import Dataset, GeneratorConfig
+
+    dataset = Dataset(GeneratorConfig.from_scale(10, seed=7))
+    dataset['DimDate']             # DimDate only
+    dataset['FactAppointment']     # DimBranch, DimService, DimDoctor, then the appointments
+    dataset.built                  # ('DimDate', 'DimBranch', ..., 'FactAppointment')
+
+FactPatientVisit and FactBillingDetail link to their parent fact rows by
+rebuilding only the parent blocks they reference, so no fact table depends
+on another. The tables are the same as those ``generate_tables`` and the
+CLI produce for the same config, whatever the order they are requested in.
+
+Generating needs pandas, which takes most of a second to import, so it is
+imported on the first table built: ``import clinic_data`` and creating a
+``Dataset`` stay in the milliseconds.
+"""
+from collections.abc import Mapping
+
+from clinic_data.config import GeneratorConfig
+
+
+def _generator():
+    from clinic_data import generator
+    return generator
+
+
+class Dataset(Mapping):
+    """The tables of ``config``, keyed by output file name and built on first access.
+
+    A read-only mapping: iterating gives the names in build order without
+    building anything, while ``values()``, ``items()`` and ``dict(dataset)``
+    build every table. ``verbose`` prints the CLI's progress line per table.
+    """
+
+    def __init__(self, config=None, verbose=False):
+        self.config = config or GeneratorConfig()
+        self.verbose = verbose
+        self._tables = {}
+
+    def __getitem__(self, name):
+        if name not in self._tables:
+            generator = _generator()
+            if name not in generator.TABLES:
+                raise KeyError(name)
+            dims = {dim: self[dim] for dim in generator.TABLES[name].dims}
+            if self.verbose:
+                print(generator.TABLES[name].label)
+            if name in generator.FACT_TABLES:
+                self._tables[name] = generator.generate_fact_table(name, self.config, dims)
+            else:
+                self._tables[name] = generator.build_dimension(name, self.config, dims)
+        return self._tables[name]
+
+    def __contains__(self, name):
+        return name in _generator().TABLES
+
+    def __iter__(self):
+        return iter(_generator().TABLES)
+
+    def __len__(self):
+        return len(_generator().TABLES)
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.config!r}, built={list(self._tables)})'
+
+    @property
+    def built(self):
+        """Names of the tables built so far, in the order they were built."""
+        return tuple(self._tables)
+
+    def dependencies(self, name):
+        """Every table ``name`` is built from, directly or not, in build order; ``name`` excluded."""
+        tables = _generator().TABLES
+        if name not in tables:
+            raise KeyError(name)
+        needed, pending = set(), list(tables[name].dims)
+        while pending:
+            dim = pending.pop()
+            if dim not in needed:
+                needed.add(dim)
+                pending.extend(tables[dim].dims)
+        return tuple(table for table in tables if table in needed)
+
+    def chunks(self, name):
+        """Fact table ``name`` in ``config.chunk_size``-row DataFrames, without keeping it.
+
+        Only its dimensions are kept, so a fact table larger than memory can
+        be streamed. Raises ValueError for a dimension table.
+        """
+        generator = _generator()
+        if name not in generator.FACT_TABLES:
+            raise ValueError(f'{name} is not a fact table; expected one of {", ".join(generator.FACT_TABLES)}')
+        dims = {dim: self[dim] for dim in generator.FACT_TABLES[name].dims}
+        return generator.iter_fact_chunks(name, self.config, dims)
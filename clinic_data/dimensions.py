@@ -0,0 +1,415 @@
+import numpy as np
+import pandas as pd
+
+BRANCHES = [
+    {'BranchID': 1, 'BranchCode': 'BKK-CTW', 'BranchName': 'คลินิกเซ็นทรัลเวิลด์', 'Region': 'กรุงเทพฯ',
+     'Province': 'กรุงเทพมหานคร', 'District': 'ปทุมวัน', 'Size': 'Large', 'OpenDate': '2020-01-15',
+     'SquareMeter': 450, 'NumRooms': 8, 'MonthlyRent': 280000, 'IsActive': 1},
+    {'BranchID': 2, 'BranchCode': 'BKK-SKM', 'BranchName': 'คลินิกสุขุมวิท', 'Region': 'กรุงเทพฯ',
+     'Province': 'กรุงเทพมหานคร', 'District': 'วัฒนา', 'Size': 'Large', 'OpenDate': '2020-06-01',
+     'SquareMeter': 380, 'NumRooms': 7, 'MonthlyRent': 250000, 'IsActive': 1},
+    {'BranchID': 3, 'BranchCode': 'BKK-STW', 'BranchName': 'คลินิกสาทร', 'Region': 'กรุงเทพฯ',
+     'Province': 'กรุงเทพมหานคร', 'District': 'สาทร', 'Size': 'Medium', 'OpenDate': '2021-03-20',
+     'SquareMeter': 280, 'NumRooms': 5, 'MonthlyRent': 180000, 'IsActive': 1},
+    {'BranchID': 4, 'BranchCode': 'CMI-NMM', 'BranchName': 'คลินิกนิมมาน', 'Region': 'ภาคเหนือ',
+     'Province': 'เชียงใหม่', 'District': 'เมือง', 'Size': 'Medium', 'OpenDate': '2021-08-15',
+     'SquareMeter': 300, 'NumRooms': 6, 'MonthlyRent': 120000, 'IsActive': 1},
+    {'BranchID': 5, 'BranchCode': 'PKT-PTL', 'BranchName': 'คลินิกภูเก็ต', 'Region': 'ภาคใต้',
+     'Province': 'ภูเก็ต', 'District': 'กะทู้', 'Size': 'Medium', 'OpenDate': '2022-01-10',
+     'SquareMeter': 320, 'NumRooms': 6, 'MonthlyRent': 140000, 'IsActive': 1},
+    {'BranchID': 6, 'BranchCode': 'HDY-CTR', 'BranchName': 'คลินิกหาดใหญ่', 'Region': 'ภาคใต้',
+     'Province': 'สงขลา', 'District': 'หาดใหญ่', 'Size': 'Small', 'OpenDate': '2022-09-01',
+     'SquareMeter': 200, 'NumRooms': 4, 'MonthlyRent': 70000, 'IsActive': 1},
+    {'BranchID': 7, 'BranchCode': 'KKN-CTR', 'BranchName': 'คลินิกขอนแก่น', 'Region': 'ภาคอีสาน',
+     'Province': 'ขอนแก่น', 'District': 'เมือง', 'Size': 'Medium', 'OpenDate': '2023-02-15',
+     'SquareMeter': 260, 'NumRooms': 5, 'MonthlyRent': 85000, 'IsActive': 1},
+    {'BranchID': 8, 'BranchCode': 'CHB-CTR', 'BranchName': 'คลินิกชลบุรี', 'Region': 'ภาคตะวันออก',
+     'Province': 'ชลบุรี', 'District': 'เมือง', 'Size': 'Small', 'OpenDate': '2023-07-01',
+     'SquareMeter': 220, 'NumRooms': 4, 'MonthlyRent': 75000, 'IsActive': 1},
+]
+
+SERVICES = [
+    # General Medicine
+    {'ServiceID': 1, 'ServiceCode': 'Z00.0', 'ServiceName': 'ตรวจสุขภาพทั่วไป',
+     'ICD10Description': 'General medical examination',
+     'Category': 'General Medicine', 'SubCategory': 'Consultation', 'BasePrice': 500, 'Cost': 150, 'Duration': 30},
+    {'ServiceID': 2, 'ServiceCode': 'R50.9', 'ServiceName': 'ตรวจรักษาโรคทั่วไป',
+     'ICD10Description': 'Fever, unspecified',
+     'Category': 'General Medicine', 'SubCategory': 'Treatment', 'BasePrice': 800, 'Cost': 250, 'Duration': 45},
+
+    # Dermatology
+    {'ServiceID': 3, 'ServiceCode': 'L98.9', 'ServiceName': 'ตรวจผิวหนัง',
+     'ICD10Description': 'Disorder of skin and subcutaneous tissue',
+     'Category': 'Dermatology', 'SubCategory': 'Consultation', 'BasePrice': 1000, 'Cost': 300, 'Duration': 30},
+    {'ServiceID': 4, 'ServiceCode': 'L70.0', 'ServiceName': 'รักษาสิว',
+     'ICD10Description': 'Acne vulgaris',
+     'Category': 'Dermatology', 'SubCategory': 'Treatment', 'BasePrice': 2500, 'Cost': 800, 'Duration': 60},
+    {'ServiceID': 5, 'ServiceCode': 'L81.9', 'ServiceName': 'เลเซอร์หน้าใส',
+     'ICD10Description': 'Disorder of pigmentation',
+     'Category': 'Dermatology', 'SubCategory': 'Aesthetic', 'BasePrice': 5000, 'Cost': 1500, 'Duration': 90},
+
+    # Dental
+    {'ServiceID': 6, 'ServiceCode': 'Z01.2', 'ServiceName': 'ตรวจฟัน',
+     'ICD10Description': 'Dental examination',
+     'Category': 'Dental', 'SubCategory': 'Consultation', 'BasePrice': 300, 'Cost': 100, 'Duration': 30},
+    {'ServiceID': 7, 'ServiceCode': 'K02.9', 'ServiceName': 'อุดฟัน',
+     'ICD10Description': 'Dental caries',
+     'Category': 'Dental', 'SubCategory': 'Treatment', 'BasePrice': 1500, 'Cost': 500, 'Duration': 60},
+    {'ServiceID': 8, 'ServiceCode': 'K03.6', 'ServiceName': 'ขูดหินปูน',
+     'ICD10Description': 'Deposits on teeth',
+     'Category': 'Dental', 'SubCategory': 'Treatment', 'BasePrice': 1200, 'Cost': 400, 'Duration': 45},
+    {'ServiceID': 9, 'ServiceCode': 'K03.7', 'ServiceName': 'ฟอกสีฟัน',
+     'ICD10Description': 'Posteruptive color changes of dental hard tissues',
+     'Category': 'Dental', 'SubCategory': 'Aesthetic', 'BasePrice': 8000, 'Cost': 2500, 'Duration': 120},
+
+    # Orthopedics
+    {'ServiceID': 10, 'ServiceCode': 'M25.9', 'ServiceName': 'ตรวจกระดูกและข้อ',
+     'ICD10Description': 'Joint disorder, unspecified',
+     'Category': 'Orthopedics', 'SubCategory': 'Consultation', 'BasePrice': 1200, 'Cost': 350, 'Duration': 30},
+    {'ServiceID': 11, 'ServiceCode': 'M79.3', 'ServiceName': 'กายภาพบำบัด',
+     'ICD10Description': 'Panniculitis, unspecified (for physiotherapy)',
+     'Category': 'Orthopedics', 'SubCategory': 'Treatment', 'BasePrice': 1800, 'Cost': 600, 'Duration': 60},
+
+    # Lab Tests
+    {'ServiceID': 12, 'ServiceCode': 'Z00.00', 'ServiceName': 'เจาะเลือดตรวจสุขภาพ',
+     'ICD10Description': 'General medical examination without complaint',
+     'Category': 'Laboratory', 'SubCategory': 'Blood Test', 'BasePrice': 1500, 'Cost': 400, 'Duration': 15},
+    {'ServiceID': 13, 'ServiceCode': 'R82.90', 'ServiceName': 'ตรวจปัสสาวะ',
+     'ICD10Description': 'Unspecified abnormal findings in urine',
+     'Category': 'Laboratory', 'SubCategory': 'Urine Test', 'BasePrice': 300, 'Cost': 80, 'Duration': 10},
+    {'ServiceID': 14, 'ServiceCode': 'Z01.6', 'ServiceName': 'X-Ray',
+     'ICD10Description': 'Radiological examination',
+     'Category': 'Laboratory', 'SubCategory': 'Imaging', 'BasePrice': 800, 'Cost': 250, 'Duration': 20},
+
+    # Vaccination
+    {'ServiceID': 15, 'ServiceCode': 'Z25.1', 'ServiceName': 'วัคซีนไข้หวัดใหญ่',
+     'ICD10Description': 'Need for immunization against influenza',
+     'Category': 'Vaccination', 'SubCategory': 'Flu', 'BasePrice': 600, 'Cost': 350, 'Duration': 15},
+    {'ServiceID': 16, 'ServiceCode': 'Z28.3', 'ServiceName': 'วัคซีนโควิด-19',
+     'ICD10Description': 'Underimmunization status (COVID-19)',
+     'Category': 'Vaccination', 'SubCategory': 'COVID-19', 'BasePrice': 0, 'Cost': 0, 'Duration': 15},
+
+    # Health Checkup Packages
+    {'ServiceID': 17, 'ServiceCode': 'Z00.01', 'ServiceName': 'แพ็คเกจตรวจสุขภาพพื้นฐาน',
+     'ICD10Description': 'General medical examination with abnormal findings',
+     'Category': 'Health Package', 'SubCategory': 'Basic', 'BasePrice': 3500, 'Cost': 1200, 'Duration': 90},
+    {'ServiceID': 18, 'ServiceCode': 'Z13.9', 'ServiceName': 'แพ็คเกจตรวจสุขภาพแบบครอบคลุม',
+     'ICD10Description': 'Special screening examination, unspecified',
+     'Category': 'Health Package', 'SubCategory': 'Comprehensive', 'BasePrice': 8500, 'Cost': 3000, 'Duration': 180},
+]
+
+DOCTORS = [
+    {'DoctorID': 1, 'DoctorCode': 'DR001', 'DoctorName': 'นพ.สมชาย ใจดี', 'Specialty': 'General Medicine',
+     'LicenseNumber': 'MD12345', 'YearsOfExperience': 15, 'EducationLevel': 'MD', 'HourlyRate': 1500,
+     'Status': 'Active', 'HireDate': '2020-01-15'},
+    {'DoctorID': 2, 'DoctorCode': 'DR002', 'DoctorName': 'นพ.วิชัย รักษา', 'Specialty': 'Dermatology',
+     'LicenseNumber': 'MD12346', 'YearsOfExperience': 12, 'EducationLevel': 'MD, Board Certified', 'HourlyRate': 2000,
+     'Status': 'Active', 'HireDate': '2020-02-01'},
+    {'DoctorID': 3, 'DoctorCode': 'DR003', 'DoctorName': 'ทพญ.สุดา สวยงาม', 'Specialty': 'Dermatology',
+     'LicenseNumber': 'MD12347', 'YearsOfExperience': 10, 'EducationLevel': 'MD, Board Certified', 'HourlyRate': 2000,
+     'Status': 'Active', 'HireDate': '2020-03-15'},
+    {'DoctorID': 4, 'DoctorCode': 'DR004', 'DoctorName': 'ทพ.ชัยวัฒน์ ยิ้มแย้ม', 'Specialty': 'Dental',
+     'LicenseNumber': 'DT12348', 'YearsOfExperience': 8, 'EducationLevel': 'DDS', 'HourlyRate': 1800,
+     'Status': 'Active', 'HireDate': '2020-06-01'},
+    {'DoctorID': 5, 'DoctorCode': 'DR005', 'DoctorName': 'ทพญ.มาลี รอยยิ้ม', 'Specialty': 'Dental',
+     'LicenseNumber': 'DT12349', 'YearsOfExperience': 6, 'EducationLevel': 'DDS', 'HourlyRate': 1600,
+     'Status': 'Active', 'HireDate': '2021-01-15'},
+    {'DoctorID': 6, 'DoctorCode': 'DR006', 'DoctorName': 'นพ.ประเสริฐ แข็งแรง', 'Specialty': 'Orthopedics',
+     'LicenseNumber': 'MD12350', 'YearsOfExperience': 14, 'EducationLevel': 'MD, Board Certified', 'HourlyRate': 2200,
+     'Status': 'Active', 'HireDate': '2021-03-01'},
+    {'DoctorID': 7, 'DoctorCode': 'DR007', 'DoctorName': 'นพ.อนุชา เจริญ', 'Specialty': 'General Medicine',
+     'LicenseNumber': 'MD12351', 'YearsOfExperience': 9, 'EducationLevel': 'MD', 'HourlyRate': 1400,
+     'Status': 'Active', 'HireDate': '2021-08-01'},
+    {'DoctorID': 8, 'DoctorCode': 'DR008', 'DoctorName': 'ทพญ.ศิริพร สุขสม', 'Specialty': 'General Medicine',
+     'LicenseNumber': 'MD12352', 'YearsOfExperience': 7, 'EducationLevel': 'MD', 'HourlyRate': 1300,
+     'Status': 'Active', 'HireDate': '2022-01-15'},
+    {'DoctorID': 9, 'DoctorCode': 'DR009', 'DoctorName': 'ทพ.สมศักดิ์ สุดหล่อ', 'Specialty': 'Dental',
+     'LicenseNumber': 'DT12353', 'YearsOfExperience': 5, 'EducationLevel': 'DDS', 'HourlyRate': 1500,
+     'Status': 'Active', 'HireDate': '2022-09-01'},
+    {'DoctorID': 10, 'DoctorCode': 'DR010', 'DoctorName': 'นพ.ธนา มั่งมี', 'Specialty': 'Dermatology',
+     'LicenseNumber': 'MD12354', 'YearsOfExperience': 11, 'EducationLevel': 'MD, Board Certified', 'HourlyRate': 2100,
+     'Status': 'Active', 'HireDate': '2023-02-01'},
+]
+
+PAYMENT_METHODS = [
+    {'PaymentMethodID': 1, 'PaymentMethodCode': 'CASH', 'PaymentMethodName': 'เงินสด',
+     'Category': 'Cash', 'IsActive': 1, 'ProcessingFee': 0},
+    {'PaymentMethodID': 2, 'PaymentMethodCode': 'CC-VISA', 'PaymentMethodName': 'บัตรเครดิต Visa',
+     'Category': 'Credit Card', 'IsActive': 1, 'ProcessingFee': 2.5},
+    {'PaymentMethodID': 3, 'PaymentMethodCode': 'CC-MC', 'PaymentMethodName': 'บัตรเครดิต MasterCard',
+     'Category': 'Credit Card', 'IsActive': 1, 'ProcessingFee': 2.5},
+    {'PaymentMethodID': 4, 'PaymentMethodCode': 'DEBIT', 'PaymentMethodName': 'บัตรเดบิต',
+     'Category': 'Debit Card', 'IsActive': 1, 'ProcessingFee': 1.5},
+    {'PaymentMethodID': 5, 'PaymentMethodCode': 'BANK-TRF', 'PaymentMethodName': 'โอนเงินผ่านธนาคาร',
+     'Category': 'Bank Transfer', 'IsActive': 1, 'ProcessingFee': 0},
+    {'PaymentMethodID': 6, 'PaymentMethodCode': 'PROMPTPAY', 'PaymentMethodName': 'พร้อมเพย์',
+     'Category': 'E-Wallet', 'IsActive': 1, 'ProcessingFee': 0},
+    {'PaymentMethodID': 7, 'PaymentMethodCode': 'TRUEMONEY', 'PaymentMethodName': 'ทรูมันนี่วอลเล็ท',
+     'Category': 'E-Wallet', 'IsActive': 1, 'ProcessingFee': 1.0},
+    {'PaymentMethodID': 8, 'PaymentMethodCode': 'INSTALLMENT', 'PaymentMethodName': 'ผ่อนชำระ 0%',
+     'Category': 'Installment', 'IsActive': 1, 'ProcessingFee': 3.5},
+]
+
+INSURANCES = [
+    {'InsuranceID': 1, 'InsuranceCode': 'SELF', 'InsuranceName': 'ไม่มีประกัน (จ่ายเอง)',
+     'CompanyName': 'Self Pay', 'CoveragePercent': 0, 'IsActive': 1},
+    {'InsuranceID': 2, 'InsuranceCode': 'SSO', 'InsuranceName': 'ประกันสังคม',
+     'CompanyName': 'Social Security Office', 'CoveragePercent': 100, 'IsActive': 1},
+    {'InsuranceID': 3, 'InsuranceCode': 'AIA-001', 'InsuranceName': 'AIA Health Plus',
+     'CompanyName': 'AIA Thailand', 'CoveragePercent': 80, 'IsActive': 1},
+    {'InsuranceID': 4, 'InsuranceCode': 'ALLIANZ-001', 'InsuranceName': 'Allianz SmartHealth',
+     'CompanyName': 'Allianz Ayudhya', 'CoveragePercent': 90, 'IsActive': 1},
+    {'InsuranceID': 5, 'InsuranceCode': 'BUPA-001', 'InsuranceName': 'Bupa Premium',
+     'CompanyName': 'Bupa Thailand', 'CoveragePercent': 100, 'IsActive': 1},
+    {'InsuranceID': 6, 'InsuranceCode': 'DHIPAYA-001', 'InsuranceName': 'ธนชาต ประกันสุขภาพ',
+     'CompanyName': 'Dhipaya Insurance', 'CoveragePercent': 70, 'IsActive': 1},
+]
+
+
+MONTH_NAMES_THAI = np.array(['มกราคม', 'กุมภาพันธ์', 'มีนาคม', 'เมษายน', 'พฤษภาคม', 'มิถุนายน',
+                             'กรกฎาคม', 'สิงหาคม', 'กันยายน', 'ตุลาคม', 'พฤศจิกายน', 'ธันวาคม'])
+QUARTERS = np.array(['Q1', 'Q2', 'Q3', 'Q4'])
+
+# Thailand's fiscal year runs October-September and is named after the year it ends in
+FISCAL_YEAR_START_MONTH = 10
+
+# Fixed-date Thai public holidays as MMDD. Lunar holidays (Makha/Visakha/Asarnha Bucha,
+# Khao Phansa) and substitution days move every year and are not included.
+THAI_PUBLIC_HOLIDAYS = {
+    101: "New Year's Day",
+    406: 'Chakri Memorial Day',
+    413: 'Songkran Festival',
+    414: 'Songkran Festival',
+    415: 'Songkran Festival',
+    501: 'National Labour Day',
+    504: 'Coronation Day',
+    603: "Queen Suthida's Birthday",
+    728: "King Vajiralongkorn's Birthday",
+    812: "Queen Mother's Birthday / Mother's Day",
+    1013: 'King Bhumibol Memorial Day',
+    1023: 'Chulalongkorn Day',
+    1205: "King Bhumibol's Birthday / Father's Day",
+    1210: 'Constitution Day',
+    1231: "New Year's Eve",
+}
+
+
+def generate_dim_date(start_date, end_date, as_of_date=None):
+    """DimDate from vectorized ``DatetimeIndex`` accessors.
+
+    Besides the calendar attributes it carries the flags and offsets that
+    reports would otherwise compute in DAX per query. DayOffset,
+    MonthOffset and YearOffset are relative to ``as_of_date`` (default
+    ``end_date``), and PrevMonthDateKey/PrevYearDateKey follow DATEADD
+    (month ends are clamped, e.g. 31 Mar -> 28/29 Feb).
+    """
+    dates = pd.date_range(start=start_date, end=end_date, freq='D')
+    as_of = pd.Timestamp(end_date if as_of_date is None else as_of_date)
+    year, month, day = dates.year.to_numpy(), dates.month.to_numpy(), dates.day.to_numpy()
+    day_of_week = dates.dayofweek.to_numpy() + 1
+    month_day = month * 100 + day
+    is_weekend = (day_of_week >= 6).astype(int)
+    is_holiday = np.isin(month_day, list(THAI_PUBLIC_HOLIDAYS)).astype(int)
+
+    def date_keys(index):
+        return (index.year * 10000 + index.month * 100 + index.day).to_numpy()
+
+    return pd.DataFrame({
+        'DateKey': year * 10000 + month_day,
+        'Date': dates,
+        'Year': year,
+        'Quarter': QUARTERS[dates.quarter.to_numpy() - 1],
+        'Month': month,
+        'MonthName': dates.month_name(),
+        'MonthNameThai': MONTH_NAMES_THAI[month - 1],
+        'Day': day,
+        'DayOfWeek': day_of_week,
+        'DayName': dates.day_name(),
+        'WeekOfYear': dates.isocalendar().week.to_numpy(dtype=int),
+        'IsWeekend': is_weekend,
+        'FiscalYear': year + (month >= FISCAL_YEAR_START_MONTH),
+        'YearMonth': year * 100 + month,
+        'DayOfYear': dates.dayofyear.to_numpy(),
+        'DaysInMonth': dates.days_in_month.to_numpy(),
+        'IsMonthStart': dates.is_month_start.astype(int),
+        'IsMonthEnd': dates.is_month_end.astype(int),
+        'IsThaiHoliday': is_holiday,
+        'ThaiHolidayName': pd.Series(month_day).map(THAI_PUBLIC_HOLIDAYS).to_numpy(),
+        'IsWorkingDay': ((is_weekend == 0) & (is_holiday == 0)).astype(int),
+        'DayOffset': (dates - as_of.normalize()).days.to_numpy(),
+        'MonthOffset': (year - as_of.year) * 12 + (month - as_of.month),
+        'YearOffset': year - as_of.year,
+        'PrevMonthDateKey': date_keys(dates - pd.DateOffset(months=1)),
+        'PrevYearDateKey': date_keys(dates - pd.DateOffset(years=1)),
+    })
+
+
+# First hour of each part of the day; hours before the first belong to the last
+DAY_PARTS = [(6, 'Morning'), (12, 'Afternoon'), (17, 'Evening'), (22, 'Night')]
+OPENING_HOURS = (8, 18)  # first hour open, first hour closed
+
+
+def format_times(minutes):
+    """'HH:MM' strings for minutes since midnight."""
+    h, m = np.divmod(minutes, 60)
+    return np.char.add(np.char.add(np.char.zfill(h.astype(str), 2), ':'), np.char.zfill(m.astype(str), 2))
+
+
+def generate_dim_time():
+    """DimTime at minute grain: TimeKey is the minute since midnight, 0-1439.
+
+    The fact tables store their times as these keys, so time-of-day
+    analysis is an integer join and a duration is a subtraction.
+    """
+    time_key = np.arange(24 * 60)
+    hour, minute = np.divmod(time_key, 60)
+    starts = [start for start, _ in DAY_PARTS]
+    names = np.array([name for _, name in DAY_PARTS])
+    return pd.DataFrame({
+        'TimeKey': time_key,
+        'Time': format_times(time_key),
+        'Hour': hour,
+        'Minute': minute,
+        'HourLabel': format_times(hour * 60),
+        'HalfHourSlot': format_times(time_key - minute % 30),
+        'DayPart': names[np.searchsorted(starts, hour, side='right') - 1],
+        'IsOpeningHours': ((hour >= OPENING_HOURS[0]) & (hour < OPENING_HOURS[1])).astype(int),
+    })
+
+
+def _replicate(templates, count):
+    """Yield ``(copy_number, template)`` cycling through ``templates`` until ``count`` rows exist."""
+    for i in range(count):
+        yield i // len(templates) + 1, templates[i % len(templates)]
+
+
+def generate_dim_branch(num_branches=len(BRANCHES)):
+    """The 8 real branches, cloned with numbered codes when a larger scale needs more."""
+    rows = []
+    for branch_id, (copy, template) in enumerate(_replicate(BRANCHES, num_branches), start=1):
+        row = dict(template, BranchID=branch_id)
+        if copy > 1:
+            row['BranchCode'] = f"{template['BranchCode']}-{copy}"
+            row['BranchName'] = f"{template['BranchName']} {copy}"
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def generate_dim_service():
+    return pd.DataFrame(SERVICES)
+
+
+def generate_dim_doctor(num_doctors=len(DOCTORS)):
+    """The 10 named doctors, cloned with new codes and license numbers when more are needed."""
+    rows = []
+    for doctor_id, (copy, template) in enumerate(_replicate(DOCTORS, num_doctors), start=1):
+        row = dict(template, DoctorID=doctor_id)
+        if copy > 1:
+            row['DoctorCode'] = f'DR{doctor_id:03d}'
+            row['DoctorName'] = f"{template['DoctorName']} {copy}"
+            row['LicenseNumber'] = f"{template['LicenseNumber'][:2]}{12344 + doctor_id}"
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+# Staff per position for each branch size, in EmployeeID order within a branch
+STAFF_BY_SIZE = {
+    'Large': {'Nurse': 6, 'Receptionist': 3, 'Admin': 2, 'Cleaning': 2},
+    'Medium': {'Nurse': 4, 'Receptionist': 2, 'Admin': 1, 'Cleaning': 1},
+    'Small': {'Nurse': 2, 'Receptionist': 1, 'Admin': 1, 'Cleaning': 1},
+}
+POSITIONS = ['Nurse', 'Receptionist', 'Admin', 'Cleaning']
+SALARY_RANGES = {'Nurse': (25000, 35000), 'Receptionist': (18000, 25000), 'Admin': (22000, 30000),
+                 'Cleaning': (12000, 15000)}
+HIRE_START = np.datetime64('2020-01-01')
+REGISTRATION_START = np.datetime64('2020-01-01')
+
+
+def format_codes(prefix, numbers, width):
+    """Vectorized ``f'{prefix}{number:0{width}d}'`` (numbers wider than ``width`` keep every digit).
+
+    With pyarrow the digits are written column by column into one byte
+    matrix, and the zero padding beyond each number's own width is dropped
+    to form an Arrow string array that pandas keeps as is; 10M codes take
+    about a second.
+    """
+    numbers = np.asarray(numbers, dtype=np.int64)
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return np.char.add(prefix, np.char.zfill(numbers.astype(str), width))
+    digits = np.maximum(width, np.searchsorted(10 ** np.arange(1, 19), numbers, side='right') + 1)
+    max_width = int(digits.max()) if len(numbers) else width
+    head = np.frombuffer(prefix.encode('utf-8'), dtype=np.uint8)
+    columns = np.empty((len(head) + max_width, len(numbers)), dtype=np.uint8)
+    columns[:len(head)] = head[:, None]
+    values = numbers.astype(np.uint32) if len(numbers) and numbers.max() <= np.iinfo(np.uint32).max else numbers
+    for row in range(len(columns) - 1, len(head) - 1, -1):
+        values, columns[row] = np.divmod(values, 10)
+    columns[len(head):] += ord('0')
+    keep = np.arange(len(columns))[:, None] >= len(head) + max_width - digits
+    keep[:len(head)] = True
+    offsets = np.zeros(len(numbers) + 1, dtype=np.int64)
+    np.cumsum(len(head) + digits, out=offsets[1:])
+    strings = pa.LargeStringArray.from_buffers(len(numbers), pa.py_buffer(offsets), pa.py_buffer(columns.T[keep.T]))
+    return pd.array(strings, dtype='str')
+
+
+def _categorical_choice(rng, values, n, p):
+    """``rng.choice(values, n, p=p)`` (same draws) as a Categorical, which skips building n strings."""
+    return pd.Categorical.from_codes(rng.choice(len(values), n, p=p), values)
+
+
+def generate_dim_employee(dim_branch, rng):
+    """Staff of every branch according to its Size, built with whole-column draws."""
+    staff = np.array([[STAFF_BY_SIZE[size][position] for position in POSITIONS] for size in dim_branch['Size']],
+                     dtype=np.int64).reshape(-1, len(POSITIONS))
+    counts = staff.ravel()
+    n = int(counts.sum())
+    branch_id = np.repeat(dim_branch['BranchID'].to_numpy(), staff.sum(axis=1))
+    position_index = np.repeat(np.tile(np.arange(len(POSITIONS)), len(staff)), counts)
+    position = np.asarray(POSITIONS)[position_index]
+    # Number of the employee within its branch and position, from 1
+    number = np.arange(n) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+    low = np.array([SALARY_RANGES[p][0] for p in POSITIONS])[position_index]
+    high = np.array([SALARY_RANGES[p][1] for p in POSITIONS])[position_index]
+    employee_id = np.arange(1, n + 1)
+
+    return pd.DataFrame({
+        'EmployeeID': employee_id,
+        'EmployeeCode': format_codes('EMP', employee_id, 4),
+        'EmployeeName': np.char.add(np.char.add(np.char.add(position, ' '), number.astype(str)),
+                                    np.char.add(' สาขา ', branch_id.astype(str))),
+        'Position': position,
+        'Department': np.where(np.isin(position, ['Nurse', 'Receptionist']), 'Operations', 'Support'),
+        'BranchID': branch_id,
+        'MonthlySalary': rng.integers(low, high + 1),
+        'HireDate': (HIRE_START + rng.integers(0, 1201, n)).astype('datetime64[s]'),
+        'Status': 'Active',
+    })
+
+
+def generate_dim_payment_method():
+    return pd.DataFrame(PAYMENT_METHODS)
+
+
+def generate_dim_insurance():
+    return pd.DataFrame(INSURANCES)
+
+
+def generate_dim_patient(num_patients, rng):
+    """Patients drawn column by column; RegistrationDate is datetime64, not formatted text."""
+    patient_id = np.arange(1, num_patients + 1)
+    return pd.DataFrame({
+        'PatientID': patient_id,
+        'PatientCode': format_codes('PT', patient_id, 6),
+        'Gender': _categorical_choice(rng, ['M', 'F'], num_patients, [0.45, 0.55]),
+        'AgeGroup': _categorical_choice(rng, ['0-17', '18-30', '31-45', '46-60', '60+'], num_patients,
+                                        [0.05, 0.25, 0.35, 0.25, 0.10]),
+        'Province': _categorical_choice(rng, ['กรุงเทพมหานคร', 'เชียงใหม่', 'ภูเก็ต', 'สงขลา', 'ขอนแก่น', 'ชลบุรี', 'อื่นๆ'],
+                                        num_patients, [0.40, 0.10, 0.08, 0.08, 0.10, 0.12, 0.12]),
+        'MembershipLevel': _categorical_choice(rng, ['None', 'Silver', 'Gold', 'Platinum'], num_patients,
+                                               [0.60, 0.20, 0.15, 0.05]),
+        'RegistrationDate': (REGISTRATION_START + rng.integers(0, 1801, num_patients)).astype('datetime64[s]'),
+        'IsActive': np.ones(num_patients, dtype=np.int64),
+    })
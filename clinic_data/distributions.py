@@ -0,0 +1,217 @@
+"""How the fact tables draw their dates, patients, branches and doctors.
+
+``uniform`` keeps the original draws: every day, patient and doctor equally
+likely and the fixed 8-branch traffic mix. ``skewed`` reproduces the
+hotspots of production data that uniform data hides from VertiPaq and
+partition benchmarks:
+
+- patients follow a Zipf law, so a few regulars account for many visits;
+- days are weighted by ``DimDate.IsWeekend`` and by calendar month
+  (rainy-season peak, Songkran and year-end dips);
+- branch traffic is proportional to ``DimBranch.NumRooms``;
+- doctors are drawn from the specialty that performs the service's
+  ``DimService.Category``.
+
+The weights come from the dimension tables the fact builders are given
+(``dims``), not from a private copy. Every sampler turns weights into a
+cumulative distribution once (cached with the DataFrames it was derived
+from, see ``derived``) and maps a block of uniform draws through
+``np.searchsorted``.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from clinic_data.rng import table_rng
+
+BRANCH_WEIGHTS = [0.20, 0.18, 0.15, 0.12, 0.11, 0.09, 0.08, 0.07]
+
+# Lookups derived from dimension tables, most recently used last
+DERIVED_CACHE_SIZE = 16
+_derived = OrderedDict()
+
+# Services whose category has no doctors of its own are performed by General Medicine
+SPECIALTY_BY_CATEGORY = {'Laboratory': 'General Medicine', 'Vaccination': 'General Medicine',
+                         'Health Package': 'General Medicine'}
+
+
+@dataclass(frozen=True)
+class Distribution:
+    patient_zipf: float = 0.0  # Zipf exponent of rows per patient; 0 draws patients uniformly
+    weekend_weight: float = 1.0  # traffic on DimDate.IsWeekend days relative to weekdays
+    month_weights: tuple = (1.0,) * 12  # relative traffic of January .. December
+    rooms_weighted: bool = False  # branch traffic proportional to DimBranch.NumRooms
+    specialty_matched: bool = False  # doctor drawn from the specialty of the service
+
+
+DISTRIBUTIONS = {
+    'uniform': Distribution(),
+    'skewed': Distribution(
+        patient_zipf=0.7,
+        weekend_weight=0.7,
+        month_weights=(1.00, 0.95, 1.00, 0.85, 0.95, 1.05, 1.15, 1.20, 1.20, 1.10, 1.00, 0.90),
+        rooms_weighted=True,
+        specialty_matched=True,
+    ),
+}
+
+
+def resolve_distribution(distribution):
+    """A ``Distribution`` from a preset name or a ``Distribution``."""
+    if isinstance(distribution, Distribution):
+        return distribution
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"unknown distribution {distribution!r}; choose from {', '.join(DISTRIBUTIONS)}")
+    return DISTRIBUTIONS[distribution]
+
+
+def derived(build, frames, *args):
+    """``build(*frames, *args)``, computed once while the same DataFrames (by identity) and ``args`` are passed.
+
+    DataFrames cannot be ``lru_cache`` keys. An entry holds on to its
+    frames, so their ids cannot be reused by other frames while it is cached.
+    """
+    key = (build, *map(id, frames), *args)
+    if key in _derived:
+        _derived.move_to_end(key)
+    else:
+        _derived[key] = frames, build(*frames, *args)
+        if len(_derived) > DERIVED_CACHE_SIZE:
+            _derived.popitem(last=False)
+    return _derived[key][1]
+
+
+def branch_weights(num_branches):
+    """Tile the 8-branch traffic mix over however many branches the scale produced."""
+    weights = np.resize(BRANCH_WEIGHTS, num_branches)
+    return weights / weights.sum()
+
+
+def _cdf(weights):
+    cdf = np.cumsum(weights, dtype=np.float64)
+    return cdf / cdf[-1]
+
+
+def _sample(rng, cdf, n):
+    """Indexes into the weights behind ``cdf``, one per uniform draw."""
+    return np.minimum(np.searchsorted(cdf, rng.random(n), side='right'), len(cdf) - 1)
+
+
+def _day_cdf(dim_date, start_date, day_span, weekend_weight, month_weights):
+    """CDF over the day offsets 0..``day_span`` from ``start_date``, weighted by the DimDate row of each day."""
+    offset = (dim_date['Date'].to_numpy().astype('datetime64[D]') - np.datetime64(start_date, 'D')).astype(np.int64)
+    in_span = (offset >= 0) & (offset <= day_span)
+    if in_span.sum() != day_span + 1:
+        raise ValueError(f'DimDate does not cover the {day_span + 1} fact days from {start_date:%Y-%m-%d}')
+    month_weight = np.asarray(month_weights)[dim_date['Month'].to_numpy()[in_span] - 1]
+    weights = np.zeros(day_span + 1)
+    weights[offset[in_span]] = np.where(dim_date['IsWeekend'].to_numpy()[in_span] == 1,
+                                        month_weight * weekend_weight, month_weight)
+    return _cdf(weights)
+
+
+def _fact_day_cdf(config, dims, distribution):
+    return derived(_day_cdf, (dims['DimDate'],), config.fact_start_date, config.fact_day_span,
+                   distribution.weekend_weight, distribution.month_weights)
+
+
+def _uniform_days(distribution):
+    return distribution.weekend_weight == 1 and set(distribution.month_weights) == {1}
+
+
+def draw_days(rng, config, dims, n):
+    """Day offsets from ``config.fact_start_date``."""
+    distribution = resolve_distribution(config.distribution)
+    if _uniform_days(distribution):
+        return rng.integers(0, config.fact_day_span + 1, n)
+    return _sample(rng, _fact_day_cdf(config, dims, distribution), n)
+
+
+def count_days(rng, config, dims, n):
+    """How many of ``n`` rows fall on each day offset, with the same day weights as ``draw_days``."""
+    distribution = resolve_distribution(config.distribution)
+    if _uniform_days(distribution):
+        weights = np.full(config.fact_day_span + 1, 1 / (config.fact_day_span + 1))
+    else:
+        weights = np.diff(_fact_day_cdf(config, dims, distribution), prepend=0)
+    return rng.multinomial(n, weights)
+
+
+@lru_cache(maxsize=8)
+def _patient_ranks(seed, num_patients, exponent):
+    """Zipf CDF over popularity ranks, and the PatientID holding each rank."""
+    cdf = _cdf(np.arange(1, num_patients + 1, dtype=np.float64) ** -exponent)
+    # Regulars are spread over the id range rather than being the oldest registrations
+    return cdf, table_rng(seed, 'DimPatient.Popularity').permutation(num_patients) + 1
+
+
+def draw_patients(rng, config, n):
+    distribution = resolve_distribution(config.distribution)
+    if distribution.patient_zipf == 0:
+        return rng.integers(1, config.num_patients + 1, n)
+    cdf, patient_ids = _patient_ranks(config.seed, config.num_patients, distribution.patient_zipf)
+    return patient_ids[_sample(rng, cdf, n)]
+
+
+def _rooms_weights(dim_branch, num_branches):
+    rooms = np.zeros(num_branches + 1)
+    rooms[dim_branch['BranchID'].to_numpy()] = dim_branch['NumRooms'].to_numpy(dtype=np.float64)
+    return rooms[1:] / rooms.sum()
+
+
+def draw_branches(rng, config, dims, n):
+    distribution = resolve_distribution(config.distribution)
+    weights = derived(_rooms_weights, (dims['DimBranch'],), config.num_branches) if distribution.rooms_weighted \
+        else branch_weights(config.num_branches)
+    return rng.choice(range(1, config.num_branches + 1), n, p=weights)
+
+
+def _doctors_by_service(dim_doctor, dim_service):
+    """DoctorIDs sorted by specialty, per ServiceID the start and count of its specialty's run, and per
+    DoctorID its position in the sorted ids."""
+    specialties = dim_doctor['Specialty'].to_numpy(dtype=object).astype(str)
+    order = np.lexsort((dim_doctor['DoctorID'].to_numpy(), specialties))
+    specialties = specialties[order]
+    service_ids = dim_service['ServiceID'].to_numpy()
+    start = np.zeros(service_ids.max() + 1, dtype=np.int64)
+    count = np.full(service_ids.max() + 1, len(specialties), dtype=np.int64)
+    for service_id, category in zip(service_ids, dim_service['Category']):
+        specialty = SPECIALTY_BY_CATEGORY.get(category, category)
+        first = np.searchsorted(specialties, specialty, side='left')
+        last = np.searchsorted(specialties, specialty, side='right')
+        if last > first:  # otherwise any doctor
+            start[service_id], count[service_id] = first, last - first
+    doctor_ids = dim_doctor['DoctorID'].to_numpy()[order]
+    position = np.zeros(doctor_ids.max() + 1, dtype=np.int64)
+    position[doctor_ids] = np.arange(len(doctor_ids))
+    return doctor_ids, start, count, position
+
+
+def _specialty_pools(dims):
+    return derived(_doctors_by_service, (dims['DimDoctor'], dims['DimService']))
+
+
+def draw_doctors(rng, config, dims, n, service_id):
+    distribution = resolve_distribution(config.distribution)
+    if not distribution.specialty_matched:
+        return rng.integers(1, config.num_doctors + 1, n)
+    doctor_ids, start, count, _ = _specialty_pools(dims)
+    return doctor_ids[start[service_id] + (rng.random(n) * count[service_id]).astype(np.int64)]
+
+
+def doctor_pool_sizes(config, dims, service_id):
+    """How many doctors ``draw_doctors`` chooses from for each service."""
+    if not resolve_distribution(config.distribution).specialty_matched:
+        return np.full(len(service_id), config.num_doctors)
+    return _specialty_pools(dims)[2][service_id]
+
+
+def next_doctors(config, dims, service_id, doctor_id, step):
+    """The doctor ``step`` places after ``doctor_id`` among those ``draw_doctors`` chooses from, wrapping around."""
+    if not resolve_distribution(config.distribution).specialty_matched:
+        return (doctor_id - 1 + step) % config.num_doctors + 1
+    doctor_ids, start, count, position = _specialty_pools(dims)
+    rank = position[doctor_id] - start[service_id]
+    return doctor_ids[start[service_id] + (rank + step) % count[service_id]]
@@ -0,0 +1,482 @@
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from clinic_data.distributions import count_days, draw_branches, draw_days, draw_doctors, draw_patients
+from clinic_data.history import HISTORIES, as_of
+from clinic_data.rng import RNG_BLOCK_ROWS, block_rng, table_rng
+from clinic_data.schedule import OPENING_MINUTE, SLOT_MINUTES, SLOTS_PER_DAY, schedule_appointments
+
+INSURANCE_WEIGHTS = [0.45, 0.15, 0.15, 0.10, 0.08, 0.07]
+PAYMENT_METHOD_WEIGHTS = [0.15, 0.25, 0.20, 0.10, 0.08, 0.12, 0.05, 0.05]
+DISCOUNT_CHOICES = [0, 0, 0, 5, 10, 15, 20]
+PAYMENT_STATUSES = ['Paid', 'Pending', 'Cancelled']
+PAYMENT_STATUS_WEIGHTS = [0.92, 0.05, 0.03]
+APPOINTMENT_STATUSES = ['Scheduled', 'Completed', 'Cancelled', 'No-Show']
+APPOINTMENT_STATUS_WEIGHTS = [0.15, 0.70, 0.10, 0.05]
+SATISFACTION_WEIGHTS = [0.02, 0.05, 0.13, 0.35, 0.45]
+
+# The fact tables form a causal chain: Completed appointments become visits
+# and visits become billing lines. Each share is a fixed number of random
+# rows per RNG block, so a child row finds its parent by index arithmetic
+# instead of a search over the parent table; the shares match the
+# 15:12:18 appointment:visit:billing row ratio of scale factor 1.
+COMPLETED_SHARE = APPOINTMENT_STATUS_WEIGHTS[APPOINTMENT_STATUSES.index('Completed')]
+COMPLETED_PER_BLOCK = round(COMPLETED_SHARE * RNG_BLOCK_ROWS)
+BOOKED_VISITS_PER_BLOCK = round(0.875 * RNG_BLOCK_ROWS)  # the other visits are walk-ins
+VISIT_LINES_PER_BLOCK = round(2 / 3 * RNG_BLOCK_ROWS)  # the other billing lines have no visit
+UNBILLED_VISITS_PER_BLOCK = round(0.12 * RNG_BLOCK_ROWS)  # as many other visits get an extra line
+OTHER_STATUSES = [status for status in APPOINTMENT_STATUSES if status != 'Completed']
+OTHER_STATUS_WEIGHTS = [weight / (1 - COMPLETED_SHARE)
+                        for status, weight in zip(APPOINTMENT_STATUSES, APPOINTMENT_STATUS_WEIGHTS)
+                        if status != 'Completed']
+
+# Parent blocks rebuilt for the child rows that reference them, most recently used last
+PARENT_BLOCK_CACHE_SIZE = 4
+_parent_blocks = OrderedDict()
+
+
+def _lookup(dim, key, column):
+    """Dense array indexed by the dimension key, so ``arr[ids]`` replaces a per-row filter."""
+    keys = dim[key].to_numpy()
+    values = dim[column].to_numpy()
+    table = np.zeros(keys.max() + 1, dtype=values.dtype)
+    table[keys] = values
+    return table
+
+
+@lru_cache(maxsize=8)
+def _calendar(start_date, num_days):
+    """DateKey and 'YYYY-MM-DD' lookups indexed by day offset from ``start_date``."""
+    dates = pd.date_range(start=start_date, periods=num_days, freq='D')
+    date_keys = (dates.year * 10000 + dates.month * 100 + dates.day).to_numpy()
+    return date_keys, np.asarray(dates.strftime('%Y-%m-%d'))
+
+
+def _write_digits(buf, col, values, width):
+    values = values.copy()
+    for j in range(width - 1, -1, -1):
+        buf[:, col + j] = 48 + values % 10
+        values //= 10
+
+
+def format_billing_numbers(date_keys, billing_ids):
+    """Vectorized ``f'INV{date_key}-{billing_id:06d}'``.
+
+    Digits are written straight into a byte matrix which is then viewed as
+    fixed-width strings, avoiding one Python f-string per row.
+    """
+    date_keys = np.asarray(date_keys, dtype=np.int64)
+    billing_ids = np.asarray(billing_ids, dtype=np.int64)
+    if len(billing_ids) == 0:
+        return np.array([], dtype=object)
+
+    max_width = max(6, len(str(int(billing_ids.max()))))
+    row_width = len('INV') + 8 + len('-') + max_width
+    buf = np.zeros((len(billing_ids), row_width), dtype=np.uint8)
+    buf[:, 0:3] = np.frombuffer(b'INV', dtype=np.uint8)
+    _write_digits(buf, 3, date_keys, 8)
+    buf[:, 11] = ord('-')
+
+    # Ids are zero padded to 6 digits and grow wider after that, so fill each width group separately
+    for width in range(6, max_width + 1):
+        low = 0 if width == 6 else 10 ** (width - 1)
+        mask = (billing_ids >= low) & (billing_ids < 10 ** width)
+        if mask.any():
+            group = buf[mask]
+            _write_digits(group, 12, billing_ids[mask], width)
+            buf[mask] = group
+
+    # Shorter rows keep trailing NUL bytes, which numpy drops from 'S' strings
+    return buf.view(f'S{row_width}').ravel().astype(f'U{row_width}')
+
+
+def _date_keys(config, day_offset):
+    calendar_keys, _ = _calendar(config.fact_start_date, config.fact_day_span + 1)
+    return calendar_keys[day_offset]
+
+
+def _in_force(dims, name, ids, days, column=None):
+    """Surrogate key (and ``column``) of the version of ``name`` in force for each business key on each day."""
+    versions = dims[name]
+    rows = as_of(versions, name, ids, days)
+    keys = versions[HISTORIES[name].surrogate].to_numpy()[rows]
+    return keys if column is None else (keys, versions[column].to_numpy()[rows])
+
+
+def _random_minutes(rng, n, hours, minutes):
+    """Minutes since midnight for uniformly drawn hours and minutes."""
+    return rng.integers(hours[0], hours[1] + 1, n) * 60 + rng.choice(minutes, n)
+
+
+def _id_range(config_count, first_id, num_rows):
+    n = config_count - first_id + 1 if num_rows is None else num_rows
+    return n, np.arange(first_id, first_id + n)
+
+
+def _default_rng(config, rng):
+    return np.random.default_rng(config.seed) if rng is None else rng
+
+
+@lru_cache(maxsize=256)
+def _chosen_positions(seed, stream, block, count):
+    """Sorted ``count`` of the ``RNG_BLOCK_ROWS`` positions of ``block``, drawn from their own stream."""
+    rng = block_rng(seed, stream, block)
+    return np.sort(rng.choice(RNG_BLOCK_ROWS, count, replace=False))
+
+
+def _completed_slots(seed, block):
+    return _chosen_positions(seed, 'FactAppointment.Completed', block, COMPLETED_PER_BLOCK), None
+
+
+@lru_cache(maxsize=64)
+def _billing_line_slots(seed, block):
+    """Visit position and line number within the visit of the billing lines of visit block ``block``.
+
+    Every visit gets one line, except that ``UNBILLED_VISITS_PER_BLOCK``
+    visits get none and as many lines go to a second or third line of
+    other visits, so each visit block accounts for exactly
+    ``RNG_BLOCK_ROWS`` lines.
+    """
+    rng = block_rng(seed, 'FactPatientVisit.BillingLines', block)
+    unbilled = rng.choice(RNG_BLOCK_ROWS, UNBILLED_VISITS_PER_BLOCK, replace=False)
+    billed = np.setdiff1d(np.arange(RNG_BLOCK_ROWS), unbilled)
+    visits = np.sort(np.concatenate([billed, rng.choice(billed, UNBILLED_VISITS_PER_BLOCK)]))
+    return visits, np.arange(RNG_BLOCK_ROWS) - np.searchsorted(visits, visits)
+
+
+def _block_bounds(blocks, first, last):
+    """``(block, start, stop)`` for the runs of an ascending block array, restricted to first..last-1."""
+    bounds = np.searchsorted(blocks, np.arange(first, last + 1))
+    return [(block, start, stop) for block, start, stop in zip(range(first, last), bounds[:-1], bounds[1:])
+            if start < stop]
+
+
+def _link(child_index, child_stream, linked_per_block, slots_per_block, slots, parent_count, parent_skip, seed):
+    """Parent row of each child row (0-based, -1 for none) and the child's number within its parent.
+
+    ``linked_per_block`` random rows of every child block (drawn from
+    ``child_stream``) have a parent. Taken in order they fill consecutive
+    slots, ``slots_per_block`` to a parent block, and ``slots(block)``
+    gives the parent position (and optionally the child's number) of each
+    slot. Both sides advance at a fixed rate per block, so a whole chunk is
+    resolved with a few sorted-array lookups and the newest children meet
+    the newest parents when tables grow together. ``child_index`` must be
+    ascending. Parents beyond ``parent_count`` or already written before an
+    append (below ``parent_skip``) are not linked.
+    """
+    block, position = np.divmod(child_index, RNG_BLOCK_ROWS)
+    rank = np.full(len(child_index), -1, dtype=np.int64)
+    for child_block, start, stop in _block_bounds(block, block[0] if len(block) else 0,
+                                                  block[-1] + 1 if len(block) else 0):
+        chosen = _chosen_positions(seed, child_stream, int(child_block), linked_per_block)
+        at = np.minimum(np.searchsorted(chosen, position[start:stop]), linked_per_block - 1)
+        hit = chosen[at] == position[start:stop]
+        rank[start:stop][hit] = child_block * linked_per_block + at[hit]
+
+    parent = np.full(len(child_index), -1, dtype=np.int64)
+    number = np.zeros(len(child_index), dtype=np.int64)
+    linked = np.flatnonzero(rank >= 0)
+    parent_block, slot = np.divmod(rank[linked], slots_per_block)
+    for parent_index, start, stop in _block_bounds(parent_block, parent_skip // RNG_BLOCK_ROWS,
+                                                   -(-parent_count // RNG_BLOCK_ROWS)):
+        positions, numbers = slots(int(parent_index))
+        rows = linked[start:stop]
+        parent[rows] = parent_index * RNG_BLOCK_ROWS + positions[slot[start:stop]]
+        if numbers is not None:
+            number[rows] = numbers[slot[start:stop]]
+    return np.where((parent >= parent_skip) & (parent < parent_count), parent, -1), number
+
+
+def _cached_block(key, build):
+    if key in _parent_blocks:
+        _parent_blocks.move_to_end(key)
+    else:
+        _parent_blocks[key] = build()
+        if len(_parent_blocks) > PARENT_BLOCK_CACHE_SIZE:
+            _parent_blocks.popitem(last=False)
+    return _parent_blocks[key]
+
+
+def _parent_block(name, frame, config, dims, block):
+    # Exactly the block build_fact_chunk writes: same first id, size and stream
+    return _cached_block((name, repr(config), block),
+                         lambda: frame(config, dims, block * RNG_BLOCK_ROWS + 1, RNG_BLOCK_ROWS,
+                                       block_rng(config.seed, name, block)))
+
+
+def _parent_rows(name, frame, config, dims, indices, columns):
+    """``{column: values}`` of the rows of fact table ``name`` at 0-based ``indices``, rebuilt from their blocks."""
+    blocks, inverse = np.unique(indices // RNG_BLOCK_ROWS, return_inverse=True)
+    parts = [_parent_block(name, frame, config, dims, int(block)) for block in blocks]
+    position = inverse * RNG_BLOCK_ROWS + indices % RNG_BLOCK_ROWS
+    return {column: np.concatenate([part[column].to_numpy() for part in parts])[position] for column in columns}
+
+
+def _public(frame):
+    """Drop the ``_``-prefixed columns that only child tables read."""
+    return frame.drop(columns=[column for column in frame.columns if column.startswith('_')])
+
+
+def _appointment_demand(rng, config, dims, n):
+    """What each appointment asks for; the first draws of every FactAppointment block."""
+    preferred_slot = 2 * rng.integers(0, SLOTS_PER_DAY // 2, n)  # on the hour or half hour
+    patient_id = draw_patients(rng, config, n)
+    branch_id = draw_branches(rng, config, dims, n)
+    service_id = rng.choice(range(1, 19), n)
+    doctor_id = draw_doctors(rng, config, dims, n, service_id)
+    return {'preferred_slot': preferred_slot, 'patient_id': patient_id, 'branch_id': branch_id,
+            'service_id': service_id, 'doctor_id': doctor_id}
+
+
+def _earlier_demand(config, dims, indices):
+    """``_appointment_demand`` of the appointments at 0-based ``indices``, redrawn from their blocks."""
+    blocks = range(indices[0] // RNG_BLOCK_ROWS, indices[-1] // RNG_BLOCK_ROWS + 1)
+    parts = [_cached_block(('FactAppointment.Demand', repr(config), block),
+                           lambda: _appointment_demand(block_rng(config.seed, 'FactAppointment', block),
+                                                       config, dims, RNG_BLOCK_ROWS))
+             for block in blocks]
+    position = indices - blocks[0] * RNG_BLOCK_ROWS
+    return {column: np.concatenate([part[column] for part in parts])[position] for column in parts[0]}
+
+
+def _appointment_day_ends(config, dims):
+    """Cumulative appointments per fact day, counting from the first appointment not yet written."""
+    new_rows = config.num_appointments - config.existing_rows.get('FactAppointment', 0)
+    return _cached_block(('FactAppointment.Days', repr(config)),
+                         lambda: np.cumsum(count_days(table_rng(config.seed, 'FactAppointment.Days'),
+                                                      config, dims, new_rows)))
+
+
+def _appointment_frame(config, dims, first_id=1, num_rows=None, rng=None):
+    n, appointment_id = _id_range(config.num_appointments, first_id, num_rows)
+    rng = _default_rng(config, rng)
+    demand = _appointment_demand(rng, config, dims, n)
+    other_status = rng.choice(OTHER_STATUSES, n, p=OTHER_STATUS_WEIGHTS)
+
+    # Ids run in date order, each day taking its drawn share of the rows. Rows before the
+    # existing ones or past the end are never written, so they are left unscheduled.
+    existing = config.existing_rows.get('FactAppointment', 0)
+    day_ends = _appointment_day_ends(config, dims)
+    new_row = appointment_id - 1 - existing
+    day_offset = np.minimum(np.searchsorted(day_ends, new_row, side='right'), config.fact_day_span)
+    scheduled = np.flatnonzero((new_row >= 0) & (new_row < day_ends[-1]))
+    slot = demand['preferred_slot'].copy()
+    room = np.ones(n, dtype=np.int64)
+    doctor_id = demand['doctor_id']
+    if len(scheduled):
+        # The appointments of the first day that belong to earlier blocks already hold their slots
+        first_day = day_offset[scheduled[0]]
+        earlier = np.arange(existing + (day_ends[first_day - 1] if first_day else 0), appointment_id[scheduled[0]] - 1)
+        window = {column: values[scheduled] for column, values in demand.items()}
+        if len(earlier):
+            window = {column: np.concatenate([values, window[column]])
+                      for column, values in _earlier_demand(config, dims, earlier).items()}
+        times = schedule_appointments(config, dims, np.concatenate([np.full(len(earlier), first_day), day_offset[scheduled]]),
+                                      window['branch_id'], window['service_id'], window['doctor_id'],
+                                      window['preferred_slot'])
+        slot[scheduled], room[scheduled], doctor_id[scheduled] = (values[len(earlier):] for values in times)
+
+    # Which appointments are Completed is fixed per block, so visits can find them without this frame
+    block, position = np.divmod(appointment_id - 1, RNG_BLOCK_ROWS)
+    completed = np.zeros(n, dtype=bool)
+    for index in np.unique(block):
+        rows = np.flatnonzero(block == index)
+        completed[rows] = np.isin(position[rows], _completed_slots(config.seed, int(index))[0],
+                                  assume_unique=True)
+
+    return pd.DataFrame({
+        'AppointmentID': appointment_id,
+        'AppointmentDateKey': _date_keys(config, day_offset),
+        'AppointmentTimeKey': OPENING_MINUTE + SLOT_MINUTES * slot,
+        'PatientID': demand['patient_id'],
+        'BranchID': demand['branch_id'],
+        'DoctorID': doctor_id,
+        'ServiceID': demand['service_id'],
+        'RoomNumber': room,
+        'Status': np.where(completed, 'Completed', other_status),
+        '_DayOffset': day_offset,
+    })
+
+
+def generate_fact_appointment(config, dims, first_id=1, num_rows=None, rng=None):
+    return _public(_appointment_frame(config, dims, first_id, num_rows, rng))
+
+
+def booked_appointments(config, visit_index):
+    """0-based FactAppointment row behind each 0-based visit row, -1 for walk-ins."""
+    return _link(visit_index, 'FactPatientVisit.Booked', BOOKED_VISITS_PER_BLOCK, COMPLETED_PER_BLOCK,
+                 lambda block: _completed_slots(config.seed, block),
+                 config.num_appointments, config.existing_rows.get('FactAppointment', 0), config.seed)[0]
+
+
+def billed_visits(config, billing_index):
+    """0-based FactPatientVisit row behind each 0-based billing row (-1 for none) and its line number."""
+    return _link(billing_index, 'FactBillingDetail.Visit', VISIT_LINES_PER_BLOCK, RNG_BLOCK_ROWS,
+                 lambda block: _billing_line_slots(config.seed, block),
+                 config.num_visits, config.existing_rows.get('FactPatientVisit', 0), config.seed)
+
+
+def _visit_frame(config, dims, first_id=1, num_rows=None, rng=None):
+    n, visit_id = _id_range(config.num_visits, first_id, num_rows)
+    rng = _default_rng(config, rng)
+    day_offset = draw_days(rng, config, dims, n)
+    patient_id = draw_patients(rng, config, n)
+    branch_id = draw_branches(rng, config, dims, n)
+    service_id = rng.choice(range(1, 19), n)
+    doctor_id = draw_doctors(rng, config, dims, n, service_id)
+    insurance_id = rng.choice(range(1, 7), n, p=INSURANCE_WEIGHTS)
+    check_in = _random_minutes(rng, n, (8, 17), range(60))
+    waiting = rng.integers(5, 120, n)
+    service_time = rng.integers(15, 180, n)
+    satisfaction = rng.choice([1, 2, 3, 4, 5], n, p=SATISFACTION_WEIGHTS)
+    arrival = rng.integers(-10, 21, n)  # minutes after the appointment time
+
+    # Booked visits happen on the day, at the branch and with the doctor of their Completed appointment
+    appointment = booked_appointments(config, visit_id - 1)
+    booked = appointment >= 0
+    if booked.any():
+        source = _parent_rows('FactAppointment', _appointment_frame, config, dims, appointment[booked],
+                              ['_DayOffset', 'AppointmentTimeKey', 'PatientID', 'BranchID', 'DoctorID', 'ServiceID'])
+        day_offset[booked] = source['_DayOffset']
+        check_in[booked] = source['AppointmentTimeKey'] + arrival[booked]
+        patient_id[booked] = source['PatientID']
+        branch_id[booked] = source['BranchID']
+        doctor_id[booked] = source['DoctorID']
+        service_id[booked] = source['ServiceID']
+
+    return pd.DataFrame({
+        'VisitID': visit_id,
+        'VisitDateKey': _date_keys(config, day_offset),
+        'PatientID': patient_id,
+        'BranchID': branch_id,
+        'DoctorID': doctor_id,
+        'InsuranceID': insurance_id,
+        'CheckInTimeKey': check_in,
+        # Check-in is by 18:05 (the last slot starts at 17:45, plus up to 20 minutes late; walk-ins by
+        # 17:59), so with at most 119 + 179 minutes a visit ends by 23:03 and never runs past midnight
+        'CheckOutTimeKey': check_in + waiting + service_time,
+        'WaitingTimeMinutes': waiting,
+        'ServiceTimeMinutes': service_time,
+        'SatisfactionScore': satisfaction,
+        '_DayOffset': day_offset,
+        '_ServiceID': service_id,
+    })
+
+
+def generate_fact_visit(config, dims, first_id=1, num_rows=None, rng=None):
+    return _public(_visit_frame(config, dims, first_id, num_rows, rng))
+
+
+def generate_fact_billing(config, dims, first_id=1, num_rows=None, rng=None):
+    """Build FactBillingDetail with whole-column NumPy draws.
+
+    Every key column is drawn in one call and service costs and payment
+    fees are joined by indexing dense lookup arrays built from the
+    dimensions. Base prices, coverage and the doctor's version come from
+    the Type-2 version tables in force on the billing date (see
+    ``history.as_of``). Lines that belong to a visit
+    copy its keys from the rebuilt visit block (see ``billed_visits``).
+    ``first_id``/``num_rows``
+    select a slice of the table so it can be generated chunk by chunk
+    with globally unique BillingID/BillingNumber values; ``rng`` is the
+    block's own ``numpy.random.Generator``.
+    """
+    n, billing_id = _id_range(config.num_billing_records, first_id, num_rows)
+    rng = _default_rng(config, rng)
+    dim_service = dims['DimService']
+    dim_payment_method = dims['DimPaymentMethod']
+
+    day_offset = draw_days(rng, config, dims, n)
+    patient_id = draw_patients(rng, config, n)
+    branch_id = draw_branches(rng, config, dims, n)
+    service_id = rng.choice(range(1, 19), n)
+    doctor_id = draw_doctors(rng, config, dims, n, service_id)
+    insurance_id = rng.choice(range(1, 7), n, p=INSURANCE_WEIGHTS)
+    payment_method_id = rng.choice(range(1, 9), n, p=PAYMENT_METHOD_WEIGHTS)
+
+    # Lines of a visit are billed on its day to its patient, branch, doctor and insurer;
+    # the first line is the visit's service. Other lines (pharmacy, online) have no visit.
+    visit, line = billed_visits(config, billing_id - 1)
+    billed = visit >= 0
+    if billed.any():
+        source = _parent_rows('FactPatientVisit', _visit_frame, config, dims, visit[billed],
+                              ['_DayOffset', 'PatientID', 'BranchID', 'DoctorID', 'InsuranceID', '_ServiceID'])
+        day_offset[billed] = source['_DayOffset']
+        patient_id[billed] = source['PatientID']
+        branch_id[billed] = source['BranchID']
+        doctor_id[billed] = source['DoctorID']
+        insurance_id[billed] = source['InsuranceID']
+        first_line = line[billed] == 0
+        service_id[np.flatnonzero(billed)[first_line]] = source['_ServiceID'][first_line]
+    visit_id = pd.array(visit + 1, dtype='Int32')
+    visit_id[~billed] = pd.NA
+
+    # Payments settle up to 7 days after the billing date
+    calendar_keys, calendar_dates = _calendar(config.fact_start_date, config.fact_day_span + 8)
+    date_key = calendar_keys[day_offset]
+    day = np.datetime64(config.fact_start_date, 'D') + day_offset
+    service_key, base_price = _in_force(dims, 'DimServiceVersion', service_id, day, 'BasePrice')
+    insurance_key, coverage_percent = _in_force(dims, 'DimInsuranceVersion', insurance_id, day, 'CoveragePercent')
+    doctor_key = _in_force(dims, 'DimDoctorVersion', doctor_id, day)
+
+    # Service details, at the price in force on the billing date
+    cost = _lookup(dim_service, 'ServiceID', 'Cost')[service_id]
+    is_package = _lookup(dim_service, 'ServiceID', 'Category')[service_id] == 'Health Package'
+
+    # Quantity and prices
+    quantity = np.where(is_package, 1, rng.integers(1, 4, n))
+    unit_price = base_price * rng.uniform(0.9, 1.1, n)  # Add some price variation
+    discount_percent = np.where(rng.random(n) < 0.3, rng.choice(DISCOUNT_CHOICES, n), 0)
+
+    gross_amount = unit_price * quantity
+    discount_amount = gross_amount * (discount_percent / 100)
+    net_amount = gross_amount - discount_amount
+
+    # Insurance coverage under the contract in force on the billing date
+    insurance_coverage_amount = net_amount * (coverage_percent / 100)
+    patient_paid_amount = net_amount - insurance_coverage_amount
+
+    # Payment processing fee
+    processing_fee = _lookup(dim_payment_method, 'PaymentMethodID', 'ProcessingFee')[payment_method_id]
+    payment_fee = patient_paid_amount * (processing_fee / 100)
+
+    # Total cost
+    total_cost = cost * quantity
+    gross_profit = net_amount - total_cost - payment_fee
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gross_profit_margin = np.where(net_amount > 0, gross_profit / net_amount * 100, 0)
+
+    payment_offset = day_offset + rng.integers(0, 8, n)
+
+    return pd.DataFrame({
+        'BillingID': billing_id,
+        'BillingNumber': format_billing_numbers(date_key, billing_id),
+        'BillingDateKey': date_key,
+        'VisitID': visit_id,
+        'PatientID': patient_id,
+        'BranchID': branch_id,
+        'DoctorID': doctor_id,
+        'ServiceID': service_id,
+        'InsuranceID': insurance_id,
+        'PaymentMethodID': payment_method_id,
+        'ServiceKey': service_key,
+        'DoctorKey': doctor_key,
+        'InsuranceKey': insurance_key,
+        'Quantity': quantity,
+        'UnitPrice': np.round(unit_price, 2),
+        'GrossAmount': np.round(gross_amount, 2),
+        'DiscountPercent': discount_percent,
+        'DiscountAmount': np.round(discount_amount, 2),
+        'NetAmount': np.round(net_amount, 2),
+        'InsuranceCoverageAmount': np.round(insurance_coverage_amount, 2),
+        'PatientPaidAmount': np.round(patient_paid_amount, 2),
+        'PaymentFee': np.round(payment_fee, 2),
+        'TotalCost': np.round(total_cost, 2),
+        'GrossProfit': np.round(gross_profit, 2),
+        'GrossProfitMargin': np.round(gross_profit_margin, 2),
+        'PaymentStatus': rng.choice(PAYMENT_STATUSES, n, p=PAYMENT_STATUS_WEIGHTS),
+        'PaymentDate': calendar_dates[payment_offset],
+    })
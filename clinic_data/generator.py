@@ -0,0 +1,153 @@
+from dataclasses import dataclass
+from functools import partial
+
+import pandas as pd
+
+from clinic_data.dimensions import (
+    generate_dim_branch, generate_dim_date, generate_dim_doctor, generate_dim_employee,
+    generate_dim_insurance, generate_dim_patient, generate_dim_payment_method, generate_dim_service,
+    generate_dim_time,
+)
+from clinic_data.facts import generate_fact_appointment, generate_fact_billing, generate_fact_visit
+from clinic_data.history import HISTORIES, generate_dim_versions
+from clinic_data.rng import RNG_BLOCK_ROWS, block_rng, table_rng
+from clinic_data.schema import apply_schema
+
+
+@dataclass(frozen=True)
+class FactTable:
+    count_attr: str  # row count attribute on GeneratorConfig
+    builder: object  # builder(config, dims, first_id, num_rows, rng) -> DataFrame
+    label: str
+    date_key: str
+    id_column: str
+    dims: tuple = ()  # dimension tables the builder reads
+
+
+# Day weights, branch rooms, service durations and doctor specialties, which every fact table draws with
+# (visits and billing lines also rebuild the appointment and visit rows they link to)
+SCHEDULE_DIMS = ('DimDate', 'DimBranch', 'DimService', 'DimDoctor')
+
+FACT_TABLES = {
+    'FactAppointment': FactTable('num_appointments', generate_fact_appointment,
+                                 "📅 Generating FactAppointment...", 'AppointmentDateKey', 'AppointmentID',
+                                 SCHEDULE_DIMS),
+    'FactPatientVisit': FactTable('num_visits', generate_fact_visit,
+                                  "🏥 Generating FactPatientVisit...", 'VisitDateKey', 'VisitID', SCHEDULE_DIMS),
+    'FactBillingDetail': FactTable('num_billing_records', generate_fact_billing,
+                                   "💰 Generating FactBillingDetail...", 'BillingDateKey', 'BillingID',
+                                   (*SCHEDULE_DIMS, 'DimPaymentMethod', *HISTORIES)),
+}
+
+
+def _dim_versions(name, config, dimension):
+    return generate_dim_versions(name, dimension, config.date_start, config.fact_end_date, config.seed)
+
+
+@dataclass(frozen=True)
+class DimensionTable:
+    builder: object  # builder(config, *dims) -> DataFrame
+    label: str
+    dims: tuple = ()  # dimension tables passed to the builder, in order
+
+
+DIMENSION_TABLES = {
+    'DimDate': DimensionTable(lambda config: generate_dim_date(config.date_start, config.date_end, config.as_of_date),
+                              "📅 Generating DimDate..."),
+    'DimTime': DimensionTable(lambda config: generate_dim_time(), "🕘 Generating DimTime..."),
+    'DimBranch': DimensionTable(lambda config: generate_dim_branch(config.num_branches), "🏢 Generating DimBranch..."),
+    'DimService': DimensionTable(lambda config: generate_dim_service(), "💊 Generating DimService..."),
+    'DimDoctor': DimensionTable(lambda config: generate_dim_doctor(config.num_doctors),
+                                "👨‍⚕️ Generating DimDoctor..."),
+    'DimEmployee': DimensionTable(
+        lambda config, dim_branch: generate_dim_employee(dim_branch, table_rng(config.seed, 'DimEmployee')),
+        "👥 Generating DimEmployee...", ('DimBranch',)),
+    'DimPaymentMethod': DimensionTable(lambda config: generate_dim_payment_method(),
+                                       "💳 Generating DimPaymentMethod..."),
+    'DimInsurance': DimensionTable(lambda config: generate_dim_insurance(), "🏥 Generating DimInsurance..."),
+    'DimPatient': DimensionTable(
+        lambda config: generate_dim_patient(config.num_patients, table_rng(config.seed, 'DimPatient')),
+        "🏥 Generating DimPatient..."),
+    **{name: DimensionTable(partial(_dim_versions, name), f"📜 Generating {name}...", (history.dimension,))
+       for name, history in HISTORIES.items()},
+}
+
+# Every table in build order; ``TABLES[name].dims`` are the tables it is built from
+TABLES = {**DIMENSION_TABLES, **FACT_TABLES}
+
+
+def build_dimension(name, config, dims):
+    """Dimension table ``name``, built from the tables of ``dims`` it declares and cast to its schema."""
+    table = DIMENSION_TABLES[name]
+    return apply_schema(name, table.builder(config, *(dims[dim] for dim in table.dims)))
+
+
+def generate_dimensions(config):
+    """Build the 12 dimension tables, keyed by their output file name.
+
+    Each randomized dimension draws from its own named stream, so the
+    dimensions do not shift when row counts or the build order change.
+    The Type-2 versions of DimService, DimDoctor and DimInsurance run from
+    the start of DimDate to the last fact day. Every table is cast to its
+    ``schema.SCHEMA`` dtypes.
+    """
+    print()
+    tables = {}
+    for name, table in DIMENSION_TABLES.items():
+        print(table.label)
+        tables[name] = build_dimension(name, config, tables)
+    return tables
+
+
+def fact_row_count(name, config):
+    return getattr(config, FACT_TABLES[name].count_attr)
+
+
+def chunk_ranges(total, chunk_size, skip=0):
+    """``(first_id, num_rows)`` pairs covering ids skip+1..total in steps of ``chunk_size``."""
+    for start in range(skip, total, chunk_size):
+        yield start + 1, min(chunk_size, total - start)
+
+
+def fact_chunks(name, config):
+    return chunk_ranges(fact_row_count(name, config), config.chunk_size, config.existing_rows.get(name, 0))
+
+
+def build_fact_chunk(name, config, dims, first_id, num_rows):
+    """Rows ``first_id .. first_id + num_rows - 1`` of fact table ``name``.
+
+    The rows are assembled from fixed ``RNG_BLOCK_ROWS`` blocks, each built
+    from its own ``block_rng`` stream. A block cut by the chunk boundary or
+    the end of the table is built whole and sliced. As a result any chunking
+    yields the same rows as a single-chunk run, and growing the row count
+    only appends rows. The chunk is cast to the ``schema.SCHEMA`` dtypes.
+    """
+    builder = FACT_TABLES[name].builder
+    start, stop = first_id - 1, first_id - 1 + num_rows
+    blocks = []
+    for block_index in range(start // RNG_BLOCK_ROWS, (stop - 1) // RNG_BLOCK_ROWS + 1):
+        block_start = block_index * RNG_BLOCK_ROWS
+        block = builder(config, dims, block_start + 1, RNG_BLOCK_ROWS, block_rng(config.seed, name, block_index))
+        blocks.append(block.iloc[max(start - block_start, 0):stop - block_start])
+    chunk = pd.concat(blocks, ignore_index=True) if len(blocks) > 1 else blocks[0].reset_index(drop=True)
+    return apply_schema(name, chunk)
+
+
+def iter_fact_chunks(name, config, dims):
+    """Generate fact table ``name`` lazily, ``config.chunk_size`` rows at a time."""
+    for first_id, num_rows in fact_chunks(name, config):
+        yield build_fact_chunk(name, config, dims, first_id, num_rows)
+
+
+def generate_fact_table(name, config, dims):
+    """Fact table ``name`` in one DataFrame; ``dims`` needs only the tables of its ``FactTable.dims``."""
+    return pd.concat(iter_fact_chunks(name, config, dims), ignore_index=True)
+
+
+def generate_tables(config):
+    """Build all 15 tables fully in memory, keyed by their output file name."""
+    tables = generate_dimensions(config)
+    for name, fact in FACT_TABLES.items():
+        print(fact.label)
+        tables[name] = generate_fact_table(name, config, tables)
+    return tables
@@ -0,0 +1,183 @@
+"""Type-2 (slowly changing) history of service prices, doctor rates and insurance coverage.
+
+DimService.BasePrice, DimDoctor.HourlyRate and DimInsurance.CoveragePercent
+are the values in force at the end of the original fact history
+(``config.FACT_END_DATE``). Every year each is revised on a fixed day for a
+drawn share of the members: the price list in January, the doctors' pay
+review in April and the insurance contracts in July. DimServiceVersion,
+DimDoctorVersion and DimInsuranceVersion hold one row per member and
+period with the value in force, ValidFrom/ValidTo and a surrogate key.
+
+The revisions of a year come from their own stream and are walked back
+from the values at ``FACT_END_DATE``, so the versions of a year do not
+depend on the date span generated. Surrogate keys are numbered in
+ValidFrom order, so an append only adds versions with new keys after the
+existing ones.
+
+A fact row finds its version with an as-of lookup: the versions, ordered by
+business key and ValidFrom, are packed into one sorted int64 per row, and
+a single ``searchsorted`` of the packed (key, day) of every fact row gives
+the last version that started on or before that day.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from clinic_data.config import FACT_END_DATE
+from clinic_data.rng import block_rng
+
+# ValidTo of the versions still in force
+OPEN_END = np.datetime64('9999-12-31')
+
+
+@dataclass(frozen=True)
+class History:
+    dimension: str  # the dimension holding the values in force at FACT_END_DATE
+    key: str  # business key
+    surrogate: str  # surrogate key of the versions
+    column: str  # the attribute that changes
+    month: int  # revised on the 1st of this month
+    share: float  # share of the members revised in a year
+    steps: tuple  # size of a revision: a percentage when ``percent``, else an amount
+    percent: bool = False
+    unit: int = 1  # revised values are rounded to a multiple of this
+    low: int = 0
+    high: int = None
+
+
+HISTORIES = {
+    'DimServiceVersion': History('DimService', 'ServiceID', 'ServiceKey', 'BasePrice', 1, 0.6, (3, 5, 8),
+                                 percent=True, unit=10),
+    'DimDoctorVersion': History('DimDoctor', 'DoctorID', 'DoctorKey', 'HourlyRate', 4, 0.5, (50, 100, 150, 200),
+                                low=500),
+    'DimInsuranceVersion': History('DimInsurance', 'InsuranceID', 'InsuranceKey', 'CoveragePercent', 7, 0.3,
+                                   (-10, -5, 5, 10), low=50, high=100),
+}
+
+
+def _revision_year(history, date):
+    """Year of the last revision on or before ``date``."""
+    return date.year - (date < datetime(date.year, history.month, 1))
+
+
+def _steps(seed, name, history, year, n):
+    """Size of each member's revision in ``year``, 0 for the members not revised."""
+    # One stream per revision year and a pair of draws per member, so adding members keeps the others' history
+    draws = block_rng(seed, name, year).random((n, 2))
+    steps = np.asarray(history.steps)[(draws[:, 1] * len(history.steps)).astype(np.int64)]
+    return np.where(draws[:, 0] < history.share, steps, 0)
+
+
+def _revise(history, values, steps, forward=True):
+    """Values after (or, not ``forward``, before) revisions of size ``steps``; zero values never change."""
+    if history.percent:
+        factor = 1 + steps / 100
+        revised = values * factor if forward else values / factor
+    else:
+        revised = values + steps if forward else values - steps
+    revised = np.clip(np.round(revised / history.unit) * history.unit, history.low, history.high)
+    return np.where((values == 0) | (steps == 0), values, revised).astype(values.dtype)
+
+
+def generate_dim_versions(name, dimension, start_date, end_date, seed):
+    """Versions of ``dimension`` from ``start_date`` through the revisions up to ``end_date``.
+
+    ``dimension`` is the Type-1 dimension (DimService, DimDoctor or
+    DimInsurance); every other attribute is copied to each version. The
+    first version of a member is valid from ``start_date``.
+    """
+    history = HISTORIES[name]
+    n = len(dimension)
+    current = dimension[history.column].to_numpy(dtype=np.int64)
+    anchor = _revision_year(history, FACT_END_DATE)
+    first, last = _revision_year(history, start_date), _revision_year(history, end_date)
+
+    by_year = {anchor: current}
+    for year in range(anchor + 1, last + 1):
+        by_year[year] = _revise(history, by_year[year - 1], _steps(seed, name, history, year, n))
+    for year in range(anchor - 1, first - 1, -1):
+        by_year[year] = _revise(history, by_year[year + 1], _steps(seed, name, history, year + 1, n), forward=False)
+    years = np.arange(first, last + 1)
+    values = np.stack([by_year[year] for year in years])
+
+    # A member gets a version where its value changes; np.nonzero numbers them by ValidFrom, then member
+    starts = np.ones(values.shape, dtype=bool)
+    starts[1:] = values[1:] != values[:-1]
+    period, member = np.nonzero(starts)
+    valid_from = np.array([f'{year}-{history.month:02d}-01' for year in years], dtype='datetime64[D]')[period]
+    valid_from[period == 0] = np.datetime64(start_date, 'D')
+
+    # Rows are ordered by member, then ValidFrom, which is what ``as_of`` searches
+    order = np.lexsort((period, member))
+    member, valid_from = member[order], valid_from[order]
+    last_of_member = np.append(member[1:] != member[:-1], True)
+    valid_to = np.where(last_of_member, OPEN_END, np.append(valid_from[1:], OPEN_END) - 1)
+
+    versions = dimension.iloc[member].reset_index(drop=True)
+    versions[history.column] = values[period[order], member]
+    versions.insert(0, history.surrogate, order + 1)
+    versions['ValidFrom'] = valid_from.astype('datetime64[s]')
+    versions['ValidTo'] = valid_to.astype('datetime64[s]')
+    versions['IsCurrent'] = last_of_member.astype(int)
+    return versions
+
+
+def extend_dim_versions(name, versions, after, end_date, seed):
+    """``versions`` as already written, plus the revisions after ``after`` up to ``end_date``.
+
+    The revisions continue from the values in force (``IsCurrent``), so the
+    new versions follow the existing history whatever seed it was generated
+    with. Existing versions keep their surrogate keys; new ones are numbered
+    after them in ValidFrom order, and the versions they replace get a
+    ValidTo and lose IsCurrent. For the same seed this gives the versions
+    ``generate_dim_versions`` would over the whole span.
+    """
+    history = HISTORIES[name]
+    versions = versions.sort_values([history.key, 'ValidFrom'], kind='stable')
+    current = versions[versions['IsCurrent'] == 1].reset_index(drop=True)
+    values = current[history.column].to_numpy(dtype=np.int64)
+    next_key = int(versions[history.surrogate].max()) + 1
+
+    added = [versions]
+    for year in range(_revision_year(history, after) + 1, _revision_year(history, end_date) + 1):
+        revised = _revise(history, values, _steps(seed, name, history, year, len(values)))
+        changed = np.nonzero(revised != values)[0]
+        rows = current.iloc[changed].copy()
+        rows[history.column] = revised[changed]
+        rows[history.surrogate] = np.arange(next_key, next_key + len(changed))
+        rows['ValidFrom'] = np.datetime64(f'{year}-{history.month:02d}-01', 's')
+        added.append(rows)
+        values, next_key = revised, next_key + len(changed)
+
+    extended = pd.concat(added, ignore_index=True).sort_values([history.key, 'ValidFrom'], kind='stable')
+    member = extended[history.key].to_numpy()
+    valid_from = extended['ValidFrom'].to_numpy().astype('datetime64[D]')
+    last_of_member = np.append(member[1:] != member[:-1], True)
+    valid_to = np.where(last_of_member, OPEN_END, np.append(valid_from[1:], OPEN_END) - 1)
+    extended['ValidTo'] = valid_to.astype('datetime64[s]')
+    extended['IsCurrent'] = last_of_member.astype(int)
+    return extended.reset_index(drop=True)
+
+
+def as_of(versions, name, ids, days):
+    """Row of ``versions`` in force for each business key ``ids`` on each of ``days``.
+
+    ``days`` are datetime64 values or integer days since 1970-01-01.
+    ``versions`` must be ordered by business key and ValidFrom, as
+    ``generate_dim_versions`` writes it; every key is assumed to have a
+    version. Days before a key's first version resolve to that version.
+    """
+    history = HISTORIES[name]
+    keys = versions[history.key].to_numpy(dtype=np.int64)
+    starts = versions['ValidFrom'].to_numpy().astype('datetime64[D]').astype(np.int64)
+    ids = np.asarray(ids, dtype=np.int64)
+    days = np.asarray(days).astype('datetime64[D]').astype(np.int64)
+    # Days counted from the first ValidFrom fit in the low 32 bits, below the key
+    origin = starts.min()
+    rows = np.searchsorted(keys << 32 | (starts - origin), ids << 32 | np.maximum(days - origin, 0), side='right') - 1
+    # A day before the first version of its key lands on the previous key's last version
+    before = (rows < 0) | (keys[np.maximum(rows, 0)] != ids)
+    return np.where(before, rows + 1, rows)
+
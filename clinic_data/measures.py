@@ -0,0 +1,632 @@
+"""Evaluate the README's DAX measures over the generated star schema.
+
+``MeasureEngine`` holds the dimension and fact tables in memory and
+computes the measures of the README's "DAX formular overview" for a
+filter context (``{'DimDate[Year]': 2024, 'DimBranch[Region]': [...]}``)
+and a list of group-by columns, with the same semantics as the report:
+
+- Filters on a table flow along the documented relationships (dimension
+  to fact, DimBranch to DimEmployee); FactPatientVisit filters
+  FactBillingDetail only by its own columns. Grouping by a column a measure's table cannot reach
+  repeats its total, as Power BI does.
+- BLANK is NaN: sums over no rows are blank, ``+``/``-`` treat blank as
+  0, and DIVIDE returns its alternate result for a zero or blank
+  denominator.
+- DATEADD and PREVIOUSMONTH/PREVIOUSYEAR shift the dates in context using
+  DimDate's PrevMonthDateKey/PrevYearDateKey. Whole months shift to whole
+  months.
+- ALL/ALLEXCEPT and RANKX(ALL(...)) drop the filters and groupings of the
+  named columns.
+
+Every measure is cached per (measure, filter context, grouping), so
+measures built from the same base measures share their group-bys.
+"""
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from clinic_data.dimensions import OPENING_HOURS
+from clinic_data.generator import FACT_TABLES
+from clinic_data.warehouse import documented_keys, table_order
+from clinic_data.writers import iter_table_chunks, read_table
+
+CACHE_SIZE = 4096
+
+# Sums are rounded like DAX's fixed decimal type, so the same total summed in
+# a different order (per day, from a cube) compares equal
+SUM_DECIMALS = 6
+
+_REFERENCE = re.compile(r"^'?(\w+)'?\[(\w+)\]$")
+
+
+def column_ref(reference):
+    """``'DimBranch[Region]'`` -> ``('DimBranch', 'Region')``."""
+    if isinstance(reference, tuple):
+        return reference
+    match = _REFERENCE.match(reference.strip())
+    if not match:
+        raise ValueError(f"column references look like 'Table[Column]', got {reference!r}")
+    return match.groups()
+
+
+def ref_name(ref):
+    return f'{ref[0]}[{ref[1]}]'
+
+
+@dataclass(frozen=True)
+class Context:
+    """A filter context: ``filters`` is a sorted tuple of ``((table, column), frozenset(values))``."""
+    filters: tuple = ()
+    group_by: tuple = ()
+
+    def without(self, table, keep=()):
+        """The context with the filters and groupings of ``table`` removed, except the ``keep`` columns."""
+        dropped = lambda ref: ref[0] == table and ref[1] not in keep  # noqa: E731
+        return Context(tuple(f for f in self.filters if not dropped(f[0])),
+                       tuple(g for g in self.group_by if not dropped(g)))
+
+
+def make_context(filters=None, group_by=()):
+    items = []
+    for reference, values in (filters or {}).items():
+        if isinstance(values, (str, bytes)) or not hasattr(values, '__iter__'):
+            values = [values]
+        items.append((column_ref(reference), frozenset(values)))
+    return Context(tuple(sorted(items, key=lambda item: item[0])), tuple(column_ref(g) for g in group_by))
+
+
+# ---- measure definitions -------------------------------------------------------------
+
+class Measure:
+    def evaluate(self, engine, context):
+        """Values aligned with ``engine.groups(context)`` as a Series with a RangeIndex."""
+        raise NotImplementedError
+
+
+class Aggregate(Measure):
+    """SUM/COUNTROWS/DISTINCTCOUNT/AVERAGE over one table; ``values(engine)`` gives the per-row values.
+
+    ``column`` names the summed column when it is a plain column, so the
+    engine can answer from a ``BillingCube`` instead.
+    """
+
+    def __init__(self, table, how, values=None, column=None):
+        self.table = table
+        self.how = how
+        self.values = values
+        self.column = column
+
+    def evaluate(self, engine, context):
+        values = engine.aggregate(self.table, self.how, self.values, context, self.column)
+        return values.round(SUM_DECIMALS) if self.how == 'sum' else values
+
+
+class Expression(Measure):
+    """A measure computed from other measures, evaluated in the same context."""
+
+    def __init__(self, function, *measures):
+        self.function = function
+        self.measures = measures
+
+    def evaluate(self, engine, context):
+        return self.function(*(engine.series(name, context) for name in self.measures))
+
+
+class RemoveFilters(Measure):
+    """CALCULATE(measure, ALL(table)) or ALLEXCEPT(table, keep...)."""
+
+    def __init__(self, measure, table, keep=()):
+        self.measure = measure
+        self.table = table
+        self.keep = keep
+
+    def evaluate(self, engine, context):
+        inner = context.without(self.table, self.keep)
+        return engine.broadcast(engine.series(self.measure, inner), inner, context)
+
+
+class TimeShift(Measure):
+    """CALCULATE(measure, DATEADD(DimDate[Date], -1, MONTH|YEAR)) or PREVIOUSMONTH/PREVIOUSYEAR.
+
+    Only additive measures can be shifted, as the value over the shifted
+    dates is summed from per-day values.
+    """
+
+    def __init__(self, measure, shift):
+        self.measure = measure
+        self.shift = shift
+
+    def evaluate(self, engine, context):
+        return engine.time_shift(self.measure, self.shift, context).round(SUM_DECIMALS)
+
+
+class DenseRank(Measure):
+    """RANKX(ALL(table[column]), measure, , DESC, Dense)."""
+
+    def __init__(self, measure, table, column):
+        self.measure = measure
+        self.table = table
+        self.column = column
+
+    def evaluate(self, engine, context):
+        return engine.dense_rank(self.measure, (self.table, self.column), context)
+
+
+def blank_add(a, b):
+    return a.add(b, fill_value=0)
+
+
+def blank_sub(a, b):
+    return a.sub(b, fill_value=0)
+
+
+def divide(numerator, denominator, alternate=np.nan):
+    """DAX DIVIDE: ``alternate`` where the denominator is zero or blank."""
+    valid = denominator.notna() & (denominator != 0)
+    return pd.Series(np.where(valid, numerator / denominator.where(valid, 1), alternate), index=numerator.index)
+
+
+def _format_change(current, previous):
+    # UNICHAR(11165) / UNICHAR(11167) arrows in front of FORMAT(_perc, "0.0%")
+    change = divide(current - previous, previous)
+    return pd.Series([None if np.isnan(p) else f'{"⮝ " if p > 0 else "⮟ " if p < 0 else ""}{p:.1%}'
+                      for p in change], index=current.index, dtype=object)
+
+
+def _traffic_light(current, previous):
+    change = divide(current - previous, previous)
+    return pd.Series(np.select([change > 0, change < 0], ['#2ECC71', '#E74C3C'], 'Gray'), index=current.index)
+
+
+def _performance_status(margin):
+    return pd.Series(np.select([margin >= 70, margin >= 60, margin >= 50],
+                               ['🟢 Excellent', '🟡 Good', '🟠 Fair'], '🔴 Needs Improvement'), index=margin.index)
+
+
+def _service_hours(engine):
+    return engine.column('FactBillingDetail', 'Quantity') * engine.related('FactBillingDetail', 'DimService', 'Duration') / 60
+
+
+def _doctor_fees(engine):
+    # At the rate in force on the billing date
+    return _service_hours(engine) * engine.related('FactBillingDetail', 'DimDoctorVersion', 'HourlyRate')
+
+
+def _booked_hours(engine):
+    return engine.related('FactAppointment', 'DimService', 'Duration') / 60
+
+
+def _open_hours(table):
+    """Hours of capacity per opening day: every room of DimBranch, or every doctor of DimDoctor."""
+    hours = OPENING_HOURS[1] - OPENING_HOURS[0]
+    if table == 'DimBranch':
+        return Aggregate(table, 'sum', lambda engine: engine.column(table, 'NumRooms') * hours)
+    return Aggregate(table, 'sum', lambda engine: np.full(len(engine.tables[table]), hours))
+
+
+def _billing_sum(column):
+    return Aggregate('FactBillingDetail', 'sum', lambda engine: engine.column('FactBillingDetail', column), column)
+
+
+MEASURES = {
+    'Branch Rank': DenseRank('Revenue', 'DimBranch', 'BranchName'),
+    'Rent Expense': Aggregate('DimBranch', 'sum', lambda engine: engine.column('DimBranch', 'MonthlyRent')),
+    'Doctor Fees': Aggregate('FactBillingDetail', 'sum', _doctor_fees),
+    'Total Service Hours': Aggregate('FactBillingDetail', 'sum', _service_hours),
+    'Salary Expense': Aggregate('DimEmployee', 'sum', lambda engine: engine.column('DimEmployee', 'MonthlySalary')),
+    'Total Revenue': _billing_sum('NetAmount'),
+    'Gross Profit': _billing_sum('GrossProfit'),
+    'Profit Margin': Expression(lambda gp, revenue: divide(gp, revenue, 0), 'Gross Profit', 'Total Revenue'),
+    'Total Patients': Aggregate('FactBillingDetail', 'nunique',
+                                lambda engine: engine.column('FactBillingDetail', 'PatientID')),
+    'Gross Profit PM': TimeShift('Gross Profit', 'month'),
+    'Gross Profit PY': TimeShift('Gross Profit', 'year'),
+    'Total Revenue PM': TimeShift('Total Revenue', 'month'),
+    'Total Revenue PY': TimeShift('Total Revenue', 'year'),
+    'vs last month': Expression(_format_change, 'Gross Profit', 'Gross Profit PM'),
+    'vs last year': Expression(_format_change, 'Gross Profit', 'Gross Profit PY'),
+    'ConditionFormatting PrevMonth': Expression(_traffic_light, 'Gross Profit', 'Gross Profit Previous Month'),
+    'ConditionFormatting PrevYear': Expression(_traffic_light, 'Gross Profit', 'Gross Profit Previous Year'),
+    'revenue vs last month': Expression(_format_change, 'Total Revenue', 'Total Revenue PM'),
+    'revenue vs last year': Expression(_format_change, 'Total Revenue', 'Total Revenue PY'),
+    'ConditionFormatting Rev PrevMonth': Expression(_traffic_light, 'Total Revenue', 'Total Revenue Previous Month'),
+    'ConditionFormatting rev PrevYear': Expression(_traffic_light, 'Total Revenue', 'Total Revenue Previous Year'),
+    'Gross Profit Previous Month': TimeShift('Gross Profit', 'previous_month'),
+    'Gross Profit Previous Year': TimeShift('Gross Profit', 'previous_year'),
+    'Total Revenue Previous Month': TimeShift('Total Revenue', 'previous_month'),
+    'Total Revenue Previous Year': TimeShift('Total Revenue', 'previous_year'),
+    'Patient Count': Aggregate('FactBillingDetail', 'nunique',
+                               lambda engine: engine.column('FactBillingDetail', 'PatientID')),
+    'Revenue': _billing_sum('NetAmount'),
+    'Transaction Count': Aggregate('FactBillingDetail', 'count', column='BillingCount'),
+    'Avg Transaction Value': Expression(lambda revenue, count: divide(revenue, count, 0),
+                                        'Revenue', 'Transaction Count'),
+    'Profit Margin %': Expression(lambda gp, revenue: divide(gp, revenue, 0) * 100, 'Gross Profit', 'Revenue'),
+    'Revenue per Patient': Expression(lambda revenue, patients: divide(revenue, patients, 0),
+                                      'Revenue', 'Patient Count'),
+    'Total Fixed Costs': Expression(blank_add, 'Rent Expense', 'Salary Expense'),
+    'Net Profit': Expression(blank_sub, 'Gross Profit', 'Total Fixed Costs'),
+    'Revenue PM': TimeShift('Revenue', 'month'),
+    'Revenue Growth %': Expression(lambda current, previous: divide(current - previous, previous),
+                                   'Revenue', 'Revenue PM'),
+    'Performance Status': Expression(_performance_status, 'Profit Margin %'),
+    'Gross Revenue': _billing_sum('GrossAmount'),
+    'Discounts': _billing_sum('DiscountAmount'),
+    'Net Revenue': Expression(blank_sub, 'Gross Revenue', 'Discounts'),
+    'Direct Costs': _billing_sum('TotalCost'),
+    'Payment Fees': _billing_sum('PaymentFee'),
+    'Total COGS': Expression(blank_add, 'Direct Costs', 'Payment Fees'),
+    'Gross Margin %': Expression(lambda gp, revenue: divide(gp, revenue, 0), 'Gross Profit', 'Net Revenue'),
+    'Total Operating Expenses': Expression(lambda rent, salary, fees: blank_add(blank_add(rent, salary), fees),
+                                           'Rent Expense', 'Salary Expense', 'Doctor Fees'),
+    'Net Margin %': Expression(lambda profit, revenue: divide(profit, revenue, 0), 'Net Profit', 'Net Revenue'),
+    'EBITDA': Expression(lambda profit: profit, 'Net Profit'),
+    'Revenue by Payment': _billing_sum('NetAmount'),
+    'Payment Mix %': Expression(lambda revenue, total: divide(revenue, total, 0),
+                                'Revenue by Payment', 'Revenue by Payment (all methods)'),
+    'Revenue by Payment (all methods)': RemoveFilters('Revenue by Payment', 'DimPaymentMethod'),
+    'Avg Payment Fee %': Expression(lambda fees, paid: divide(fees, paid, 0) * 100,
+                                    'Payment Fees', 'Patient Paid Amount'),
+    'Patient Paid Amount': _billing_sum('PatientPaidAmount'),
+    'Revenue by Payment Method': RemoveFilters('Total Revenue', 'DimPaymentMethod', keep=('PaymentMethodName',)),
+    'Total Payment Fees': _billing_sum('PaymentFee'),
+    'Avg Satisfaction': Aggregate('FactPatientVisit', 'mean',
+                                  lambda engine: engine.column('FactPatientVisit', 'SatisfactionScore')),
+    'Booked Room Hours': Aggregate('FactAppointment', 'sum', _booked_hours),
+    'Branch Utilization Rate': Expression(lambda booked, rooms, days: divide(booked, rooms * days, 0),
+                                          'Booked Room Hours', 'Room Hours per Day', 'Opening Days'),
+    'Doctor Utilization Rate': Expression(lambda booked, doctors, days: divide(booked, doctors * days, 0),
+                                          'Booked Room Hours', 'Doctor Hours per Day', 'Opening Days'),
+    'Room Hours per Day': _open_hours('DimBranch'),
+    'Doctor Hours per Day': _open_hours('DimDoctor'),
+    'Opening Days': Aggregate('DimDate', 'count'),
+}
+
+# Helper measures that exist only to build the README ones
+_INTERNAL = {name for name in MEASURES if name.endswith((' PM', ' PY', 'Previous Month', 'Previous Year'))} | {
+    'Revenue by Payment (all methods)', 'Patient Paid Amount', 'Room Hours per Day', 'Doctor Hours per Day',
+    'Opening Days'}
+README_MEASURES = [name for name in MEASURES if name not in _INTERNAL]
+
+
+# ---- engine --------------------------------------------------------------------------
+
+class MeasureEngine:
+    """Evaluates ``MEASURES`` over in-memory tables keyed by name (dimensions and facts).
+
+    With a ``cube`` (``clinic_data.cube.BillingCube``), billing sums and
+    counts whose filters and groupings are all cube attributes are read from
+    the cube's cells instead of the fact rows.
+    """
+
+    def __init__(self, tables, measures=None, cache_size=CACHE_SIZE, cube=None):
+        self.tables = tables
+        self.cube = cube
+        self.measures = MEASURES if measures is None else measures
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._arrays = {}
+        _, foreign_keys = documented_keys()
+        self.parents = {}
+        for child, column, parent, parent_column in sorted(foreign_keys):
+            if child in tables and parent in tables:
+                self.parents.setdefault(child, []).append((column, parent, parent_column))
+
+    @classmethod
+    def from_directory(cls, output_dir, **kwargs):
+        """Load the dimensions and facts written to ``output_dir`` (CSV, Parquet or partitioned Parquet)."""
+        tables = {}
+        for name in table_order():
+            if name in FACT_TABLES:
+                tables[name] = pd.concat(iter_table_chunks(output_dir, name), ignore_index=True)
+            elif name.startswith('Dim'):
+                tables[name] = read_table(output_dir, name)
+        return cls(tables, **kwargs)
+
+    # -- public API
+
+    def evaluate(self, measures, group_by=(), filters=None):
+        """One row per group with a column per measure; groups where every measure is blank are dropped."""
+        if isinstance(measures, str):
+            measures = [measures]
+        context = make_context(filters, group_by)
+        result = self.groups(context).copy()
+        for name in measures:
+            result[name] = self.series(name, context).to_numpy()
+        if group_by:
+            result = result[result[list(measures)].notna().any(axis=1)].reset_index(drop=True)
+        return result
+
+    def value(self, measure, filters=None):
+        """A single measure in a filter context without grouping."""
+        value = self.series(measure, make_context(filters)).iloc[0]
+        return None if isinstance(value, float) and np.isnan(value) else value
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    # -- evaluation
+
+    def series(self, name, context):
+        key = (name, context)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        if name not in self.measures:
+            raise KeyError(f'unknown measure {name!r}')
+        value = self.measures[name].evaluate(self, context)
+        self._cache[key] = value
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return value
+
+    def groups(self, context):
+        """The group-by combinations of ``context`` as a DataFrame (one empty row without grouping)."""
+        key = ('__groups__', context)
+        if key in self._cache:
+            return self._cache[key]
+        names = [ref_name(ref) for ref in context.group_by]
+        if not names:
+            groups = pd.DataFrame(index=range(1))
+        else:
+            frames = []
+            for table in self.tables:
+                if all(self._path(table, ref[0]) is not None for ref in context.group_by):
+                    mask = self._mask(table, context.filters)
+                    frame = pd.DataFrame({name: self._select(self.related(table, *ref), mask)
+                                          for name, ref in zip(names, context.group_by)})
+                    frames.append(frame.dropna().drop_duplicates())
+            if frames:
+                groups = pd.concat(frames).drop_duplicates()
+            else:
+                groups = pd.DataFrame(columns=names)
+            groups = groups.sort_values(names).reset_index(drop=True)
+        self._cache[key] = groups
+        return groups
+
+    def aggregate(self, table, how, values, context, column=None):
+        reachable = [ref for ref in context.group_by if self._path(table, ref[0]) is not None]
+        if self.cube is not None and how in ('sum', 'count') and column in self.cube.measures:
+            result = self._from_cube(table, column, reachable, context)
+            if result is not None:
+                return result
+        mask = self._mask(table, context.filters)
+        if how == 'count':
+            data = np.ones(len(self.tables[table]))
+        else:
+            data = np.asarray(values(self), dtype=float)
+        data = self._select(data, mask)
+        if not reachable:
+            if len(data) == 0:
+                total = np.nan
+            else:
+                total = {'sum': np.sum, 'count': len, 'nunique': lambda a: len(np.unique(a)),
+                         'mean': np.mean}[how](data)
+            return pd.Series(np.full(len(self.groups(context)), total, dtype=float))
+        names = [ref_name(ref) for ref in reachable]
+        frame = pd.DataFrame({name: self._select(self.related(table, *ref), mask)
+                              for name, ref in zip(names, reachable)})
+        frame['value'] = data
+        grouped = frame.groupby(names)['value'].agg(how).reset_index()
+        return self._align(grouped, names, context)
+
+    def _from_cube(self, table, column, reachable, context):
+        filters = [(ref, values) for ref, values in context.filters if self._path(table, ref[0]) is not None]
+        if table != 'FactBillingDetail' or not self.cube.covers([ref for ref, _ in filters] + reachable):
+            return None
+        names = [ref_name(ref) for ref in reachable]
+        frame = self.cube.query([column], names, {ref_name(ref): values for ref, values in filters})
+        frame = frame.rename(columns={column: 'value'})
+        if not reachable:
+            total = frame['value'].iloc[0] if len(frame) else np.nan
+            return pd.Series(np.full(len(self.groups(context)), total, dtype=float))
+        return self._align(frame, names, context)
+
+    def broadcast(self, values, inner, outer):
+        """Re-align values computed on ``inner`` (a subset of the groupings) to ``outer``."""
+        names = [ref_name(ref) for ref in inner.group_by]
+        if not names:
+            return pd.Series(np.full(len(self.groups(outer)), values.iloc[0]))
+        frame = self.groups(inner).copy()
+        frame['value'] = values.to_numpy()
+        return self._align(frame, names, outer)
+
+    def time_shift(self, measure, shift, context):
+        date_refs = [ref for ref in context.group_by if ref[0] == 'DimDate']
+        inner = context.without('DimDate')
+        day_ref = ('DimDate', 'DateKey')
+        by_day = Context(inner.filters, inner.group_by + (day_ref,))
+        per_day = self.groups(by_day).copy()
+        per_day['value'] = self.series(measure, by_day).to_numpy()
+        day_name = ref_name(day_ref)
+        other_names = [ref_name(ref) for ref in inner.group_by]
+
+        dim_date = self.tables['DimDate']
+        date_filters = tuple(f for f in context.filters if f[0][0] == 'DimDate')
+        in_context = dim_date[self._mask_or_all('DimDate', date_filters)]
+        date_names = [ref_name(ref) for ref in date_refs]
+        if date_refs:
+            date_groups = in_context.groupby([ref[1] for ref in date_refs])['DateKey']
+        else:
+            date_groups = [((), in_context['DateKey'])]
+
+        pieces = []
+        for values, keys in date_groups:
+            values = values if isinstance(values, tuple) else (values,)
+            shifted = per_day[per_day[day_name].isin(shift_dates(dim_date, keys.to_numpy(), shift))]
+            if other_names:
+                piece = shifted.groupby(other_names)['value'].sum(min_count=1).reset_index()
+            else:
+                piece = pd.DataFrame({'value': [shifted['value'].sum(min_count=1)]})
+            for name, value in zip(date_names, values):
+                piece[name] = value
+            pieces.append(piece)
+        names = other_names + date_names
+        if not pieces:
+            return pd.Series(np.full(len(self.groups(context)), np.nan))
+        return self._align(pd.concat(pieces, ignore_index=True), names, context)
+
+    def dense_rank(self, measure, ref, context):
+        current = self.series(measure, context)
+        # ALL(table[column]) only lifts the ranked column; other columns of its table stay in context
+        keep = [column for table, column in context.group_by + tuple(r for r, _ in context.filters)
+                if table == ref[0] and column != ref[1]]
+        inner = context.without(ref[0], keep)
+        inner = Context(inner.filters, tuple(g for g in inner.group_by if g != ref) + (ref,))
+        table = self.groups(inner).copy()
+        table['value'] = self.series(measure, inner).to_numpy()
+        table = table[table['value'].notna()]
+        others = [ref_name(g) for g in inner.group_by if g != ref]
+
+        if others:
+            lookup = {key if isinstance(key, tuple) else (key,): np.unique(frame['value'].to_numpy())
+                      for key, frame in table.groupby(others)}
+            keys = self.groups(context)[others].itertuples(index=False, name=None)
+        else:
+            lookup = {(): np.unique(table['value'].to_numpy())}
+            keys = [()] * len(current)
+        ranks = np.full(len(current), np.nan)
+        for i, (key, value) in enumerate(zip(keys, current.to_numpy())):
+            if not np.isnan(value):
+                ranks[i] = 1 + np.count_nonzero(lookup.get(key, np.array([])) > value)
+        return pd.Series(ranks)
+
+    # -- relationships and row masks
+
+    def column(self, table, column):
+        return self.tables[table][column].to_numpy()
+
+    def _keys(self, table, column):
+        """Integer key column with missing foreign keys as 0 (keys start at 1)."""
+        key = ('keys', table, column)
+        if key not in self._arrays:
+            self._arrays[key] = self.tables[table][column].fillna(0).to_numpy(dtype=np.int64)
+        return self._arrays[key]
+
+    def _positions(self, table, column):
+        """Dense key -> row position lookup, -1 where a key does not exist."""
+        key = ('positions', table, column)
+        if key not in self._arrays:
+            keys = self._keys(table, column)
+            positions = np.full(keys.max() + 1, -1, dtype=np.int64)
+            positions[keys] = np.arange(len(keys))
+            self._arrays[key] = positions
+        return self._arrays[key]
+
+    def _path(self, table, target):
+        """Relationship hops ``[(column, parent, parent_column), ...]`` from ``table`` to ``target``."""
+        paths, queue = {table: []}, [table]
+        while queue:
+            current = queue.pop(0)
+            if current == target:
+                return paths[current]
+            for hop in self.parents.get(current, ()):
+                if hop[1] not in paths:
+                    paths[hop[1]] = paths[current] + [hop]
+                    queue.append(hop[1])
+        return None
+
+    def _row_positions(self, table, target):
+        """Row of ``target`` related to each row of ``table`` (-1 where the foreign key is blank)."""
+        key = ('rows', table, target)
+        if key not in self._arrays:
+            rows = np.arange(len(self.tables[table]))
+            current = table
+            for column, parent, parent_column in self._path(table, target):
+                keys = np.where(rows >= 0, self._keys(current, column)[np.maximum(rows, 0)], 0)
+                positions = self._positions(parent, parent_column)
+                keys = np.where(keys < len(positions), keys, 0)
+                rows = np.where(rows >= 0, positions[keys], -1)
+                current = parent
+            self._arrays[key] = rows
+        return self._arrays[key]
+
+    def related(self, table, target, column):
+        """RELATED(target[column]) for every row of ``table``; NaN/None where there is no related row."""
+        key = ('related', table, target, column)
+        if key not in self._arrays:
+            values = self.tables[target][column].to_numpy()
+            if table == target:
+                self._arrays[key] = values
+            else:
+                rows = self._row_positions(table, target)
+                related = values[np.maximum(rows, 0)]
+                if (rows < 0).any():
+                    related = pd.Series(related).where(rows >= 0).to_numpy()
+                self._arrays[key] = related
+        return self._arrays[key]
+
+    def _mask(self, table, filters):
+        """Boolean row mask of ``table`` under ``filters``, or None when nothing filters it."""
+        key = ('mask', table, filters)
+        if key in self._cache:
+            return self._cache[key]
+        mask = None
+        for (filter_table, column), values in filters:
+            if filter_table == table:
+                selected = self.tables[table][column].isin(values).to_numpy()
+                mask = selected if mask is None else mask & selected
+        for column, parent, parent_column in self.parents.get(table, ()):
+            # Filters on shared dimensions reach the billing rows directly, not also through their visit
+            # (two active paths would be ambiguous), so only the visit's own columns filter along VisitID
+            parent_filters = tuple(f for f in filters if f[0][0] == parent) if parent in FACT_TABLES else filters
+            parent_mask = self._mask(parent, parent_filters)
+            if parent_mask is not None:
+                allowed = np.zeros(self._positions(parent, parent_column).shape[0], dtype=bool)
+                allowed[self._keys(parent, parent_column)[parent_mask]] = True
+                keys = self._keys(table, column)
+                selected = allowed[np.where(keys < len(allowed), keys, 0)]
+                mask = selected if mask is None else mask & selected
+        self._cache[key] = mask
+        return mask
+
+    def _mask_or_all(self, table, filters):
+        mask = self._mask(table, filters)
+        return np.ones(len(self.tables[table]), dtype=bool) if mask is None else mask
+
+    @staticmethod
+    def _select(values, mask):
+        return values if mask is None else values[mask]
+
+    def _align(self, frame, names, context):
+        """Values of ``frame`` (group columns ``names`` + 'value') in the row order of ``groups(context)``."""
+        groups = self.groups(context)
+        if not len(groups.columns):
+            return pd.Series(frame['value'].to_numpy()[:1] if len(frame) else [np.nan])
+        merged = groups[names].merge(frame[names + ['value']], on=names, how='left')
+        return pd.Series(merged['value'].to_numpy())
+
+
+def shift_dates(dim_date, date_keys, shift):
+    """DateKeys of DATEADD(-1, MONTH|YEAR) or PREVIOUSMONTH/PREVIOUSYEAR applied to ``date_keys``.
+
+    DATEADD moves whole months in the set to whole months and other days to
+    the same day (clamped to month end); the result only holds dates that
+    exist in DimDate.
+    """
+    if len(date_keys) == 0:
+        return np.array([], dtype=np.int64)
+    days = dim_date[dim_date['DateKey'].isin(date_keys)]
+    year_month = dim_date['YearMonth']
+    if shift == 'previous_month':
+        first = days['YearMonth'].min()
+        previous = first - 1 if first % 100 > 1 else first - 89
+        return dim_date.loc[year_month == previous, 'DateKey'].to_numpy()
+    if shift == 'previous_year':
+        return dim_date.loc[dim_date['Year'] == days['Year'].max() - 1, 'DateKey'].to_numpy()
+
+    per_month = days.groupby('YearMonth')['DateKey'].transform('size')
+    whole = per_month == days['DaysInMonth']
+    months = days.loc[whole, 'YearMonth'].unique()
+    if shift == 'month':
+        shifted_months = np.where(months % 100 > 1, months - 1, months - 89)
+        shifted_days = days.loc[~whole, 'PrevMonthDateKey']
+    else:
+        shifted_months = months - 100
+        shifted_days = days.loc[~whole, 'PrevYearDateKey']
+    shifted = np.union1d(dim_date.loc[year_month.isin(shifted_months), 'DateKey'].to_numpy(),
+                         shifted_days.to_numpy())
+    return shifted[np.isin(shifted, dim_date['DateKey'].to_numpy())]
@@ -0,0 +1,729 @@
+"""A local OData v4 feed of the generated tables and the README measures.
+
+``python 2.py serve --output-dir <dir>`` loads the output into memory and
+serves it over HTTP on localhost, so Power BI's OData feed connector (or a
+load generator) can query it the way DirectQuery would, without any cloud
+service:
+
+- ``/`` is the service document and ``/$metadata`` the CSDL schema, with
+  the keys of the data dictionary.
+- ``/<Table>`` accepts ``$filter``, ``$select``, ``$orderby``, ``$top``,
+  ``$skip`` and ``$count``; ``/<Table>/$count`` returns the row count.
+- ``/Measures`` evaluates the README measures with ``MeasureEngine``:
+  ``$select`` picks measures (spaces and ``%`` spelled ``_`` and ``Pct``),
+  ``$filter`` sets the filter context with ``Table/Column`` comparisons
+  joined by ``and``, and ``$apply=groupby((Table/Column,...))`` groups.
+
+Filters are pushed down to ``TableStore``: a comparison on a numeric, date
+or category column is answered from a sorted index of that column, built
+on first use, and the other terms of an ``and`` are only tested on the
+rows it selected. Responses are paged at ``page_size`` rows (or the
+client's ``Prefer: odata.maxpagesize``) with an ``@odata.nextLink``,
+gzip-compressed when the client accepts it, and kept in an LRU cache
+bounded in bytes together with the selected rows of each filter, so the
+next page of a query does not filter again.
+
+Requests are parsed on the asyncio event loop; queries run on its default
+thread pool, so slow queries do not hold up the other connections.
+"""
+import asyncio
+import json
+import operator
+import os
+import re
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from clinic_data.aggregates import AGGREGATES
+from clinic_data.cube import BillingCube
+from clinic_data.generator import FACT_TABLES
+from clinic_data.measures import README_MEASURES, SUM_DECIMALS, MeasureEngine
+from clinic_data.warehouse import documented_keys, table_order
+from clinic_data.writers import MONEY_COLUMNS, compress, iter_table_chunks, read_table, table_exists
+
+PAGE_SIZE = 5_000
+CACHE_BYTES = 256 << 20
+# Smaller bodies are sent uncompressed
+GZIP_MIN_BYTES = 1_024
+NAMESPACE = 'Clinic'
+MEASURES_SET = 'Measures'
+JSON = 'application/json;odata.metadata=minimal;charset=utf-8'
+XML = 'application/xml;charset=utf-8'
+TEXT = 'text/plain;charset=utf-8'
+QUERY_OPTIONS = {'$filter', '$select', '$orderby', '$top', '$skip', '$count', '$format', '$apply'}
+
+_OPERATORS = {'eq': operator.eq, 'ne': operator.ne, 'gt': operator.gt, 'ge': operator.ge,
+              'lt': operator.lt, 'le': operator.le}
+_FUNCTIONS = {'contains', 'startswith', 'endswith'}
+# Comparisons a sorted index answers with two binary searches
+_SEEKABLE = {'eq', 'gt', 'ge', 'lt', 'le', 'in'}
+
+_TOKEN = re.compile(r"""\s*(?:
+    (?P<string>'(?:[^']|'')*')
+  | (?P<datetime>\d{4}-\d{2}-\d{2}T[\d:.]+Z?)
+  | (?P<date>\d{4}-\d{2}-\d{2})
+  | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_][\w/]*)
+  | (?P<punct>[(),])
+)""", re.VERBOSE)
+
+
+# ---- $filter ---------------------------------------------------------------------------
+
+def _tokens(text):
+    position, tokens = 0, []
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match:
+            raise ValueError(f'$filter: unexpected {text[position:position + 20]!r}')
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'string':
+            value = value[1:-1].replace("''", "'")
+        elif kind == 'number':
+            value = float(value) if any(c in value for c in '.eE') else int(value)
+        elif kind in ('date', 'datetime'):
+            value = np.datetime64(value.rstrip('Z'))
+        elif kind == 'name' and value in ('true', 'false', 'null'):
+            kind, value = 'literal', {'true': True, 'false': False, 'null': None}[value]
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive descent over ``or`` / ``and`` / ``not``, comparisons, ``in`` lists and string functions.
+
+    Produces ``('or', [terms])``, ``('and', [terms])``, ``('not', term)`` and
+    leaves ``(op, column, value)``, where ``op`` is a comparison, ``in`` (a
+    list of values) or a string function.
+    """
+
+    def __init__(self, text):
+        self.tokens = _tokens(text)
+        self.position = 0
+
+    def parse(self):
+        node = self._or()
+        if self.position < len(self.tokens):
+            raise ValueError(f'$filter: unexpected {self.tokens[self.position][1]!r}')
+        return node
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, 'the end')
+
+    def _next(self, kind=None, value=None):
+        token = self._peek()
+        if token[0] is None or (kind and token[0] != kind) or (value is not None and token[1] != value):
+            raise ValueError(f"$filter: expected {value or kind}, got {token[1]!r}" if token[0] else
+                             f"$filter: expected {value or kind} at the end")
+        self.position += 1
+        return token[1]
+
+    def _keyword(self, word):
+        if self._peek() == ('name', word):
+            self.position += 1
+            return True
+        return False
+
+    def _or(self):
+        terms = [self._and()]
+        while self._keyword('or'):
+            terms.append(self._and())
+        return terms[0] if len(terms) == 1 else ('or', terms)
+
+    def _and(self):
+        terms = [self._not()]
+        while self._keyword('and'):
+            terms.append(self._not())
+        return terms[0] if len(terms) == 1 else ('and', terms)
+
+    def _not(self):
+        if self._keyword('not'):
+            return 'not', self._not()
+        if self._peek() == ('punct', '('):
+            self.position += 1
+            node = self._or()
+            self._next('punct', ')')
+            return node
+        return self._leaf()
+
+    def _literal(self):
+        kind, value = self._peek()
+        if kind not in ('string', 'number', 'date', 'datetime', 'literal'):
+            raise ValueError(f'$filter: expected a literal, got {value!r}' if kind else
+                             '$filter: expected a literal at the end')
+        self.position += 1
+        return value
+
+    def _leaf(self):
+        name = self._next('name')
+        if name in _FUNCTIONS:
+            self._next('punct', '(')
+            column = self._next('name')
+            self._next('punct', ',')
+            value = self._literal()
+            self._next('punct', ')')
+            return name, column, value
+        op = self._next('name')
+        if op == 'in':
+            self._next('punct', '(')
+            values = [self._literal()]
+            while self._peek() == ('punct', ','):
+                self.position += 1
+                values.append(self._literal())
+            self._next('punct', ')')
+            return 'in', name, values
+        if op not in _OPERATORS:
+            raise ValueError(f'$filter: unsupported operator {op!r}')
+        return op, name, self._literal()
+
+
+def parse_filter(text):
+    """Parse an OData ``$filter`` expression into the tuples of ``_Parser``."""
+    return _Parser(text).parse()
+
+
+def _coerce(series, value):
+    """A ``$filter`` literal as a value comparable with ``series``."""
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return [_coerce(series, item) for item in value]
+    kind = series.cat.categories.dtype.kind if isinstance(series.dtype, pd.CategoricalDtype) else series.dtype.kind
+    if kind == 'M':
+        if not isinstance(value, (str, np.datetime64)):
+            raise ValueError(f'{series.name} is a date; got {value!r}')
+        try:
+            return np.datetime64(value)
+        except ValueError:
+            raise ValueError(f'{series.name} is a date; got {value!r}') from None
+    if kind == 'b':
+        if not isinstance(value, bool):
+            raise ValueError(f'{series.name} is a boolean; got {value!r}')
+        return value
+    if kind in 'iuf':
+        # bool is an int subclass, but true/false are not numbers in OData
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            raise ValueError(f'{series.name} is a number; got {value!r}')
+        return value
+    if not isinstance(value, str):
+        raise ValueError(f"{series.name} is text; quote the value as '{value}'")
+    return value
+
+
+def test(series, op, value):
+    """Boolean array of ``series op value`` with OData null semantics.
+
+    ``eq null`` finds the missing values; any other comparison with a
+    missing value is false, except ``ne``. A categorical column is tested
+    on its categories and the result mapped through the codes.
+    """
+    if op in _FUNCTIONS and not isinstance(value, str):
+        raise ValueError(f"{op} takes a quoted text value; got {value!r}")
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        null = value is None and op == 'eq' or value is not None and op == 'ne'
+        hits = np.append(test(pd.Series(series.cat.categories, name=series.name), op, value), null)
+        return hits[series.cat.codes.to_numpy()]
+    value = _coerce(series, value)
+    if op == 'in':
+        return series.isin(value).to_numpy(dtype=bool, na_value=False)
+    if value is None:
+        if op not in ('eq', 'ne'):
+            return np.zeros(len(series), dtype=bool)
+        return series.isna().to_numpy() == (op == 'eq')
+    if op in _FUNCTIONS:
+        return getattr(series.astype('str').str, op)(value).to_numpy(dtype=bool, na_value=False)
+    return _OPERATORS[op](series, value).to_numpy(dtype=bool, na_value=op == 'ne')
+
+
+# ---- store -----------------------------------------------------------------------------
+
+class TableStore:
+    """Tables held in memory, filtered through sorted column indexes built on first use."""
+
+    def __init__(self, tables):
+        self.tables = tables
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_directory(cls, output_dir):
+        """Every table written to ``output_dir`` (CSV, Parquet or partitioned Parquet)."""
+        tables = {}
+        for name in table_order():
+            partitioned = os.path.isdir(os.path.join(output_dir, name))
+            if name in FACT_TABLES and (table_exists(output_dir, name) or partitioned):
+                tables[name] = pd.concat(iter_table_chunks(output_dir, name), ignore_index=True)
+            elif table_exists(output_dir, name):
+                tables[name] = read_table(output_dir, name)
+        if not tables:
+            raise ValueError(f'no generated tables found in {output_dir}')
+        return cls(tables)
+
+    def column(self, table, column):
+        if column not in self.tables[table].columns:
+            raise ValueError(f'{table} has no column {column!r}')
+        return self.tables[table][column]
+
+    def index(self, table, column):
+        """``(order, sorted_values, missing)``: the row order sorting the column and its count of missing values.
+
+        A category column is indexed on its codes.
+        """
+        key = (table, column)
+        with self._lock:
+            if key not in self._indexes:
+                series = self.column(table, column)
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    values = series.cat.codes.to_numpy()
+                else:
+                    values = series.to_numpy(dtype=float, na_value=np.nan) if series.hasnans else series.to_numpy()
+                # Missing codes (-1) sort first, NaN and NaT last
+                order = np.argsort(values, kind='stable')
+                self._indexes[key] = order, values[order], int(series.isna().sum())
+            return self._indexes[key]
+
+    def seekable(self, table, node):
+        """Whether a leaf can be answered from an index."""
+        op, column, value = node if len(node) == 3 else (node[0], None, None)
+        if op not in _SEEKABLE or value is None or column not in self.tables[table].columns:
+            return False
+        series = self.tables[table][column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return op in ('eq', 'in')
+        return series.dtype.kind in 'iufMb'
+
+    def _ranges(self, table, node):
+        op, column, value = node
+        series = self.column(table, column)
+        order, values, missing = self.index(table, column)
+        categorical = isinstance(series.dtype, pd.CategoricalDtype)
+        if categorical:
+            # Codes of the wanted categories; a category that does not exist matches nothing
+            wanted = value if op == 'in' else [value]
+            codes = series.cat.categories.get_indexer(_coerce(series, wanted))
+            return order, [(np.searchsorted(values, code), np.searchsorted(values, code, side='right'))
+                           for code in codes if code >= 0]
+        value = _coerce(series, value)
+        if values.dtype.kind == 'M':
+            value = np.array(value).astype(values.dtype) if op != 'in' else \
+                [np.array(item).astype(values.dtype) for item in value]
+        # Missing values are at the end of a float or date index and at the start of a code index
+        first, last = (0, len(values) - missing) if values.dtype.kind in 'fM' else (missing, len(values))
+        if op == 'in':
+            return order, [(np.searchsorted(values, item), np.searchsorted(values, item, side='right'))
+                           for item in value if item is not None]
+        left, right = np.searchsorted(values, value), np.searchsorted(values, value, side='right')
+        return order, [{'eq': (left, right), 'lt': (first, left), 'le': (first, right),
+                        'gt': (right, last), 'ge': (left, last)}[op]]
+
+    def estimate(self, table, node):
+        """Rows an indexed leaf selects, from the index alone."""
+        _, ranges = self._ranges(table, node)
+        return sum(max(stop - start, 0) for start, stop in ranges)
+
+    def seek(self, table, node):
+        order, ranges = self._ranges(table, node)
+        parts = [order[start:stop] for start, stop in ranges if stop > start]
+        return np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+
+    def select(self, table, node, rows=None):
+        """Sorted positions of the rows of ``table`` (out of ``rows``, if given) that match ``node``."""
+        kind = node[0]
+        if kind == 'and':
+            terms = list(node[1])
+            if rows is None:
+                # The most selective indexed term narrows the rows the others are tested on
+                seekable = [term for term in terms if self.seekable(table, term)]
+                if seekable:
+                    first = min(seekable, key=lambda term: self.estimate(table, term))
+                    terms.remove(first)
+                    rows = self.seek(table, first)
+            for term in terms:
+                rows = self.select(table, term, rows)
+            return rows
+        if kind == 'or':
+            return np.unique(np.concatenate([self.select(table, term, rows) for term in node[1]]))
+        if kind == 'not':
+            everything = np.arange(len(self.tables[table])) if rows is None else rows
+            return np.setdiff1d(everything, self.select(table, node[1], rows), assume_unique=True)
+        op, column, value = node
+        if rows is None and self.seekable(table, node):
+            return self.seek(table, node)
+        series = self.column(table, column)
+        if rows is None:
+            return np.flatnonzero(test(series, op, value))
+        return rows[test(series.iloc[rows], op, value)]
+
+
+# ---- responses -------------------------------------------------------------------------
+
+class ResultCache:
+    """LRU cache of query results, bounded by their total size in bytes."""
+
+    def __init__(self, max_bytes=CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key][0]
+            self.misses += 1
+            return None
+
+    def put(self, key, value, size):
+        with self._lock:
+            if size > self.max_bytes:
+                return
+            if key in self._items:
+                self.size -= self._items.pop(key)[1]
+            self._items[key] = value, size
+            self.size += size
+            while self.size > self.max_bytes:
+                self.size -= self._items.popitem(last=False)[1][1]
+
+
+def measure_property(name):
+    """JSON property name of a measure: ``'Profit Margin %'`` -> ``'Profit_Margin_Pct'``."""
+    return re.sub(r'\W+', '_', name.replace('%', 'Pct')).strip('_')
+
+
+def _edm_type(column, series):
+    """The ``Type`` attribute of a property, with the decimal facets for money."""
+    dtype = series.cat.categories.dtype if isinstance(series.dtype, pd.CategoricalDtype) else series.dtype
+    if column in MONEY_COLUMNS:
+        return 'Edm.Decimal" Precision="14" Scale="2'
+    if dtype.kind == 'M':
+        return 'Edm.Date'
+    if dtype.kind == 'b':
+        return 'Edm.Boolean'
+    if dtype.kind in 'iu':
+        return {1: 'Edm.Int16', 2: 'Edm.Int16', 4: 'Edm.Int32'}.get(dtype.itemsize, 'Edm.Int64')
+    if dtype.kind == 'f':
+        return 'Edm.Double'
+    return 'Edm.String'
+
+
+def _keys(name):
+    primary_keys, _ = documented_keys()
+    if name in primary_keys:
+        return [primary_keys[name]]
+    for aggregate in (aggregate for aggregates in AGGREGATES.values() for aggregate in aggregates):
+        if aggregate.name == name:
+            return aggregate.key_columns
+    return []
+
+
+def _records(frame):
+    """A page as a JSON array of objects; dates are written as OData ``Edm.Date`` strings."""
+    dates = [column for column, dtype in frame.dtypes.items() if dtype.kind == 'M']
+    singles = [column for column, dtype in frame.dtypes.items() if dtype == np.float32]
+    if dates or singles:
+        # float32 goes through its shortest text so 65.63 is not written as 65.629997
+        frame = frame.assign(**{column: frame[column].dt.strftime('%Y-%m-%d') for column in dates},
+                             **{column: frame[column].astype(str).astype(float) for column in singles})
+    # Measures are summed to SUM_DECIMALS, which also hides binary fractions such as 0.7400000021
+    return frame.to_json(orient='records', force_ascii=False, double_precision=SUM_DECIMALS)
+
+
+class ODataFeed:
+    """Answers OData requests over a ``TableStore``; ``respond()`` is independent of the HTTP transport."""
+
+    def __init__(self, store, page_size=PAGE_SIZE, cache_bytes=CACHE_BYTES, cube=True):
+        self.store = store
+        self.page_size = page_size
+        self.cache = ResultCache(cache_bytes)
+        self.requests = 0
+        self._cube = cube
+        self._engine = None
+        self._metadata = None
+        self._lock = threading.Lock()
+
+    @property
+    def engine(self):
+        """The ``MeasureEngine`` over the dimension and fact tables, built on the first measure request."""
+        if self._engine is None:
+            tables = {name: table for name, table in self.store.tables.items() if name.startswith(('Dim', 'Fact'))}
+            cube = BillingCube.from_tables(tables) if self._cube and 'FactBillingDetail' in tables else None
+            self._engine = MeasureEngine(tables, cube=cube)
+        return self._engine
+
+    def respond(self, method, target, headers, base):
+        """``(status, content_type, body, extra_headers)`` for one request; ``base`` is the service root URL."""
+        self.requests += 1
+        if method not in ('GET', 'HEAD'):
+            return self._error(405, f'{method} is not supported; the feed is read-only')
+        url = urlsplit(target)
+        path = url.path.strip('/')
+        params = dict(parse_qsl(url.query, keep_blank_values=True))
+        page_size = self.page_size
+        match = re.search(r'odata\.maxpagesize=(\d+)', headers.get('prefer', ''))
+        if match:
+            page_size = max(min(int(match.group(1)), self.page_size), 1)
+        accepts_gzip = 'gzip' in headers.get('accept-encoding', '')
+        key = ('response', base, path, tuple(sorted(params.items())), page_size, accepts_gzip)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        try:
+            status, content_type, body = self._route(path, params, page_size, base)
+        except (ValueError, TypeError, ArithmeticError) as e:
+            # A query the parser accepted can still fail on the column's dtype; it is the client's error
+            return self._error(400, str(e))
+        except LookupError as e:
+            return self._error(404, e.args[0])
+        except Exception as e:
+            return self._error(500, f'{type(e).__name__}: {e}')
+        extra = {'Preference-Applied': f'odata.maxpagesize={page_size}'} if match else {}
+        if accepts_gzip and len(body) >= GZIP_MIN_BYTES:
+            body = compress(body, 'gzip')
+            extra['Content-Encoding'] = 'gzip'
+        response = status, content_type, body, extra
+        self.cache.put(key, response, len(body))
+        return response
+
+    @staticmethod
+    def _error(status, message):
+        body = json.dumps({'error': {'code': str(status), 'message': message}}).encode('utf-8')
+        return status, JSON, body, {}
+
+    def _route(self, path, params, page_size, base):
+        unknown = {name for name in params if name.startswith('$')} - QUERY_OPTIONS
+        if unknown:
+            raise ValueError(f"unsupported query option {', '.join(sorted(unknown))}")
+        if path == '':
+            sets = [*self.store.tables, MEASURES_SET]
+            return 200, JSON, json.dumps({
+                '@odata.context': f'{base}/$metadata',
+                'value': [{'name': name, 'kind': 'EntitySet', 'url': name} for name in sets],
+            }).encode('utf-8')
+        if path == '$metadata':
+            return 200, XML, self.metadata()
+        name, _, tail = path.partition('/')
+        if name == MEASURES_SET and not tail:
+            result = self._measures(params)
+            rows = _ordered(result, None, params['$orderby']) if params.get('$orderby', '').strip() else None
+            return 200, JSON, self._page(name, result, rows, params, page_size, base)
+        if name not in self.store.tables or tail not in ('', '$count'):
+            raise LookupError(f'no entity set {path!r}')
+        if '$apply' in params:
+            raise ValueError('$apply is only supported on Measures')
+        rows = self._rows(name, params)
+        if tail == '$count':
+            count = len(self.store.tables[name]) if rows is None else len(rows)
+            return 200, TEXT, str(count).encode('utf-8')
+        return 200, JSON, self._page(name, self.store.tables[name], rows, params, page_size, base)
+
+    def _rows(self, name, params):
+        """Positions selected by ``$filter`` and sorted by ``$orderby``, cached per table and options; None is all."""
+        text, order_by = params.get('$filter', '').strip(), params.get('$orderby', '').strip()
+        if not text and not order_by:
+            return None
+        key = ('rows', name, text, order_by)
+        rows = self.cache.get(key)
+        if rows is None:
+            rows = self.store.select(name, parse_filter(text)) if text else None
+            if order_by:
+                rows = _ordered(self.store.tables[name], rows, order_by)
+            self.cache.put(key, rows, rows.nbytes)
+        return rows
+
+    def _measures(self, params):
+        properties = {measure_property(name): name for name in README_MEASURES}
+        selected = [name.strip() for name in params.get('$select', '').split(',') if name.strip()]
+        unknown = [name for name in selected if name not in properties]
+        if unknown:
+            raise ValueError(f"unknown measure {', '.join(unknown)}; see $metadata for the Measures properties")
+        measures = [properties[name] for name in selected] or README_MEASURES
+        group_by = []
+        apply = params.get('$apply', '').strip()
+        if apply:
+            match = re.fullmatch(r'groupby\(\(([\w/,\s]+)\)\)', apply)
+            if not match:
+                raise ValueError('$apply supports groupby((Table/Column,...))')
+            group_by = [self._reference(path.strip()) for path in match.group(1).split(',')]
+        filters = self._context(parse_filter(params['$filter'])) if params.get('$filter', '').strip() else {}
+        with self._lock:
+            result = self.engine.evaluate(measures, group_by, filters)
+        return result.rename(columns=lambda column: column.replace('[', '_').rstrip(']') if '[' in column
+                             else measure_property(column))
+
+    def _reference(self, path):
+        table, _, column = path.partition('/')
+        if table not in self.store.tables or not column:
+            raise ValueError(f'measure filters and groupings name Table/Column, got {path!r}')
+        self.store.column(table, column)
+        return f'{table}[{column}]'
+
+    def _context(self, node):
+        """A ``MeasureEngine`` filter context from ``Table/Column`` comparisons joined with ``and``."""
+        terms = node[1] if node[0] == 'and' else [node]
+        filters = {}
+        for term in terms:
+            if term[0] in ('and', 'or', 'not'):
+                raise ValueError('Measures filters are Table/Column comparisons joined with and')
+            op, path, value = term
+            reference = self._reference(path)
+            table, column = reference[:-1].split('[')
+            values = self.store.column(table, column).drop_duplicates()
+            matching = set(values[test(values, op, value)].dropna())
+            filters[reference] = filters[reference] & matching if reference in filters else matching
+        return filters
+
+    def _page(self, name, table, rows, params, page_size, base):
+        total = len(table) if rows is None else len(rows)
+        skip, top = _count_option(params, '$skip', 0), _count_option(params, '$top', None)
+        stop = total if top is None else min(total, skip + top)
+        end = min(stop, skip + page_size)
+        positions = slice(skip, max(end, skip)) if rows is None else rows[skip:max(end, skip)]
+        page = table.iloc[positions]
+        selected = [column.strip() for column in params.get('$select', '').split(',') if column.strip()]
+        if selected and name != MEASURES_SET:
+            missing = [column for column in selected if column not in table.columns]
+            if missing:
+                raise ValueError(f"{name} has no column {', '.join(missing)}")
+            page = page[selected]
+        parts = [f'{{"@odata.context":{json.dumps(f"{base}/$metadata#{name}")}']
+        if params.get('$count') == 'true':
+            parts.append(f'"@odata.count":{total}')
+        parts.append(f'"value":{_records(page)}')
+        if end < stop:
+            following = {**params, '$skip': str(end)}
+            if top is not None:
+                following['$top'] = str(stop - end)
+            query = urlencode(following, quote_via=quote, safe="$,()/'")
+            link = f'{base}/{name}?{query}'
+            parts.append(f'"@odata.nextLink":{json.dumps(link)}')
+        return (','.join(parts) + '}').encode('utf-8')
+
+    def metadata(self):
+        """The CSDL document describing every entity set, built once."""
+        if self._metadata is None:
+            lines = ['<?xml version="1.0" encoding="utf-8"?>',
+                     '<edmx:Edmx Version="4.0" xmlns:edmx="http://docs.oasis-open.org/odata/ns/edmx">',
+                     '<edmx:DataServices>',
+                     f'<Schema Namespace="{NAMESPACE}" xmlns="http://docs.oasis-open.org/odata/ns/edm">']
+            for name, table in self.store.tables.items():
+                keys = [key for key in _keys(name) if key in table.columns] or list(table.columns[:1])
+                lines.append(f'<EntityType Name="{name}"><Key>'
+                             + ''.join(f'<PropertyRef Name="{key}"/>' for key in keys) + '</Key>')
+                for column in table.columns:
+                    nullable = ' Nullable="false"' if column in keys else ''
+                    lines.append(f'<Property Name="{column}" Type="{_edm_type(column, table[column])}"{nullable}/>')
+                lines.append('</EntityType>')
+            lines.append(self._measures_type())
+            lines.append(f'<EntityContainer Name="{NAMESPACE}">')
+            for name in [*self.store.tables, MEASURES_SET]:
+                lines.append(f'<EntitySet Name="{name}" EntityType="{NAMESPACE}.{name}"/>')
+            lines += ['</EntityContainer>', '</Schema>', '</edmx:DataServices>', '</edmx:Edmx>']
+            self._metadata = '\n'.join(lines).encode('utf-8')
+        return self._metadata
+
+    def _measures_type(self):
+        """Measures as an open type: one property per README measure, plus the grouping columns of a request."""
+        with self._lock:
+            totals = self.engine.evaluate(README_MEASURES)
+        lines = [f'<EntityType Name="{MEASURES_SET}" OpenType="true">']
+        for name in README_MEASURES:
+            edm = 'Edm.Double' if totals[name].dtype.kind in 'iuf' else 'Edm.String'
+            lines.append(f'<Property Name="{measure_property(name)}" Type="{edm}"/>')
+        lines.append('</EntityType>')
+        return '\n'.join(lines)
+
+
+def _count_option(params, name, default):
+    if name not in params:
+        return default
+    value = params[name]
+    if not value.isdigit():
+        raise ValueError(f'{name} must be a non-negative integer, got {value!r}')
+    return int(value)
+
+
+def _ordered(table, rows, order_by):
+    """``rows`` (None = all) in ``$orderby`` order; ties keep table order."""
+    columns, ascending = [], []
+    for item in order_by.split(','):
+        column, _, direction = item.strip().partition(' ')
+        if column not in table.columns or direction.strip() not in ('', 'asc', 'desc'):
+            raise ValueError(f'$orderby: cannot order by {item.strip()!r}')
+        columns.append(column)
+        ascending.append(direction.strip() != 'desc')
+    frame = table[columns] if rows is None else table[columns].iloc[rows]
+    order = frame.reset_index(drop=True).sort_values(columns, ascending=ascending, kind='stable').index.to_numpy()
+    return order if rows is None else rows[order]
+
+
+# ---- HTTP ------------------------------------------------------------------------------
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+class FeedServer:
+    """HTTP/1.1 with keep-alive over ``asyncio.start_server``, answering from an ``ODataFeed``."""
+
+    def __init__(self, feed, host='127.0.0.1', port=8000):
+        self.feed = feed
+        self.host = host
+        self.port = port
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def _connection(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                parts = line.decode('latin-1').split()
+                if len(parts) != 3:
+                    break
+                method, target, version = parts
+                headers = {}
+                while (header := await reader.readline()).strip():
+                    name, _, value = header.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                if headers.get('content-length', '0').isdigit() and int(headers.get('content-length', '0')):
+                    await reader.readexactly(int(headers['content-length']))
+                base = f"http://{headers.get('host', f'{self.host}:{self.port}')}"
+                status, content_type, body, extra = await loop.run_in_executor(
+                    None, self.feed.respond, method, target, headers, base)
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                head = [f'HTTP/1.1 {status} {_REASONS.get(status, "Error")}', f'Content-Type: {content_type}',
+                        f'Content-Length: {len(body)}', 'OData-Version: 4.0', 'Vary: Accept-Encoding',
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+                        *(f'{name}: {value}' for name, value in extra.items())]
+                writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+                if method != 'HEAD':
+                    writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
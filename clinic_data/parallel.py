@@ -0,0 +1,196 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from clinic_data.generator import FACT_TABLES, build_fact_chunk, fact_chunks, iter_fact_chunks
+from clinic_data.writers import write_chunks
+
+# Per-process state set once by the pool initializer instead of being pickled with every task
+_worker = {}
+
+
+def _init_worker(config, dims):
+    _worker['config'] = config
+    _worker['dims'] = dims
+
+
+def _encode(chunk, encoders):
+    return len(chunk), [function(chunk, *args) for function, args in encoders]
+
+
+def _build_and_encode(name, first_id, num_rows, encoders):
+    return _encode(build_fact_chunk(name, _worker['config'], _worker['dims'], first_id, num_rows), encoders)
+
+
+class WritePipeline:
+    """Encodes, compresses and writes chunks on a pool of threads while the caller produces the next ones.
+
+    ``put()`` queues a callable returning ``(rows, payloads)`` for a list of
+    writers. Threads take items in order and run the callables in parallel,
+    then call ``write_encoded`` one item at a time in the order they were
+    queued, so every file is appended exactly as if written serially and
+    writers that share a connection are never used concurrently. The queue
+    holds at most ``depth`` items: when the writers fall behind, ``put()``
+    blocks the producer (backpressure), which keeps memory bounded by
+    ``depth + threads`` chunks.
+    """
+
+    def __init__(self, threads=2, depth=None):
+        self.depth = depth or 2 * threads
+        self.stats = PipelineStats()
+        self._queue = queue.Queue(self.depth)
+        self._queued = 0
+        self._turn = 0
+        self._done = threading.Condition()
+        self._error = None
+        self._start = time.perf_counter()
+        self._threads = [threading.Thread(target=self._run, daemon=True) for _ in range(threads)]
+        for thread in self._threads:
+            thread.start()
+
+    def put(self, writers, encode):
+        if self._error is not None:
+            raise self._error
+        start = time.perf_counter()
+        self._queue.put((self._queued, writers, encode))
+        self.stats.stalled += time.perf_counter() - start
+        self._queued += 1
+
+    def _run(self):
+        while (item := self._queue.get()) is not None:
+            sequence, writers, encode = item
+            start = time.perf_counter()
+            result = error = None
+            if self._error is None:
+                try:
+                    result = encode()
+                except BaseException as e:
+                    error = e
+            encoded = time.perf_counter()
+            with self._done:
+                self._done.wait_for(lambda: self._turn == sequence)
+                try:
+                    if result is not None and self._error is None:
+                        rows, payloads = result
+                        for writer, payload in zip(writers, payloads):
+                            writer.write_encoded(payload, rows)
+                        self.stats.rows += rows
+                except BaseException as e:
+                    error = e
+                if error is not None and self._error is None:
+                    self._error = error
+                self.stats.encoding += encoded - start
+                self.stats.writing += time.perf_counter() - encoded
+                self._turn += 1
+                self._done.notify_all()
+
+    def close(self):
+        """Wait for every queued item to be written; re-raises the first error of a thread."""
+        if not self._threads:
+            return
+        start = time.perf_counter()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.stats.draining = time.perf_counter() - start
+        self.stats.wall = time.perf_counter() - self._start
+        if self._error is not None:
+            raise self._error
+
+
+class PipelineStats:
+    """Where the time of a pipelined write went.
+
+    ``encoding`` and ``writing`` are summed over the writer threads; what
+    they overlap with generation is the time a serial run would have taken
+    beyond the elapsed wall time.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.wall = 0.0
+        self.stalled = 0.0  # producer blocked on a full queue
+        self.draining = 0.0  # producer done, waiting for the last chunks to be written
+        self.encoding = 0.0
+        self.writing = 0.0
+
+    @property
+    def generating(self):
+        return self.wall - self.stalled - self.draining
+
+    def overlap(self):
+        """Share of the encode/write time hidden behind generation."""
+        background = self.encoding + self.writing
+        if background <= 0:
+            return 0.0
+        return min(max(self.generating + background - self.wall, 0.0) / background, 1.0)
+
+    def summary(self):
+        return (f"{self.rows:,} rows in {self.wall:.1f} s ({self.rows / max(self.wall, 1e-9):,.0f} rows/s) | "
+                f"generate {self.generating:.1f} s, encode {self.encoding:.1f} s, write {self.writing:.1f} s, "
+                f"waiting on writers {self.stalled:.1f} s | {self.overlap():.0%} of encode/write overlapped")
+
+
+def resolve_workers(workers):
+    """``0`` means one worker per CPU."""
+    return (os.cpu_count() or 1) if workers == 0 else workers
+
+
+def write_fact_tables(config, dims, writers_by_table, workers=1, writer_threads=2):
+    """Generate and write every fact table in ``writers_by_table``; returns rows written per table.
+
+    Chunks go through a ``WritePipeline``: while this process generates the
+    next chunk, ``writer_threads`` threads encode, compress and append the
+    previous ones. With ``workers > 1`` the chunks of all fact tables are
+    built and encoded in one process pool instead, and the threads only
+    append the payloads. Rows come from fixed RNG blocks (see
+    ``build_fact_chunk``) and are written in chunk order, so the files are
+    byte-identical for any worker and thread count; uncompressed, also for
+    any chunk size. ``writer_threads=0`` writes each chunk in this process
+    before generating the next.
+    """
+    workers = resolve_workers(workers)
+    if workers <= 1 and writer_threads <= 0:
+        row_counts = {}
+        for name, writers in writers_by_table.items():
+            print(f"{FACT_TABLES[name].label} (chunks of {config.chunk_size:,} rows)")
+            row_counts[name] = write_chunks(iter_fact_chunks(name, config, dims), writers)
+        return row_counts
+
+    row_counts = dict.fromkeys(writers_by_table, 0)
+    pipeline = WritePipeline(max(writer_threads, 1), 2 * max(workers, writer_threads, 1))
+    try:
+        if workers <= 1:
+            print(f"✍️ Writing on {writer_threads} threads while generating")
+            for name, writers in writers_by_table.items():
+                print(f"{FACT_TABLES[name].label} (chunks of {config.chunk_size:,} rows)")
+                encoders = [writer.encoder() for writer in writers]
+                for chunk in iter_fact_chunks(name, config, dims):
+                    row_counts[name] += len(chunk)
+                    pipeline.put(writers, partial(_encode, chunk, encoders))
+        else:
+            print(f"⚡ Generating {', '.join(writers_by_table)} with {workers} worker processes "
+                  f"(chunks of {config.chunk_size:,} rows)...")
+            needed = {dim for name in writers_by_table for dim in FACT_TABLES[name].dims}
+            with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                     initargs=(config, {dim: dims[dim] for dim in needed})) as pool:
+                for name, writers in writers_by_table.items():
+                    encoders = [writer.encoder() for writer in writers]
+                    for first_id, num_rows in fact_chunks(name, config):
+                        row_counts[name] += num_rows
+                        pipeline.put(writers, pool.submit(_build_and_encode, name, first_id, num_rows,
+                                                          encoders).result)
+    finally:
+        try:
+            pipeline.close()
+        finally:
+            for writers in writers_by_table.values():
+                for writer in writers:
+                    writer.close()
+    print(f"   {pipeline.stats.summary()}")
+    return row_counts
@@ -0,0 +1,34 @@
+import zlib
+
+import numpy as np
+
+# Fact rows are drawn in fixed blocks, each from its own stream. Chunking and
+# parallelism only decide which blocks are built together, never what they
+# contain. Chunk sizes that are multiples of this avoid rebuilding partial blocks.
+RNG_BLOCK_ROWS = 50_000
+
+
+def stream_key(name):
+    """Stable integer id for a named stream (unlike ``hash()``, identical across processes and runs)."""
+    return zlib.crc32(name.encode('utf-8'))
+
+
+def _generator(seed, *spawn_key):
+    # SeedSequence(seed, spawn_key=k) is exactly the child SeedSequence(seed).spawn would hand out at k
+    return np.random.Generator(np.random.PCG64(np.random.SeedSequence(seed, spawn_key=spawn_key)))
+
+
+def table_rng(seed, name):
+    """Generator for a whole table that is built in one piece (the dimensions)."""
+    return _generator(seed, stream_key(name))
+
+
+def block_rng(seed, name, block_index):
+    """Generator for rows ``block_index * RNG_BLOCK_ROWS`` onwards of fact table ``name``.
+
+    Streams are keyed by table name and block position only, so adding rows
+    to one table or building tables in another order leaves every existing
+    row of every table unchanged, apart from rows of the child fact tables
+    whose parent row now exists (see ``facts._link``).
+    """
+    return _generator(seed, stream_key(name), block_index)
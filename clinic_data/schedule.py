@@ -0,0 +1,136 @@
+"""Capacity-aware appointment times: rooms, doctors and service durations.
+
+A branch is open ``OPENING_HOURS`` with ``DimBranch.NumRooms`` rooms, and
+an appointment holds one room and its doctor for the ``DimService.Duration``
+of its service, rounded up to whole ``SLOT_MINUTES`` slots. The 40 slots of
+a day fit in one int64, so the occupancy of a doctor or a room on a day is a
+bitmap and "is this run of slots free" is a shift and a mask.
+
+Appointments are placed one day at a time in id order, each at the first
+slot at or after its preferred time (or else the earliest slot of the day)
+where its doctor and some room of its branch are free for the whole
+service; the lowest free room is taken. A doctor with no such slot hands
+the appointment to the next doctor who performs the service. Where an
+appointment ends up depends only on the appointments before it on the same
+day, so a block of rows can be scheduled from its own rows plus the earlier
+rows of its first day. Each round places the next appointment of every day
+at once, so the work is vectorized over days.
+"""
+import numpy as np
+
+from clinic_data.dimensions import OPENING_HOURS
+from clinic_data.distributions import derived, doctor_pool_sizes, next_doctors
+
+SLOT_MINUTES = 15
+OPENING_MINUTE = OPENING_HOURS[0] * 60
+SLOTS_PER_DAY = (OPENING_HOURS[1] - OPENING_HOURS[0]) * 60 // SLOT_MINUTES
+ALL_SLOTS = (1 << SLOTS_PER_DAY) - 1
+# Appointments scheduled together, in whole days
+GROUP_ROWS = 50_000
+
+
+def service_slots(dim_service):
+    """Slots each service occupies, indexed by ServiceID."""
+    slots = np.zeros(dim_service['ServiceID'].max() + 1, dtype=np.int64)
+    slots[dim_service['ServiceID']] = np.maximum(1, -(-dim_service['Duration'].to_numpy() // SLOT_MINUTES))
+    return slots
+
+
+def branch_rooms(dim_branch, num_branches):
+    """Rooms of each branch, indexed by BranchID."""
+    rooms = np.zeros(num_branches + 1, dtype=np.int64)
+    rooms[dim_branch['BranchID'].to_numpy()] = dim_branch['NumRooms'].to_numpy()
+    return rooms
+
+
+def _runs(free, length):
+    """Bitmap of the slots that start ``length`` free slots in a row (and so end by closing time)."""
+    starts = free.copy()
+    for shift in range(1, int(length.max(initial=1))):
+        starts &= np.where(shift < length, free >> shift, -1)
+    return starts
+
+
+def _lowest_bit(bitmaps):
+    # Exact: a power of two below 2**40 is a float64
+    return np.log2(bitmaps & -bitmaps).astype(np.int64)
+
+
+def schedule_appointments(config, dims, day, branch_id, service_id, doctor_id, preferred_slot):
+    """Slot (0-based from opening), room (1-based) and doctor of each appointment.
+
+    ``day`` must be ascending (appointments in id order); rows are placed
+    in that order within each day. The doctor differs from ``doctor_id``
+    only where the drawn doctor had no room in their day. Raises
+    ValueError when a day holds more appointments than its branches and
+    doctors can, which only happens for configurations with far more
+    appointments per day than the scale's branches and doctors. Durations,
+    rooms and specialties come from DimService, DimBranch and DimDoctor in
+    ``dims``.
+    """
+    day, branch_id, service_id, preferred_slot = (np.asarray(values, dtype=np.int64) for values in
+                                                  (day, branch_id, service_id, preferred_slot))
+    doctor_id = np.array(doctor_id, dtype=np.int64)
+    slot = np.zeros(len(day), dtype=np.int64)
+    room = np.zeros(len(day), dtype=np.int64)
+    # Days are independent, so whole days are scheduled in groups that bound the per-day doctor bitmaps
+    first_rows = np.flatnonzero(np.concatenate([[True], day[1:] != day[:-1]])) if len(day) else np.array([0])
+    group_starts = first_rows[np.searchsorted(first_rows, np.arange(0, len(day), GROUP_ROWS), side='right') - 1]
+    cuts = np.unique(np.append(group_starts, len(day)))
+    for start, stop in zip(cuts[:-1], cuts[1:]):
+        rows = slice(start, stop)
+        slot[rows], room[rows], doctor_id[rows] = _schedule_days(
+            config, dims, day[rows], branch_id[rows], service_id[rows], doctor_id[rows], preferred_slot[rows])
+    return slot, room, doctor_id
+
+
+def _schedule_days(config, dims, day, branch_id, service_id, doctor_id, preferred_slot):
+    n = len(day)
+    slot = np.zeros(n, dtype=np.int64)
+    room = np.zeros(n, dtype=np.int64)
+
+    length = derived(service_slots, (dims['DimService'],))[service_id]
+    rooms = derived(branch_rooms, (dims['DimBranch'],), config.num_branches)
+    day_index = np.concatenate([[0], np.cumsum(day[1:] != day[:-1])])
+    day_start = np.flatnonzero(np.concatenate([[True], day[1:] != day[:-1]]))
+    rank = np.arange(n) - day_start[day_index]
+    # Occupancy: doctors per (day, doctor); rooms per (day, branch), rooms a branch lacks are always taken
+    doctor_busy = np.zeros((len(day_start), config.num_doctors + 1), dtype=np.int64)
+    pairs, pair = np.unique(day_index * (config.num_branches + 1) + branch_id, return_inverse=True)
+    max_rooms = int(rooms.max())
+    room_busy = np.where(np.arange(max_rooms) < rooms[pairs % (config.num_branches + 1)][:, None], 0, ALL_SLOTS)
+
+    order = np.argsort(rank, kind='stable')
+    bounds = np.searchsorted(rank[order], np.arange(rank.max() + 2))
+    for rows in (order[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])):
+        run = length[rows]
+        room_starts = _runs(~room_busy[pair[rows]] & ALL_SLOTS, run[:, None])
+        any_room = np.bitwise_or.reduce(room_starts, axis=1)
+        if not any_room.all():
+            raise ValueError(f'no room free at a branch on fact day {int(day[rows[any_room == 0][0]])}; '
+                             'the configuration has more appointments per day than its branches can hold')
+        starts = np.zeros(len(rows), dtype=np.int64)
+        pending = np.arange(len(rows))
+        pool = doctor_pool_sizes(config, dims, service_id[rows])
+        for step in range(int(pool.max())):
+            candidate = rows[pending]
+            if step:
+                doctor_id[candidate] = next_doctors(config, dims, service_id[candidate], doctor_id[candidate], 1)
+            starts[pending] = _runs(~doctor_busy[day_index[candidate], doctor_id[candidate]] & ALL_SLOTS,
+                                    run[pending]) & any_room[pending]
+            pending = pending[(starts[pending] == 0) & (step + 1 < pool[pending])]
+            if not len(pending):
+                break
+        if not starts.all():
+            raise ValueError(f'no doctor free on fact day {int(day[rows[starts == 0][0]])}; '
+                             'the configuration has more appointments per day than its doctors can hold')
+
+        later = starts >> preferred_slot[rows] << preferred_slot[rows]
+        chosen = _lowest_bit(np.where(later != 0, later, starts))
+        chosen_room = np.argmax((room_starts >> chosen[:, None]) & 1, axis=1)
+        mask = ((1 << run) - 1) << chosen
+        # Every row of a round is on a different day, so no two rows update the same bitmap
+        doctor_busy[day_index[rows], doctor_id[rows]] |= mask
+        room_busy[pair[rows], chosen_room] |= mask
+        slot[rows], room[rows] = chosen, chosen_room + 1
+    return slot, room, doctor_id
@@ -0,0 +1,165 @@
+"""Declared in-memory column types of every generated table.
+
+Generation casts each table (and each fact chunk) to ``SCHEMA`` and the
+readers in ``writers`` cast what they load back, so the same table has
+the same dtypes whether it was just generated or read from CSV/Parquet,
+and the writers take their column types from the dtypes instead of
+inferring them from the values:
+
+- keys and counts use the narrowest integer that holds them at any scale
+  (int8 for fixed lists such as ServiceID, int32 for ids that grow);
+- low-cardinality text is ``category``; fact columns declare their
+  members so chunks generated or read separately concatenate cleanly;
+- dates are ``datetime64[s]``; an optional key (VisitID) is ``Int32``;
+- money is float64 rounded to cents in memory and ``decimal(14,2)``
+  (fixed point) in Parquet, see ``writers.MONEY_COLUMNS``; whole-baht
+  prices, costs, rents and salaries are int32.
+"""
+import numpy as np
+import pandas as pd
+
+from clinic_data.facts import APPOINTMENT_STATUSES, PAYMENT_STATUSES
+
+DATE = 'datetime64[s]'
+
+SCHEMA = {
+    'DimDate': {
+        'DateKey': 'int32', 'Date': DATE, 'Year': 'int16', 'Quarter': 'category', 'Month': 'int8',
+        'MonthName': 'category', 'MonthNameThai': 'category', 'Day': 'int8', 'DayOfWeek': 'int8',
+        'DayName': 'category', 'WeekOfYear': 'int8', 'IsWeekend': 'int8', 'FiscalYear': 'int16',
+        'YearMonth': 'int32', 'DayOfYear': 'int16', 'DaysInMonth': 'int8', 'IsMonthStart': 'int8',
+        'IsMonthEnd': 'int8', 'IsThaiHoliday': 'int8', 'ThaiHolidayName': 'category', 'IsWorkingDay': 'int8',
+        'DayOffset': 'int32', 'MonthOffset': 'int16', 'YearOffset': 'int16', 'PrevMonthDateKey': 'int32',
+        'PrevYearDateKey': 'int32',
+    },
+    'DimTime': {
+        'TimeKey': 'int16', 'Time': 'str', 'Hour': 'int8', 'Minute': 'int8', 'HourLabel': 'category',
+        'HalfHourSlot': 'category', 'DayPart': 'category', 'IsOpeningHours': 'int8',
+    },
+    'DimBranch': {
+        'BranchID': 'int32', 'BranchCode': 'str', 'BranchName': 'str', 'Region': 'category',
+        'Province': 'category', 'District': 'category', 'Size': 'category', 'OpenDate': DATE,
+        'SquareMeter': 'int16', 'NumRooms': 'int8', 'MonthlyRent': 'int32', 'IsActive': 'int8',
+    },
+    'DimService': {
+        'ServiceID': 'int8', 'ServiceCode': 'str', 'ServiceName': 'str', 'ICD10Description': 'str',
+        'Category': 'category', 'SubCategory': 'category', 'BasePrice': 'int32', 'Cost': 'int32',
+        'Duration': 'int16',
+    },
+    'DimDoctor': {
+        'DoctorID': 'int32', 'DoctorCode': 'str', 'DoctorName': 'str', 'Specialty': 'category',
+        'LicenseNumber': 'str', 'YearsOfExperience': 'int8', 'EducationLevel': 'category', 'HourlyRate': 'int32',
+        'Status': 'category', 'HireDate': DATE,
+    },
+    'DimEmployee': {
+        'EmployeeID': 'int32', 'EmployeeCode': 'str', 'EmployeeName': 'str', 'Position': 'category',
+        'Department': 'category', 'BranchID': 'int32', 'MonthlySalary': 'int32', 'HireDate': DATE,
+        'Status': 'category',
+    },
+    'DimPaymentMethod': {
+        'PaymentMethodID': 'int8', 'PaymentMethodCode': 'str', 'PaymentMethodName': 'str', 'Category': 'category',
+        'IsActive': 'int8', 'ProcessingFee': 'float64',
+    },
+    'DimInsurance': {
+        'InsuranceID': 'int8', 'InsuranceCode': 'str', 'InsuranceName': 'str', 'CompanyName': 'category',
+        'CoveragePercent': 'int8', 'IsActive': 'int8',
+    },
+    'DimPatient': {
+        'PatientID': 'int32', 'PatientCode': 'str', 'Gender': 'category', 'AgeGroup': 'category',
+        'Province': 'category', 'MembershipLevel': 'category', 'RegistrationDate': DATE, 'IsActive': 'int8',
+    },
+    'FactAppointment': {
+        'AppointmentID': 'int32', 'AppointmentDateKey': 'int32', 'AppointmentTimeKey': 'int16',
+        'PatientID': 'int32', 'BranchID': 'int32', 'DoctorID': 'int32', 'ServiceID': 'int8', 'RoomNumber': 'int8',
+        'Status': pd.CategoricalDtype(APPOINTMENT_STATUSES),
+    },
+    'FactPatientVisit': {
+        'VisitID': 'int32', 'VisitDateKey': 'int32', 'PatientID': 'int32', 'BranchID': 'int32', 'DoctorID': 'int32',
+        'InsuranceID': 'int8', 'CheckInTimeKey': 'int16', 'CheckOutTimeKey': 'int16', 'WaitingTimeMinutes': 'int16',
+        'ServiceTimeMinutes': 'int16', 'SatisfactionScore': 'int8',
+    },
+    'FactBillingDetail': {
+        'BillingID': 'int32', 'BillingNumber': 'str', 'BillingDateKey': 'int32', 'VisitID': 'Int32',
+        'PatientID': 'int32', 'BranchID': 'int32', 'DoctorID': 'int32', 'ServiceID': 'int8', 'InsuranceID': 'int8',
+        'PaymentMethodID': 'int8', 'ServiceKey': 'int16', 'DoctorKey': 'int32', 'InsuranceKey': 'int16',
+        'Quantity': 'int8', 'UnitPrice': 'float64', 'GrossAmount': 'float64', 'DiscountPercent': 'int8',
+        'DiscountAmount': 'float64', 'NetAmount': 'float64', 'InsuranceCoverageAmount': 'float64',
+        'PatientPaidAmount': 'float64', 'PaymentFee': 'float64', 'TotalCost': 'int32', 'GrossProfit': 'float64',
+        'GrossProfitMargin': 'float32', 'PaymentStatus': pd.CategoricalDtype(PAYMENT_STATUSES),
+        'PaymentDate': DATE,
+    },
+}
+
+# Type-2 versions (see ``history``): a surrogate key, the dimension's columns, then the validity
+_VALIDITY = {'ValidFrom': DATE, 'ValidTo': DATE, 'IsCurrent': 'int8'}
+SCHEMA.update({
+    'DimServiceVersion': {'ServiceKey': 'int16', **SCHEMA['DimService'], **_VALIDITY},
+    'DimDoctorVersion': {'DoctorKey': 'int32', **SCHEMA['DimDoctor'], **_VALIDITY},
+    'DimInsuranceVersion': {'InsuranceKey': 'int16', **SCHEMA['DimInsurance'], **_VALIDITY},
+})
+
+_BILLING_SUMS = {
+    'BillingCount': 'int32', 'Quantity': 'int32', 'GrossAmount': 'float64', 'DiscountAmount': 'float64',
+    'NetAmount': 'float64', 'InsuranceCoverageAmount': 'float64', 'PatientPaidAmount': 'float64',
+    'PaymentFee': 'float64', 'TotalCost': 'int64', 'GrossProfit': 'float64',
+}
+_SKETCH = {'DistinctPatients': 'int32', 'PatientSketch': 'str'}
+
+SCHEMA.update({
+    'AggBillingDaily': {'DateKey': 'int32', 'BranchID': 'int32', 'ServiceID': 'int8', 'InsuranceID': 'int8',
+                        'PaymentMethodID': 'int8', **_BILLING_SUMS, **_SKETCH},
+    'AggBillingMonthBranch': {'YearMonth': 'int32', 'BranchID': 'int32', **_BILLING_SUMS, **_SKETCH},
+    'AggAppointmentMonthBranch': {
+        'YearMonth': 'int32', 'BranchID': 'int32', 'AppointmentCount': 'int32', 'CompletedCount': 'int32',
+        'ScheduledCount': 'int32', 'CancelledCount': 'int32', 'NoShowCount': 'int32', **_SKETCH,
+    },
+})
+
+
+def is_nullable_integer(dtype):
+    """True for pandas' masked integer dtypes (Int32, Int64, ...), which hold missing values."""
+    return isinstance(dtype, pd.api.extensions.ExtensionDtype) and dtype.kind in 'iu'
+
+
+def is_category(dtype):
+    return isinstance(dtype, pd.CategoricalDtype) or dtype == 'category'
+
+
+def csv_dtypes(name, columns=None):
+    """``read_csv`` dtypes for table ``name`` (or its ``columns``); dates are parsed afterwards by ``apply_schema``."""
+    return {column: dtype for column, dtype in _declared(name, columns).items() if dtype != DATE}
+
+
+def _declared(name, columns=None):
+    schema = SCHEMA[name]
+    return schema if columns is None else {column: schema[column] for column in schema if column in columns}
+
+
+def _cast(name, column, series, dtype):
+    if dtype == DATE:
+        return series.astype(DATE) if series.dtype.kind == 'M' else pd.to_datetime(series).astype(DATE)
+    if isinstance(dtype, str) and dtype.lower().startswith('int'):
+        info = np.iinfo(dtype.lower())
+        values = series.dropna()
+        if len(values) and (values.min() < info.min or values.max() > info.max):
+            raise ValueError(f'{name}.{column} does not fit in {dtype}')
+    return series.astype(dtype)
+
+
+def apply_schema(name, table, columns=None):
+    """``table`` cast to the declared dtypes of ``name``; tables not in ``SCHEMA`` are returned as is.
+
+    ``columns`` declares that ``table`` holds only those columns (in
+    declaration order), as when a reader skips the others. Raises
+    ValueError when the columns differ from the declaration or an
+    integer does not fit its declared width.
+    """
+    if name not in SCHEMA:
+        return table
+    schema = _declared(name, columns)
+    if list(table.columns) != list(schema):
+        raise ValueError(f'{name} columns {list(table.columns)} differ from the schema {list(schema)}')
+    if all(table[column].dtype == dtype for column, dtype in schema.items()):
+        return table
+    return pd.DataFrame({column: _cast(name, column, table[column], dtype) for column, dtype in schema.items()},
+                        index=table.index)
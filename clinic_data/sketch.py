@@ -0,0 +1,113 @@
+"""HyperLogLog distinct-count sketches, vectorized over whole columns.
+
+A sketch is a set of ``2 ** HLL_PRECISION`` registers, each holding the
+largest leading-zero rank seen among the hashed values routed to it. Only
+the registers that are set are kept. Sketches of a day/branch/service
+group have a few entries, and merging two sketches takes the per-register
+maximum, so the sketches of fine-grained aggregate rows can be rolled up
+to any coarser grain. The merged sketch estimates the distinct count of
+the combined groups: ~1.6% standard error at precision 12, switching to
+linear counting for small groups.
+
+Sketches are serialized as strings of 5 hex digits per set register,
+``register * 64 + rank``, so they fit in a CSV/Parquet string column.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+HLL_PRECISION = 12
+HLL_REGISTERS = 1 << HLL_PRECISION
+_RANK_BITS = 64 - HLL_PRECISION
+_TOKEN_WIDTH = 5
+
+
+def _hash64(values):
+    """splitmix64 finalizer: spreads consecutive ids over all 64 bits."""
+    h = np.asarray(values).astype(np.uint64)
+    with np.errstate(over='ignore'):
+        h = h + np.uint64(0x9E3779B97F4A7C15)
+        h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+
+def register_ranks(values):
+    """``(register, rank)`` arrays for each value; rank is the leading-zero count of the low bits + 1."""
+    h = _hash64(values)
+    register = (h >> np.uint64(_RANK_BITS)).astype(np.int64)
+    rest = h & np.uint64((1 << _RANK_BITS) - 1)
+    # rest < 2**52 converts to float64 exactly, so frexp gives its exact bit length
+    _, bit_length = np.frexp(rest.astype(np.float64))
+    rank = np.where(rest == 0, _RANK_BITS + 1, _RANK_BITS - bit_length + 1)
+    return register, rank.astype(np.int64)
+
+
+def _alpha(m):
+    return 0.7213 / (1 + 1.079 / m)
+
+
+def estimate_groups(group, rank, num_groups):
+    """Distinct-count estimate per group from one row per set register.
+
+    ``group`` is a dense 0..num_groups-1 code for each ``(register, rank)``
+    row, and every register appears at most once per group.
+    """
+    m = HLL_REGISTERS
+    set_registers = np.bincount(group, minlength=num_groups)
+    harmonic = np.bincount(group, weights=np.exp2(-rank.astype(float)), minlength=num_groups)
+    zeros = m - set_registers
+    raw = _alpha(m) * m * m / (harmonic + zeros)
+    with np.errstate(divide='ignore'):
+        linear = m * np.log(m / np.maximum(zeros, 1))
+    estimate = np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+    return np.rint(estimate).astype(np.int64)
+
+
+@lru_cache(maxsize=1)
+def _tokens():
+    return np.char.mod('%05x', np.arange(HLL_REGISTERS * 64)).astype(f'S{_TOKEN_WIDTH}')
+
+
+def encode_groups(group, register, rank):
+    """Serialized sketch per group, for rows already sorted by a dense 0..n-1 ``group`` code.
+
+    The fixed-width tokens are laid end to end in one string and cut at the
+    group boundaries, instead of joining each group's tokens separately.
+    """
+    text = _tokens()[register * 64 + rank].tobytes().decode('ascii')
+    bounds = np.append(np.flatnonzero(np.diff(group)) + 1, len(group)) * _TOKEN_WIDTH
+    starts = np.append(0, bounds[:-1])
+    return np.array([text[start:end] for start, end in zip(starts.tolist(), bounds.tolist())], dtype=object)
+
+
+def decode_groups(sketches):
+    """Inverse of ``encode_groups``: ``(group, register, rank)`` arrays for a sequence of sketches."""
+    sketches = [sketch if isinstance(sketch, str) else '' for sketch in sketches]
+    lengths = np.array([len(sketch) for sketch in sketches], dtype=np.int64) // _TOKEN_WIDTH
+    digits = np.frombuffer(''.join(sketches).encode('ascii'), dtype=np.uint8).reshape(-1, _TOKEN_WIDTH)
+    digits = np.where(digits >= ord('a'), digits - (ord('a') - 10), digits - ord('0')).astype(np.int64)
+    tokens = digits @ (16 ** np.arange(_TOKEN_WIDTH - 1, -1, -1))
+    return np.repeat(np.arange(len(sketches)), lengths), tokens // 64, tokens % 64
+
+
+def decode_sketch(sketch):
+    """``(register, rank)`` arrays of a serialized sketch."""
+    _, register, rank = decode_groups([sketch])
+    return register, rank
+
+
+def merge_sketches(sketches):
+    """Union of serialized sketches as one serialized sketch."""
+    registers = np.zeros(HLL_REGISTERS, dtype=np.int64)
+    for sketch in sketches:
+        register, rank = decode_sketch(sketch)
+        np.maximum.at(registers, register, rank)
+    register = np.flatnonzero(registers)
+    return _tokens()[register * 64 + registers[register]].tobytes().decode('ascii')
+
+
+def estimate_sketch(sketch):
+    """Distinct-count estimate of one serialized sketch."""
+    register, rank = decode_sketch(sketch)
+    return int(estimate_groups(np.zeros(len(register), dtype=np.int64), rank, 1)[0])
@@ -0,0 +1,281 @@
+"""Binary snapshot of the generated tables that reloads with ``np.memmap``.
+
+Every column is one raw little-endian array file, described by a small
+``manifest.json``::
+
+    <snapshot>/manifest.json
+    <snapshot>/<Table>/<Column>.bin       values (or dictionary codes, or string offsets)
+    <snapshot>/<Table>/<Column>.data      UTF-8 bytes of a string column
+    <snapshot>/<Table>/<Column>.valid     one byte per row for columns that can be missing
+
+Columns are typed like the Parquet output: integers as int32, floats as
+float64 (float32 columns of ``schema.SCHEMA`` as float32), dates as
+datetime64[s], categorical columns as int32 codes into a dictionary kept
+in the manifest (-1 is missing), and other strings as Arrow-style int64
+offsets plus UTF-8 data. Loading maps the
+files read-only, so opening even a very large fact table costs no parsing
+and worker processes share the page cache; only the columns actually
+touched are read from disk.
+"""
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from clinic_data.schema import is_category, is_nullable_integer
+from clinic_data.warehouse import table_order
+from clinic_data.writers import (
+    CATEGORICAL_COLUMNS, DATE_COLUMNS, TableWriter, iter_table_chunks, table_exists, write_chunks,
+)
+
+MANIFEST = 'manifest.json'
+FORMAT_VERSION = 1
+
+_INT32 = np.iinfo(np.int32)
+
+
+def column_kind(column, series):
+    """How a column is stored: dictionary, string, date, nullable (int32 + validity), bool, int, float32 or float."""
+    if is_category(series.dtype) or column in CATEGORICAL_COLUMNS:
+        return 'dictionary'
+    if column in DATE_COLUMNS or series.dtype.kind == 'M':
+        return 'date'
+    # Optional keys such as VisitID read back from CSV or Parquet as float with NaN
+    if is_nullable_integer(series.dtype) or (column.endswith('ID') and series.dtype.kind == 'f'):
+        return 'nullable'
+    if series.dtype.kind == 'b':
+        return 'bool'
+    if series.dtype.kind in 'iu':
+        return 'int'
+    if series.dtype == np.float32:
+        return 'float32'
+    if series.dtype.kind == 'f':
+        return 'float'
+    return 'string'
+
+
+def _int32(column, values):
+    if len(values) and (values.min() < _INT32.min or values.max() > _INT32.max):
+        raise ValueError(f'{column} does not fit in int32')
+    return values.astype('<i4')
+
+
+def encode_snapshot(chunk):
+    """``[(column, kind, arrays), ...]`` for one chunk; dictionaries are chunk-local until written."""
+    encoded = []
+    for column in chunk.columns:
+        series = chunk[column]
+        kind = column_kind(column, series)
+        if kind == 'dictionary':
+            codes, uniques = pd.factorize(series)
+            arrays = (codes.astype('<i4'), [str(value) for value in uniques])
+        elif kind == 'date':
+            arrays = (pd.to_datetime(series).to_numpy(dtype='datetime64[s]').astype('<M8[s]'),)
+        elif kind == 'nullable':
+            valid = series.notna().to_numpy()
+            arrays = (_int32(column, series.fillna(0).to_numpy(dtype=np.int64)), valid.astype(np.uint8))
+        elif kind == 'bool':
+            arrays = (series.to_numpy(dtype=np.uint8),)
+        elif kind == 'float32':
+            arrays = (series.to_numpy(dtype='<f4'),)
+        elif kind == 'float':
+            arrays = (series.to_numpy(dtype='<f8'),)
+        elif kind == 'int':
+            arrays = (_int32(column, series.to_numpy()),)
+        else:
+            valid = series.notna().to_numpy()
+            values = [value.encode('utf-8') if ok else b'' for value, ok in zip(series.to_numpy(dtype=object), valid)]
+            lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+            arrays = (lengths, b''.join(values), valid.astype(np.uint8))
+        encoded.append((column, kind, arrays))
+    return encoded
+
+
+_DTYPES = {'dictionary': '<i4', 'date': '<M8[s]', 'nullable': '<i4', 'bool': '|u1', 'int': '<i4', 'float32': '<f4', 'float': '<f8',
+           'string': '<i8'}
+
+
+class SnapshotWriter:
+    """One snapshot directory that tables are streamed into; ``finish()`` writes the manifest."""
+
+    def __init__(self, directory):
+        if os.path.exists(os.path.join(directory, MANIFEST)):
+            shutil.rmtree(directory)
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.tables = {}
+
+    def writer(self, name):
+        return SnapshotTableWriter(self, name)
+
+    def finish(self):
+        manifest = {'format': FORMAT_VERSION, 'tables': self.tables}
+        with open(os.path.join(self.directory, MANIFEST), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        return os.path.join(self.directory, MANIFEST)
+
+
+class SnapshotTableWriter(TableWriter):
+    """Appends chunks of one table to its column files; dictionary codes are remapped to table-wide ones."""
+
+    def __init__(self, snapshot, name):
+        self.snapshot = snapshot
+        self.name = name
+        self.rows = 0
+        self.directory = os.path.join(snapshot.directory, name)
+        os.makedirs(self.directory, exist_ok=True)
+        self._columns = None
+        self._files = {}
+        self._dictionaries = {}
+        self._string_offsets = {}
+
+    def encoder(self):
+        return encode_snapshot, ()
+
+    def _file(self, column, suffix):
+        key = (column, suffix)
+        if key not in self._files:
+            self._files[key] = open(os.path.join(self.directory, f'{column}.{suffix}'), 'wb')
+        return self._files[key]
+
+    def write_encoded(self, payload, rows):
+        kinds = [(column, kind) for column, kind, _ in payload]
+        if self._columns is None:
+            self._columns = kinds
+            for column, kind in kinds:
+                if kind == 'string':
+                    self._file(column, 'bin').write(np.zeros(1, dtype='<i8').tobytes())
+                    self._string_offsets[column] = 0
+        elif kinds != self._columns:
+            raise ValueError(f'{self.name}: chunk columns or types differ from the first chunk')
+
+        for column, kind, arrays in payload:
+            if kind == 'dictionary':
+                codes, uniques = arrays
+                dictionary = self._dictionaries.setdefault(column, {})
+                mapping = np.array([dictionary.setdefault(value, len(dictionary)) for value in uniques] + [-1],
+                                   dtype='<i4')
+                self._file(column, 'bin').write(mapping[codes].tobytes())
+            elif kind == 'string':
+                lengths, data, valid = arrays
+                offsets = self._string_offsets[column] + np.cumsum(lengths)
+                if len(offsets):
+                    self._string_offsets[column] = int(offsets[-1])
+                self._file(column, 'bin').write(offsets.astype('<i8').tobytes())
+                self._file(column, 'data').write(data)
+                self._file(column, 'valid').write(valid.tobytes())
+            else:
+                self._file(column, 'bin').write(arrays[0].tobytes())
+                if kind == 'nullable':
+                    self._file(column, 'valid').write(arrays[1].tobytes())
+        self.rows += rows
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+        columns = []
+        for column, kind in self._columns or []:
+            spec = {'name': column, 'kind': kind, 'dtype': _DTYPES[kind]}
+            if kind == 'dictionary':
+                spec['dictionary'] = list(self._dictionaries.get(column, {}))
+            columns.append(spec)
+        self.snapshot.tables[self.name] = {'rows': self.rows, 'columns': columns}
+
+
+def _map(path, dtype, count):
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+
+
+class SnapshotTable:
+    """Read-only view of one snapshot table; columns are memory-mapped on first access."""
+
+    def __init__(self, directory, name, spec):
+        self.directory = os.path.join(directory, name)
+        self.name = name
+        self.rows = spec['rows']
+        self.columns = {column['name']: column for column in spec['columns']}
+
+    def __len__(self):
+        return self.rows
+
+    def _path(self, column, suffix):
+        return os.path.join(self.directory, f'{column}.{suffix}')
+
+    def array(self, column):
+        """The stored array of ``column``: values, dictionary codes, or string offsets (rows + 1)."""
+        spec = self.columns[column]
+        count = self.rows + 1 if spec['kind'] == 'string' else self.rows
+        return _map(self._path(column, 'bin'), spec['dtype'], count)
+
+    def valid(self, column):
+        return _map(self._path(column, 'valid'), np.bool_, self.rows)
+
+    def column(self, column, categorical=True):
+        """``column`` as pandas data; numeric and date columns stay memory-mapped."""
+        spec = self.columns[column]
+        kind = spec['kind']
+        values = self.array(column)
+        if kind == 'dictionary':
+            categories = pd.Index(spec['dictionary'], dtype=object)
+            if categorical:
+                return pd.Categorical.from_codes(values, categories, validate=False)
+            return np.where(values >= 0, categories.to_numpy()[np.maximum(values, 0)], None)
+        if kind == 'nullable':
+            return pd.arrays.IntegerArray(values, ~self.valid(column))
+        if kind == 'bool':
+            return values.view(np.bool_)
+        if kind == 'string':
+            return self._strings(column, values)
+        return values
+
+    def _strings(self, column, offsets):
+        data = _map(self._path(column, 'data'), np.uint8, int(offsets[-1]))
+        valid = self.valid(column)
+        try:
+            import pyarrow as pa
+        except ImportError:
+            blob = data.tobytes()
+            return np.array([blob[start:end].decode('utf-8') if ok else None
+                             for start, end, ok in zip(offsets[:-1].tolist(), offsets[1:].tolist(), valid)],
+                            dtype=object)
+        bitmap = None if valid.all() else pa.py_buffer(np.packbits(valid, bitorder='little'))
+        strings = pa.LargeStringArray.from_buffers(self.rows, pa.py_buffer(offsets), pa.py_buffer(data), bitmap)
+        return pd.arrays.ArrowStringArray(strings)
+
+    def to_pandas(self, columns=None, categorical=True):
+        columns = list(self.columns) if columns is None else columns
+        # Series keep their memory-mapped buffers; a dict of bare arrays would be consolidated into copies
+        return pd.DataFrame({column: pd.Series(self.column(column, categorical), copy=False) for column in columns},
+                            copy=False)
+
+
+def load_snapshot(directory):
+    """``{table: SnapshotTable}`` for the snapshot in ``directory``."""
+    with open(os.path.join(directory, MANIFEST), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != FORMAT_VERSION:
+        raise ValueError(f"unsupported snapshot format {manifest.get('format')!r} in {directory}")
+    return {name: SnapshotTable(directory, name, spec) for name, spec in manifest['tables'].items()}
+
+
+def read_snapshot(directory, tables=None, categorical=True):
+    """The snapshot's tables as DataFrames keyed by name (all of them, or ``tables``)."""
+    snapshot = load_snapshot(directory)
+    return {name: table.to_pandas(categorical=categorical) for name, table in snapshot.items()
+            if tables is None or name in tables}
+
+
+def snapshot_directory(output_dir, directory, chunk_size=1_000_000):
+    """Write a snapshot of the tables already in ``output_dir``; returns the rows per table."""
+    snapshot = SnapshotWriter(directory)
+    row_counts = {}
+    for name in table_order():
+        if table_exists(output_dir, name) or os.path.isdir(os.path.join(output_dir, name)):
+            row_counts[name] = write_chunks(iter_table_chunks(output_dir, name, chunk_size, {'PatientSketch': str}),
+                                            [snapshot.writer(name)])
+    snapshot.finish()
+    return row_counts
@@ -0,0 +1,338 @@
+"""Referential-integrity and data-quality checks over the generated star schema.
+
+Foreign keys are the documented ones (``warehouse.documented_keys``) and
+the row invariants are ``INVARIANTS``. Each table is read once, chunk by
+chunk and only the columns its checks need, parents before children. The
+primary key of every table goes into a ``KeySet`` as it streams past,
+which counts duplicate keys, and each foreign key column of a chunk is
+tested against its parent's set with one array lookup. Only a chunk and
+the key sets are in memory at a time, so output larger than RAM can be
+checked.
+"""
+import os
+from dataclasses import dataclass, field
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from clinic_data.facts import format_billing_numbers
+from clinic_data.history import HISTORIES
+from clinic_data.schedule import OPENING_MINUTE, SLOT_MINUTES, SLOTS_PER_DAY
+from clinic_data.schema import SCHEMA
+from clinic_data.warehouse import documented_keys, table_order
+from clinic_data.writers import iter_table_chunks, read_table, table_exists
+
+# Integer keys below this are looked up in a boolean array indexed by the key
+MAX_DENSE_KEY = 1 << 31
+
+# Money columns are rounded to cents one by one, so sums of them may differ by a cent
+CENT = 0.01 + 1e-9
+
+SAMPLE_ROWS = 5
+
+# 'INV' + 8-digit date + '-' + an id of 6 to 10 digits
+MIN_BILLING_NUMBER, MAX_BILLING_NUMBER = 18, 22
+# Billing numbers whose lengths change more often than this per chunk are compared as text instead
+MAX_LENGTH_RUNS = 64
+
+
+class KeySet:
+    """The set of key values of one table: a boolean array indexed by the key, or a sorted array.
+
+    The dense array is used while every key is a non-negative integer below
+    ``MAX_DENSE_KEY`` (all keys of this schema are), so both adding a chunk
+    and testing membership are a single fancy-indexing operation.
+    """
+
+    def __init__(self):
+        self.present = np.zeros(0, dtype=bool)
+        self.sorted = None
+
+    def add(self, values):
+        """Add ``values``; returns a boolean array, True for the values already in the set or earlier in ``values``."""
+        values = np.asarray(values)
+        if not len(values):
+            return np.zeros(0, dtype=bool)
+        if self.sorted is None and values.dtype.kind in 'iu' and values.min() >= 0 and values.max() < MAX_DENSE_KEY:
+            low, high = int(values.min()), int(values.max()) + 1
+            if high > len(self.present):
+                grown = np.zeros(max(high, 2 * len(self.present)), dtype=bool)
+                grown[:len(self.present)] = self.present
+                self.present = grown
+            seen = self.present[values]
+            before = np.count_nonzero(self.present[low:high])
+            self.present[values] = True
+            added = np.count_nonzero(self.present[low:high]) - before
+            if added == len(values):
+                return seen
+        else:
+            if self.sorted is None:
+                self.sorted = np.flatnonzero(self.present)
+            seen = self.contains(values)
+            self.sorted = np.unique(np.concatenate([self.sorted, values]))
+        # Only chunks with repeated keys pay for finding which rows repeat
+        return seen | pd.Series(values).duplicated().to_numpy()
+
+    def contains(self, values):
+        values = np.asarray(values)
+        if self.sorted is not None:
+            at = np.minimum(np.searchsorted(self.sorted, values), max(len(self.sorted) - 1, 0))
+            return (self.sorted[at] == values) if len(self.sorted) else np.zeros(len(values), dtype=bool)
+        if values.dtype.kind not in 'iu' or not len(self.present):
+            return np.zeros(len(values), dtype=bool)
+        inside = (values >= 0) & (values < len(self.present))
+        return inside & self.present[np.where(inside, values, 0)]
+
+
+@dataclass(frozen=True)
+class Invariant:
+    table: str
+    name: str
+    columns: tuple
+    broken: object  # (chunk, dims) -> boolean array, True for the rows that violate the invariant
+    dims: tuple = ()  # dimension tables ``broken`` looks up
+
+
+def _column(chunk, column):
+    return chunk[column].to_numpy(dtype=np.float64 if chunk[column].dtype.kind == 'f' else np.int64)
+
+
+def _money_differs(chunk, column, *terms):
+    """``column`` differs by more than the rounding error from the signed sum of ``terms``."""
+    expected = sum(sign * _column(chunk, term) for sign, term in terms)
+    return np.abs(_column(chunk, column) - expected) > CENT * len(terms)
+
+
+def _by_key(dims, table, key, column):
+    """Dense array of ``table[column]`` indexed by ``table[key]``."""
+    dim = dims[table]
+    values = np.zeros(int(dim[key].max()) + 1, dtype=np.int64)
+    values[dim[key].to_numpy()] = dim[column].to_numpy()
+    return values
+
+
+def _room_outside_branch(chunk, dims):
+    rooms = _by_key(dims, 'DimBranch', 'BranchID', 'NumRooms')[_column(chunk, 'BranchID')]
+    return (_column(chunk, 'RoomNumber') < 1) | (_column(chunk, 'RoomNumber') > rooms)
+
+
+def _outside_opening_hours(chunk, dims):
+    duration = _by_key(dims, 'DimService', 'ServiceID', 'Duration')[_column(chunk, 'ServiceID')]
+    start = _column(chunk, 'AppointmentTimeKey') - OPENING_MINUTE
+    end = start + -(-duration // SLOT_MINUTES) * SLOT_MINUTES
+    return (start < 0) | (end > SLOTS_PER_DAY * SLOT_MINUTES)
+
+
+def _check_out_mismatch(chunk, dims):
+    expected = _column(chunk, 'CheckInTimeKey') + _column(chunk, 'WaitingTimeMinutes') + \
+        _column(chunk, 'ServiceTimeMinutes')
+    return _column(chunk, 'CheckOutTimeKey') != expected
+
+
+def _string_bytes(series):
+    """``(offsets, data)`` of a string column's Arrow buffers, or None without pyarrow or with missing values."""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return None
+    array = pa.array(series)
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    array = array.cast(pa.large_string())
+    if array.null_count:
+        return None
+    offsets = np.frombuffer(array.buffers()[1], dtype=np.int64)[array.offset:array.offset + len(array) + 1]
+    return offsets, np.frombuffer(array.buffers()[2], dtype=np.uint8)
+
+
+def _billing_number_parts(offsets, data):
+    """Date key and id written in each 'INV<date>-<id>' value; -1 where the value is not in that form.
+
+    Consecutive values of the same length are adjacent in the Arrow data
+    buffer, so each such run is parsed as one ``(rows, length)`` byte matrix.
+    Ids only change width every power of ten, so a chunk holds one or two runs.
+    """
+    length = np.diff(offsets)
+    date_key = np.full(len(length), -1, dtype=np.int64)
+    billing_id = np.full(len(length), -1, dtype=np.int64)
+    bounds = np.concatenate([[0], np.flatnonzero(np.diff(length)) + 1, [len(length)]])
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        width = int(length[start])
+        if not MIN_BILLING_NUMBER <= width <= MAX_BILLING_NUMBER:
+            continue
+        block = data[offsets[start]:offsets[stop]].reshape(stop - start, width)
+        digits = block - np.uint8(ord('0'))  # bytes below '0' wrap around to more than 9
+        prefix = np.frombuffer(b'INV', dtype=np.uint8)
+        well_formed = ((block[:, :3] == prefix).all(axis=1) & (block[:, 11] == ord('-')) &
+                       (digits[:, 3:11] <= 9).all(axis=1) & (digits[:, 12:] <= 9).all(axis=1))
+        date_digits, id_digits = digits[:, 3:11].astype(np.int64), digits[:, 12:].astype(np.int64)
+        date_key[start:stop] = np.where(well_formed, date_digits @ 10 ** np.arange(7, -1, -1), -1)
+        billing_id[start:stop] = np.where(well_formed, id_digits @ 10 ** np.arange(width - 13, -1, -1), -1)
+    return date_key, billing_id, len(bounds) - 1
+
+
+def _billing_number_mismatch(chunk, dims):
+    date_key, billing_id = _column(chunk, 'BillingDateKey'), _column(chunk, 'BillingID')
+    buffers = _string_bytes(chunk['BillingNumber']) if len(chunk) else None
+    if buffers is not None:
+        # Read the date and id back out of the bytes instead of formatting and comparing text
+        written_date, written_id, runs = _billing_number_parts(*buffers)
+        if runs <= MAX_LENGTH_RUNS:
+            return (written_date != date_key) | (written_id != billing_id)
+    return chunk['BillingNumber'].to_numpy(dtype=str) != format_billing_numbers(date_key, billing_id)
+
+
+def _gross_amount_mismatch(chunk, dims):
+    # UnitPrice is rounded to cents before it is multiplied
+    quantity = _column(chunk, 'Quantity')
+    return np.abs(_column(chunk, 'GrossAmount') - _column(chunk, 'UnitPrice') * quantity) > CENT * (quantity + 1)
+
+
+def _date_key_days(date_keys):
+    """Days since 1970-01-01 of YYYYMMDD keys."""
+    year, month_day = np.divmod(date_keys, 10000)
+    month, day = np.divmod(month_day, 100)
+    months = (year - 1970).astype('datetime64[Y]').astype('datetime64[M]') + (month - 1)
+    return (months.astype('datetime64[D]') + (day - 1)).astype(np.int64)
+
+
+def _payment_days(chunk, dims):
+    days = chunk['PaymentDate'].to_numpy().astype('datetime64[D]').astype(np.int64) - \
+        _date_key_days(_column(chunk, 'BillingDateKey'))
+    return (days < 0) | (days > 7)
+
+
+def _version_not_in_force(name, chunk, dims):
+    """The surrogate key is not a version of the row's business key valid on BillingDateKey."""
+    history = HISTORIES[name]
+    versions = dims[name]
+    position = np.full(int(versions[history.surrogate].max()) + 1, -1, dtype=np.int64)
+    position[versions[history.surrogate].to_numpy()] = np.arange(len(versions))
+    surrogate = _column(chunk, history.surrogate)
+    row = position[np.clip(surrogate, 0, len(position) - 1)]
+    day = _date_key_days(_column(chunk, 'BillingDateKey'))
+    valid_from, valid_to = (versions[column].to_numpy().astype('datetime64[D]').astype(np.int64)[row]
+                            for column in ('ValidFrom', 'ValidTo'))
+    return ((row < 0) | (versions[history.key].to_numpy()[row] != _column(chunk, history.key)) |
+            (day < valid_from) | (day > valid_to))
+
+
+INVARIANTS = (
+    Invariant('FactAppointment', 'RoomNumber between 1 and DimBranch.NumRooms', ('BranchID', 'RoomNumber'),
+              _room_outside_branch, ('DimBranch',)),
+    Invariant('FactAppointment', 'service ends by closing time', ('AppointmentTimeKey', 'ServiceID'),
+              _outside_opening_hours, ('DimService',)),
+    Invariant('FactPatientVisit', 'CheckOutTimeKey = CheckInTimeKey + WaitingTimeMinutes + ServiceTimeMinutes',
+              ('CheckInTimeKey', 'CheckOutTimeKey', 'WaitingTimeMinutes', 'ServiceTimeMinutes'), _check_out_mismatch),
+    Invariant('FactPatientVisit', 'CheckOutTimeKey > CheckInTimeKey', ('CheckInTimeKey', 'CheckOutTimeKey'),
+              lambda chunk, dims: _column(chunk, 'CheckOutTimeKey') <= _column(chunk, 'CheckInTimeKey')),
+    Invariant('FactPatientVisit', 'SatisfactionScore between 1 and 5', ('SatisfactionScore',),
+              lambda chunk, dims: ~chunk['SatisfactionScore'].between(1, 5).to_numpy()),
+    Invariant('FactBillingDetail', 'BillingNumber = INV<BillingDateKey>-<BillingID>',
+              ('BillingID', 'BillingNumber', 'BillingDateKey'), _billing_number_mismatch),
+    Invariant('FactBillingDetail', 'GrossAmount = UnitPrice * Quantity', ('Quantity', 'UnitPrice', 'GrossAmount'),
+              _gross_amount_mismatch),
+    Invariant('FactBillingDetail', 'NetAmount = GrossAmount - DiscountAmount',
+              ('GrossAmount', 'DiscountAmount', 'NetAmount'),
+              lambda chunk, dims: _money_differs(chunk, 'NetAmount', (1, 'GrossAmount'), (-1, 'DiscountAmount'))),
+    Invariant('FactBillingDetail', 'PatientPaidAmount = NetAmount - InsuranceCoverageAmount',
+              ('NetAmount', 'InsuranceCoverageAmount', 'PatientPaidAmount'),
+              lambda chunk, dims: _money_differs(chunk, 'PatientPaidAmount', (1, 'NetAmount'),
+                                                 (-1, 'InsuranceCoverageAmount'))),
+    Invariant('FactBillingDetail', 'GrossProfit = NetAmount - TotalCost - PaymentFee',
+              ('NetAmount', 'PaymentFee', 'TotalCost', 'GrossProfit'),
+              lambda chunk, dims: _money_differs(chunk, 'GrossProfit', (1, 'NetAmount'), (-1, 'TotalCost'),
+                                                 (-1, 'PaymentFee'))),
+    Invariant('FactBillingDetail', 'PaymentDate 0-7 days after BillingDateKey', ('BillingDateKey', 'PaymentDate'),
+              _payment_days),
+    *(Invariant('FactBillingDetail', f'{history.surrogate} is the {name} in force on BillingDateKey',
+                ('BillingDateKey', history.key, history.surrogate), partial(_version_not_in_force, name), (name,))
+      for name, history in HISTORIES.items()),
+)
+
+
+@dataclass
+class CheckResult:
+    table: str
+    check: str
+    rows: int = 0
+    violations: int = 0
+    samples: list = field(default_factory=list)  # the first violating rows, as dicts of the checked columns
+
+    def record(self, chunk, broken, columns, sample_rows):
+        self.rows += len(chunk)
+        broken = np.asarray(broken, dtype=bool)
+        count = int(np.count_nonzero(broken))
+        if count and len(self.samples) < sample_rows:
+            rows = chunk.loc[broken, list(dict.fromkeys(columns))].head(sample_rows - len(self.samples))
+            self.samples.extend(rows.to_dict('records'))
+        self.violations += count
+
+
+def _parents_first(names, foreign_keys):
+    ordered, remaining = [], list(names)
+    while remaining:
+        ready = [name for name in remaining
+                 if not any(child == name and parent in remaining and parent != name
+                            for child, _, parent, _ in foreign_keys)]
+        # A cycle would leave nothing ready; take the tables in their documented order then
+        ordered.extend(ready or remaining[:1])
+        remaining = [name for name in remaining if name not in ordered]
+    return ordered
+
+
+def checked_columns(name):
+    """The columns of ``name`` (in table order) that its key and invariant checks read."""
+    primary_keys, foreign_keys = documented_keys()
+    needed = {primary_keys.get(name)} | {column for child, column, _, _ in foreign_keys if child == name}
+    needed |= {column for invariant in INVARIANTS if invariant.table == name for column in invariant.columns}
+    return [column for column in SCHEMA[name] if column in needed]
+
+
+def validate_tables(chunks_by_table, dims=None, sample_rows=SAMPLE_ROWS):
+    """Run every check on ``{table: iterable of DataFrame chunks}``; returns a list of ``CheckResult``.
+
+    Tables are consumed parents first. Foreign keys to tables that are not
+    given are not checked. ``dims`` holds the whole dimension tables the
+    invariants look up; invariants whose dimensions are missing are skipped.
+    """
+    primary_keys, foreign_keys = documented_keys()
+    dims = dims or {}
+    names = _parents_first(list(chunks_by_table), foreign_keys)
+    keys = {name: KeySet() for name in names if name in primary_keys}
+    results = []
+    for name in names:
+        primary_key = primary_keys.get(name)
+        unique = CheckResult(name, f'{primary_key} unique') if primary_key else None
+        references = [(column, parent, CheckResult(name, f'{column} → {parent}.{parent_column}'))
+                      for child, column, parent, parent_column in sorted(foreign_keys)
+                      if child == name and parent in keys and primary_keys[parent] == parent_column]
+        invariants = [(invariant, CheckResult(name, invariant.name)) for invariant in INVARIANTS
+                      if invariant.table == name and all(dim in dims for dim in invariant.dims)]
+        for chunk in chunks_by_table[name]:
+            if unique:
+                unique.record(chunk, keys[name].add(chunk[primary_key].to_numpy()), [primary_key], sample_rows)
+            for column, parent, result in references:
+                # A missing foreign key (a billing line without a visit) is allowed
+                series = chunk[column]
+                values = series.to_numpy(dtype=np.int64, na_value=0) if series.dtype.kind in 'iu' else series.to_numpy()
+                result.record(chunk, series.notna().to_numpy() & ~keys[parent].contains(values),
+                              [primary_key or column, column], sample_rows)
+            for invariant, result in invariants:
+                result.record(chunk, invariant.broken(chunk, dims),
+                              [column for column in (primary_key, *invariant.columns) if column], sample_rows)
+        results.extend([unique] if unique else [])
+        results.extend(result for _, _, result in references)
+        results.extend(result for _, result in invariants)
+    return results
+
+
+def validate_directory(output_dir, chunk_size=1_000_000, sample_rows=SAMPLE_ROWS):
+    """Check every table written to ``output_dir`` (CSV, Parquet or partitioned Parquet) chunk by chunk."""
+    names = [name for name in table_order() if name in SCHEMA and checked_columns(name) and
+             (table_exists(output_dir, name) or os.path.isdir(os.path.join(output_dir, name)))]
+    dim_names = {dim for invariant in INVARIANTS for dim in invariant.dims}
+    dims = {name: read_table(output_dir, name) for name in names if name in dim_names}
+    chunks = {name: iter_table_chunks(output_dir, name, chunk_size, columns=checked_columns(name)) for name in names}
+    return validate_tables(chunks, dims, sample_rows)
@@ -0,0 +1,187 @@
+"""Load the star schema into a local SQLite database.
+
+Primary and foreign keys are read from the data dictionary itself (the
+"Primary Key" rows of each table, its "Key Relationships" lists and the
+star-schema diagram), so the database follows the documented model.
+Rows are bulk-inserted with ``executemany`` in one transaction, with
+journaling off, and the indexes are built once the data is in. Foreign
+keys are checked with ``PRAGMA foreign_key_check`` at the end instead of
+row by row during the load.
+"""
+import os
+import re
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from clinic_data.aggregates import AGGREGATES
+from clinic_data.data_dictionary import DATA_DICTIONARY
+from clinic_data.generator import FACT_TABLES
+from clinic_data.schema import is_nullable_integer
+from clinic_data.writers import TableWriter, iter_table_chunks, table_exists, write_chunks
+
+# Indexed fact columns besides each fact's date key
+FACT_INDEX_COLUMNS = ('BranchID', 'PatientID')
+
+_SECTION = re.compile(r'^## \S+ (\w+) - ', re.M)
+_PRIMARY_KEY = re.compile(r'^\| (\w+) \| \w+ \| Primary Key', re.M)
+_KEY_RELATIONSHIP = re.compile(r'^- (\w+) → (\w+)\.(\w+)$', re.M)
+_STAR_RELATIONSHIP = re.compile(r'^(\w+) \((\w+)\) ----< (\w+) \((\w+)\)', re.M)
+
+
+def _sections(text):
+    matches = list(_SECTION.finditer(text))
+    for match, end in zip(matches, [m.start() for m in matches[1:]] + [len(text)]):
+        yield match.group(1), text[match.end():end]
+
+
+def documented_keys(text=DATA_DICTIONARY):
+    """``(primary_keys, foreign_keys)`` described by the data dictionary.
+
+    ``primary_keys`` maps table -> column and ``foreign_keys`` is a set of
+    ``(table, column, referenced_table, referenced_column)``.
+    """
+    primary_keys = {}
+    relationships = []
+    for table, body in _sections(text):
+        match = _PRIMARY_KEY.search(body)
+        if match:
+            primary_keys[table] = match.group(1)
+        relationships.extend((table, *match.groups()) for match in _KEY_RELATIONSHIP.finditer(body))
+
+    foreign_keys = set()
+    for table, column, other, other_column in relationships:
+        # "DateKey → FactBillingDetail.BillingDateKey" under DimDate points from the fact to DimDate;
+        # "BranchID → DimBranch.BranchID" under DimEmployee points from DimEmployee to DimBranch
+        if primary_keys.get(table) == column:
+            foreign_keys.add((other, other_column, table, column))
+        else:
+            foreign_keys.add((table, column, other, other_column))
+    for parent, parent_column, child, child_column in _STAR_RELATIONSHIP.findall(text):
+        foreign_keys.add((child, child_column, parent, parent_column))
+    return primary_keys, foreign_keys
+
+
+def _sql_type(series):
+    if series.dtype.kind in 'iub':
+        return 'INTEGER'
+    if series.dtype.kind == 'f':
+        return 'REAL'
+    return 'TEXT'
+
+
+def create_table_sql(name, table, primary_keys, foreign_keys):
+    columns = [f'"{column}" {_sql_type(table[column])}' +
+               (' PRIMARY KEY' if primary_keys.get(name) == column else '') for column in table.columns]
+    columns += [f'FOREIGN KEY ("{column}") REFERENCES "{other}" ("{other_column}")'
+                for child, column, other, other_column in sorted(foreign_keys)
+                if child == name and column in table.columns]
+    return f'CREATE TABLE "{name}" (\n    ' + ',\n    '.join(columns) + '\n)'
+
+
+def encode_rows(chunk):
+    """A chunk as a list of tuples of plain Python values; missing values become NULL and dates ISO text."""
+    columns = []
+    for column in chunk.columns:
+        series = chunk[column]
+        if series.dtype.kind == 'M':
+            series = series.dt.strftime('%Y-%m-%d')
+        elif series.dtype == np.float32:
+            # Through the shortest decimal text, so 66.67 is stored as 66.67 rather than 66.66999816894531
+            series = pd.Series(series.to_numpy().astype(str).astype(np.float64), index=series.index)
+        if series.dtype.kind in 'iuf' and not is_nullable_integer(series.dtype):
+            columns.append(series.to_numpy().tolist())
+        else:
+            columns.append(series.astype(object).where(series.notna(), None).tolist())
+    return list(zip(*columns))
+
+
+class SqliteWarehouse:
+    """One SQLite database file that tables are streamed into, then indexed by ``finish()``."""
+
+    def __init__(self, path):
+        if os.path.exists(path):
+            os.remove(path)
+        self.path = path
+        self.primary_keys, self.foreign_keys = documented_keys()
+        # Writer threads take turns on the connection (see ``parallel.WritePipeline``)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode = OFF')
+        self.connection.execute('PRAGMA synchronous = OFF')
+        self.connection.execute('BEGIN')
+
+    def writer(self, name):
+        return SqliteTableWriter(self, name)
+
+    def create_table(self, name, chunk):
+        self.connection.execute(create_table_sql(name, chunk, self.primary_keys, self.foreign_keys))
+
+    def insert(self, name, rows):
+        if rows:
+            placeholders = ', '.join('?' * len(rows[0]))
+            self.connection.executemany(f'INSERT INTO "{name}" VALUES ({placeholders})', rows)
+
+    def finish(self):
+        """Build the indexes, commit, and return the foreign key violations as ``(table, rowid, parent)``."""
+        tables = {row[0] for row in self.connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for name, fact in FACT_TABLES.items():
+            if name in tables:
+                for column in (fact.date_key, *FACT_INDEX_COLUMNS):
+                    self.connection.execute(f'CREATE INDEX "ix_{name}_{column}" ON "{name}" ("{column}")')
+        for name in tables:
+            if name.startswith('Agg'):
+                date_column = 'YearMonth' if name.endswith('Branch') else 'DateKey'
+                self.connection.execute(f'CREATE INDEX "ix_{name}_{date_column}" ON "{name}" ("{date_column}")')
+        self.connection.commit()
+        violations = self.connection.execute('PRAGMA foreign_key_check').fetchall()
+        self.connection.execute('ANALYZE')
+        self.connection.close()
+        return [row[:3] for row in violations]
+
+
+class SqliteTableWriter(TableWriter):
+    """Inserts chunks of one table into a ``SqliteWarehouse``; rows are converted in the worker processes."""
+
+    def __init__(self, warehouse, name):
+        self.warehouse = warehouse
+        self.name = name
+        self.rows = 0
+        self._schema = None
+
+    def encoder(self):
+        return _encode_with_schema, ()
+
+    def write_encoded(self, payload, rows):
+        schema, values = payload
+        if self._schema is None:
+            self._schema = schema
+            self.warehouse.create_table(self.name, schema)
+        self.warehouse.insert(self.name, values)
+        self.rows += rows
+
+
+def _encode_with_schema(chunk):
+    # An empty slice carries the dtypes needed for CREATE TABLE
+    return chunk.iloc[:0], encode_rows(chunk)
+
+
+def table_order():
+    """Documented tables in data dictionary order (dimensions first), then the aggregates."""
+    return [name for name, _ in _sections(DATA_DICTIONARY)] + [
+        aggregate.name for aggregates in AGGREGATES.values() for aggregate in aggregates]
+
+
+def load_directory(output_dir, path, chunk_size=500_000):
+    """Load the tables already written to ``output_dir`` into a new database at ``path``.
+
+    Returns ``(row_counts, foreign_key_violations)``.
+    """
+    warehouse = SqliteWarehouse(path)
+    row_counts = {}
+    for name in table_order():
+        if not (table_exists(output_dir, name) or os.path.isdir(os.path.join(output_dir, name))):
+            continue
+        row_counts[name] = write_chunks(iter_table_chunks(output_dir, name, chunk_size, {'PatientSketch': str}),
+                                        [warehouse.writer(name)])
+    return row_counts, warehouse.finish()
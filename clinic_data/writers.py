@@ -0,0 +1,373 @@
+import glob
+import gzip
+import os
+
+import numpy as np
+import pandas as pd
+
+from clinic_data.schema import SCHEMA, apply_schema, csv_dtypes, is_category
+
+# Column typing for columnar output. Types follow the ``schema.SCHEMA``
+# dtypes: integers become int32, categories dictionaries and datetimes
+# dates. Money is written as ``money_type`` whatever its in-memory dtype.
+MONEY_COLUMNS = {
+    'UnitPrice', 'GrossAmount', 'DiscountAmount', 'NetAmount', 'InsuranceCoverageAmount',
+    'PatientPaidAmount', 'PaymentFee', 'TotalCost', 'GrossProfit',
+    'BasePrice', 'Cost', 'HourlyRate', 'MonthlySalary', 'MonthlyRent',
+}
+PERCENT_COLUMNS = {'DiscountPercent', 'GrossProfitMargin', 'CoveragePercent', 'ProcessingFee'}
+CATEGORICAL_COLUMNS = {column for columns in SCHEMA.values() for column, dtype in columns.items() if is_category(dtype)}
+DATE_COLUMNS = {column for columns in SCHEMA.values() for column, dtype in columns.items()
+                if str(dtype).startswith('datetime64')}
+MONEY_TYPES = ('decimal', 'float32')
+FORMATS = ('csv', 'parquet', 'both')
+# CSVs are compressed as a whole file suffix; Parquet compresses its pages with
+# the same codec instead of the default snappy
+COMPRESSIONS = ('none', 'gzip', 'zstd')
+CSV_SUFFIXES = {'none': '.csv', 'gzip': '.csv.gz', 'zstd': '.csv.zst'}
+PARQUET_CODECS = {'none': 'snappy', 'gzip': 'gzip', 'zstd': 'zstd'}
+GZIP_LEVEL = 6
+
+# Only empty fields are missing when reading the CSVs back; 'None' is a MembershipLevel
+CSV_MISSING = {'keep_default_na': False, 'na_values': ['']}
+
+
+def _pyarrow(purpose='Parquet output'):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(f'{purpose} requires pyarrow: pip install pyarrow') from e
+    return pa, pq
+
+
+def csv_path(output_dir, name, compression='none'):
+    return os.path.join(output_dir, f'{name}{CSV_SUFFIXES[compression]}')
+
+
+def find_csv(output_dir, name):
+    """Path of the CSV of ``name`` in ``output_dir``, plain or compressed, or None."""
+    for compression in COMPRESSIONS:
+        if os.path.exists(csv_path(output_dir, name, compression)):
+            return csv_path(output_dir, name, compression)
+    return None
+
+
+def csv_compression(path):
+    return next((compression for compression, suffix in CSV_SUFFIXES.items() if path.endswith(suffix)), 'none')
+
+
+def compress(data, compression):
+    """``data`` as one complete gzip member or zstd frame; concatenated, they read back as one stream."""
+    if compression == 'gzip':
+        # mtime=0 keeps the output reproducible
+        return gzip.compress(data, GZIP_LEVEL, mtime=0)
+    if compression == 'zstd':
+        pa, _ = _pyarrow('zstd compression')
+        return pa.Codec('zstd').compress(data, asbytes=True)
+    return data
+
+
+def open_csv(path):
+    """``path`` for ``pd.read_csv``; zstd is decompressed by pyarrow rather than the zstandard package."""
+    if csv_compression(path) == 'zstd':
+        pa, _ = _pyarrow('zstd compression')
+        return pa.input_stream(path, compression='zstd')
+    return path
+
+
+def parquet_path(output_dir, name):
+    return os.path.join(output_dir, f'{name}.parquet')
+
+
+def write_csv(table, path):
+    table.to_csv(path, index=False, encoding='utf-8-sig')
+    return len(table)
+
+
+def arrow_type(column, series, money_type='decimal'):
+    pa, _ = _pyarrow()
+    if column in MONEY_COLUMNS:
+        return pa.decimal128(14, 2) if money_type == 'decimal' else pa.float32()
+    if column in PERCENT_COLUMNS or series.dtype == np.float32:
+        return pa.float32()
+    if is_category(series.dtype) or column in CATEGORICAL_COLUMNS:
+        return pa.dictionary(pa.int32(), pa.string())
+    if series.dtype.kind == 'M' or column in DATE_COLUMNS:
+        return pa.date32()
+    if series.dtype.kind in 'iu':
+        return pa.int32()
+    if series.dtype.kind == 'f':
+        return pa.float64()
+    return pa.string()
+
+
+def arrow_schema(table, money_type='decimal'):
+    pa, _ = _pyarrow()
+    return pa.schema([pa.field(column, arrow_type(column, table[column], money_type)) for column in table.columns])
+
+
+def to_arrow(table, schema):
+    """Convert a DataFrame to an Arrow table with the exact column types in ``schema``."""
+    pa, _ = _pyarrow()
+    arrays = []
+    for field in schema:
+        series = table[field.name]
+        if pa.types.is_decimal(field.type):
+            arrays.append(pa.array(np.round(series.to_numpy(dtype=float), 2)).cast(field.type, safe=False))
+        elif pa.types.is_date32(field.type):
+            arrays.append(pa.array(series.to_numpy(dtype='datetime64[D]')))
+        elif pa.types.is_dictionary(field.type) and is_category(series.dtype):
+            # Code -1 (missing) stays null
+            codes = series.cat.codes.to_numpy()
+            arrays.append(pa.DictionaryArray.from_arrays(
+                pa.array(codes, mask=codes < 0).cast(pa.int32()),
+                pa.array(series.cat.categories.astype(str).to_numpy(dtype=object), type=pa.string())))
+        elif pa.types.is_dictionary(field.type):
+            # Missing values stay null instead of becoming the string 'nan'
+            arrays.append(pa.array(series.to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+                          .dictionary_encode())
+        elif pa.types.is_string(field.type):
+            arrays.append(pa.array(series.astype(str).to_numpy(dtype=object), type=pa.string()))
+        else:
+            arrays.append(pa.array(series, from_pandas=True).cast(field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def encode_csv(chunk, compression='none'):
+    """utf-8 CSV bytes for a chunk, returned as ``(header, rows)`` so the header (with the BOM) can be written once.
+
+    Compressed, the header and the rows are separate gzip members or zstd
+    frames, so chunks can be compressed independently and in parallel.
+    """
+    header = ('\ufeff' + chunk.iloc[:0].to_csv(index=False)).encode('utf-8')
+    return compress(header, compression), compress(chunk.to_csv(header=False, index=False).encode('utf-8'), compression)
+
+
+def encode_parquet(chunk, money_type='decimal'):
+    return to_arrow(chunk, arrow_schema(chunk, money_type))
+
+
+def encode_partitions(chunk, date_key, money_type='decimal'):
+    """Split a chunk on the YYYYMM of ``date_key`` into ``[(yyyymm, arrow_table), ...]``."""
+    schema = arrow_schema(chunk, money_type)
+    year_month = chunk[date_key].to_numpy() // 100
+    order = np.argsort(year_month, kind='stable')
+    months, starts = np.unique(year_month[order], return_index=True)
+    return [(int(value), to_arrow(chunk.iloc[order[start:end]], schema))
+            for value, start, end in zip(months, starts, np.append(starts[1:], len(order)))]
+
+
+def part_files(directory):
+    return sorted(glob.glob(os.path.join(directory, 'Year=*', 'Month=*', 'part-*.parquet')))
+
+
+def table_exists(output_dir, name):
+    return os.path.exists(parquet_path(output_dir, name)) or find_csv(output_dir, name) is not None
+
+
+def _arrow_to_pandas(table):
+    pa, _ = _pyarrow()
+    for i, field in enumerate(table.schema):
+        if pa.types.is_decimal(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+    return table.to_pandas(date_as_object=False)
+
+
+def _read_csv(output_dir, name, dtype, columns=None, **kwargs):
+    if name in SCHEMA:
+        dtype = {**csv_dtypes(name, columns), **(dtype or {})}
+    return pd.read_csv(open_csv(find_csv(output_dir, name)), encoding='utf-8-sig', dtype=dtype, usecols=columns,
+                       **CSV_MISSING, **kwargs)
+
+
+def read_table(output_dir, name, dtype=None):
+    """Read a table written by ``table_writers``, preferring Parquet, with its ``schema.SCHEMA`` dtypes.
+
+    Decimal money comes back as float.
+    """
+    path = parquet_path(output_dir, name)
+    if os.path.exists(path):
+        _, pq = _pyarrow()
+        return apply_schema(name, _arrow_to_pandas(pq.read_table(path)))
+    return apply_schema(name, _read_csv(output_dir, name, dtype))
+
+
+def iter_table_chunks(output_dir, name, chunk_size=1_000_000, dtype=None, columns=None):
+    """Yield a written table as DataFrames of at most ``chunk_size`` rows, cast to the ``schema.SCHEMA`` dtypes.
+
+    Reads a ``Year=/Month=`` partition folder file by file, a Parquet file
+    row group by row group, or a CSV in chunks, so even the largest fact
+    table never has to fit in memory. ``columns`` (in table order) reads
+    only those columns.
+    """
+    directory = os.path.join(output_dir, name)
+    if os.path.isdir(directory) or os.path.exists(parquet_path(output_dir, name)):
+        pa, pq = _pyarrow()
+        paths = part_files(directory) if os.path.isdir(directory) else [parquet_path(output_dir, name)]
+        for path in paths:
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+                yield apply_schema(name, _arrow_to_pandas(pa.Table.from_batches([batch])), columns)
+    else:
+        for chunk in _read_csv(output_dir, name, dtype, columns, chunksize=chunk_size):
+            yield apply_schema(name, chunk, columns)
+
+
+class TableWriter:
+    """Writes one table chunk by chunk.
+
+    Writing is split into ``encoder()``, a picklable ``(function, args)`` pair
+    that turns a chunk into an encoded payload and can run in a worker
+    process, and ``write_encoded()``, which appends that payload to the
+    output in the owning process.
+    """
+
+    def encoder(self):
+        raise NotImplementedError
+
+    def write_encoded(self, payload, rows):
+        raise NotImplementedError
+
+    def write(self, chunk):
+        function, args = self.encoder()
+        self.write_encoded(function(chunk, *args), len(chunk))
+
+    def close(self):
+        pass
+
+
+class CsvTableWriter(TableWriter):
+    """Appends chunks to one utf-8-sig CSV; the header and BOM are written once.
+
+    The compression follows the file suffix (``.csv.gz``, ``.csv.zst``).
+    With ``append=True`` rows are added to the end of an existing file,
+    which already has its header; otherwise the table's CSV in any other
+    compression is removed.
+    """
+
+    def __init__(self, path, append=False):
+        self.path = path
+        self.compression = csv_compression(path)
+        self.rows = 0
+        self._header = not append
+        if not append:
+            # A CSV left from an earlier run in another compression would otherwise be read by find_csv
+            stem = path[:-len(CSV_SUFFIXES[self.compression])]
+            for stale in (stem + suffix for suffix in CSV_SUFFIXES.values()):
+                if stale != path and os.path.exists(stale):
+                    os.remove(stale)
+        self._file = open(path, 'ab' if append else 'wb')
+
+    def encoder(self):
+        return encode_csv, (self.compression,)
+
+    def write_encoded(self, payload, rows):
+        header, body = payload
+        if self._header:
+            self._file.write(header)
+            self._header = False
+        self._file.write(body)
+        self.rows += rows
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetTableWriter(TableWriter):
+    """Appends each chunk as a row group of a single Parquet file."""
+
+    def __init__(self, path, money_type='decimal', compression='snappy'):
+        self.path = path
+        self.money_type = money_type
+        self.compression = compression
+        self.rows = 0
+        self._writer = None
+
+    def encoder(self):
+        return encode_parquet, (self.money_type,)
+
+    def write_encoded(self, payload, rows):
+        _, pq = _pyarrow()
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, payload.schema, compression=self.compression)
+        self._writer.write_table(payload)
+        self.rows += rows
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class PartitionedParquetWriter(TableWriter):
+    """Hive-style ``Year=YYYY/Month=MM/part-NNNNN.parquet`` files split on a YYYYMMDD date key.
+
+    Every chunk adds one file to each month it touches, so a refresh that only
+    needs recent months never opens the older partitions. With
+    ``overwrite=False`` existing files are kept and numbering continues after
+    them, which is how appended days land in new files.
+    """
+
+    def __init__(self, directory, date_key, money_type='decimal', overwrite=True, compression='snappy'):
+        self.directory = directory
+        self.date_key = date_key
+        self.money_type = money_type
+        self.compression = compression
+        self.rows = 0
+        self._part = 0
+        existing = part_files(directory)
+        if overwrite:
+            # Part files left from an earlier run would otherwise be read as extra rows
+            for stale in existing:
+                os.remove(stale)
+        elif existing:
+            self._part = max(int(os.path.basename(path)[5:-8]) for path in existing) + 1
+
+    def encoder(self):
+        return encode_partitions, (self.date_key, self.money_type)
+
+    def write_encoded(self, payload, rows):
+        _, pq = _pyarrow()
+        for year_month, table in payload:
+            month_dir = os.path.join(self.directory, f'Year={year_month // 100}', f'Month={year_month % 100:02d}')
+            os.makedirs(month_dir, exist_ok=True)
+            pq.write_table(table, os.path.join(month_dir, f'part-{self._part:05d}.parquet'),
+                           compression=self.compression)
+        self._part += 1
+        self.rows += rows
+
+
+def write_chunks(chunks, writers):
+    """Feed every chunk to each writer as soon as it arrives, so only one chunk is alive at a time.
+
+    Memory is bounded by the chunk size rather than the table size. Returns
+    the number of rows written.
+    """
+    rows = 0
+    try:
+        for chunk in chunks:
+            for writer in writers:
+                writer.write(chunk)
+            rows += len(chunk)
+    finally:
+        for writer in writers:
+            writer.close()
+    return rows
+
+
+def write_csv_chunks(chunks, path):
+    return write_chunks(chunks, [CsvTableWriter(path)])
+
+
+def table_writers(output_dir, name, output_format='csv', date_key=None, money_type='decimal', compression='none'):
+    """Writers for one table; fact tables pass ``date_key`` to be partitioned by year/month."""
+    writers = []
+    if output_format in ('csv', 'both'):
+        writers.append(CsvTableWriter(csv_path(output_dir, name, compression)))
+    if output_format in ('parquet', 'both'):
+        codec = PARQUET_CODECS[compression]
+        if date_key is None:
+            writers.append(ParquetTableWriter(parquet_path(output_dir, name), money_type, codec))
+        else:
+            writers.append(PartitionedParquetWriter(os.path.join(output_dir, name), date_key, money_type,
+                                                    compression=codec))
+    return writers
@@ -0,0 +1,15 @@
+import os
+
+from clinic_data.cli import main
+from clinic_data.writers import find_csv, read_table
+
+
+def test_regenerating_with_another_compression_replaces_the_csvs(tmp_path):
+    output_dir = str(tmp_path)
+    main(['--scale', '0.05', '--output-dir', output_dir, '--no-aggregates'])
+    first = read_table(output_dir, 'FactBillingDetail')
+    main(['--scale', '0.05', '--output-dir', output_dir, '--no-aggregates', '--compression', 'gzip', '--seed', '9'])
+
+    assert find_csv(output_dir, 'FactBillingDetail') == os.path.join(output_dir, 'FactBillingDetail.csv.gz')
+    assert not any(name.endswith('.csv') for name in os.listdir(output_dir))
+    assert not read_table(output_dir, 'FactBillingDetail').equals(first)